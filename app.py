@@ -11,8 +11,17 @@ from utils.report_generator import generate_markdown_summary
 from utils.er_generator import generate_er_diagram
 from utils.quality_utils import analyze_schema_quality
 from utils.report_generator import save_report_as_markdown
-from utils.report_templates import create_report_templates
 from utils.data_products_loader import load_data_products_config
+from utils.data_catalog import get_data_catalog
+from utils.stats_maintenance import ensure_fresh_statistics, ensure_time_window_indexes
+from utils.materialized_aggregates import get_aggregate_store
+from utils.report_cache import get_report_cache, resolve_report_parameters, warm_report_cache
+from utils.template_registry import get_template_registry
+from utils.report_narration import get_report_narrator
+from utils.report_scheduler import get_report_scheduler
+from utils.chart_rendering import get_chart_renderer
+from utils.report_export import export_report, EXPORT_FORMATS
+from utils.agent_registry import get_agent_registry
 from crewai.crews.crew_output import CrewOutput
 from utils.cataloging_formatter import wrap_cataloging_output
 from datetime import datetime, timedelta
@@ -29,6 +38,27 @@ from collections.abc import Mapping
 setup_logging()
 logger = logging.getLogger(__name__)
 
+def show_chart(future, title: str):
+    """Display a section chart once its background rendering has finished"""
+    if future is None:
+        return
+    if not future.done():
+        st.caption(f"📊 Chart for {title} is rendering in the background...")
+    elif future.exception():
+        st.caption(f"⚠️ Chart for {title} failed: {future.exception()}")
+    elif future.result():
+        st.image(future.result(), caption=title)
+
+def show_exports(report: dict, fmt: str):
+    """Export every section's full result set and list the written files"""
+    with st.spinner(f"Exporting sections as {fmt}..."):
+        exported = export_report(report, fmt=fmt)
+    for item in exported:
+        if "error" in item:
+            st.warning(f"⚠️ {item['section']}: {item['error']}")
+        else:
+            st.caption(f"📦 {item['section']}: {item['rows']} rows -> `{item['path']}` ({item['bytes'] / 1024:.1f} KB)")
+
 def simplify_result(result: dict) -> list:
     """
     Flattens the agent output to a list of results per table with optional summary.
@@ -166,7 +196,7 @@ with TAB_AGENTS:
     st.header("👨‍💼 Agent Directory")
     agents_yaml = Path("config/agents.yaml")
     if agents_yaml.exists():
-        agents_config = yaml.safe_load(agents_yaml.read_text(encoding="utf-8"))
+        agents_config = get_agent_registry().load_config(str(agents_yaml))
         for agent_key, agent in agents_config.items():
             with st.expander(f"🧠 {agent['role']}"):
                 st.markdown(f"**Goal:** {agent['goal']}")
@@ -190,9 +220,17 @@ with TAB_RUN:
     if uploaded_files:
         for f in uploaded_files:
             save_path = upload_dir / f.name
-            with open(save_path, "wb") as out:
-                out.write(f.read())
+            data = f.getvalue()
+            # Streamlit reruns keep the uploaded files; rewriting identical bytes would look like a data change
+            is_new_content = not save_path.exists() or save_path.stat().st_size != len(data) or save_path.read_bytes() != data
+            if is_new_content:
+                with open(save_path, "wb") as out:
+                    out.write(data)
             if save_path.suffix == ".db":
+                if is_new_content:
+                    ensure_time_window_indexes(str(save_path))
+                    ensure_fresh_statistics(str(save_path))
+                    get_aggregate_store().register_templates(str(save_path))
                 full_path = save_path.resolve()
                 
                 # Check if already uploaded to avoid duplicates
@@ -227,15 +265,16 @@ with TAB_RUN:
                 st.error("❌ No valid database selected.")
                 st.stop()
             
-            # ⚠️ Clear previous summary every time
-            summary_path = Path("results/results_summary.md")
-            summary_path.parent.mkdir(parents=True, exist_ok=True)
-            summary_path.write_text("# Platform Results Summary\n\n", encoding="utf-8")
-
             config = PlatformConfig()
             config.database_urls = selected_dbs
 
             crew = DataManagementCrew(config)
+
+            # ⚠️ Clear previous summaries every time; phases then append to results_summary.md
+            crew.reset_summaries()
+            summary_path = Path("results/results_summary.md")
+            summary_path.parent.mkdir(parents=True, exist_ok=True)
+            summary_path.write_text("# Platform Results Summary\n\n", encoding="utf-8")
             active_product = st.session_state.get("active_data_product", {})
             inputs = {
                 "data_product": active_product,
@@ -243,80 +282,70 @@ with TAB_RUN:
             }
 
             phases = ["discovery", "cataloging", "processing", "insights"] if selected_phase == "All" else [selected_phase.lower()]
-            results = {}
-            
-            for db in selected_dbs:
-                config.database_urls = [db]
-                db_label = Path(db.split("///")[-1]).name
-                db_results = {}
-                
-                for p in phases:
-                    st.subheader(f"⏳ Running {p.title()} Phase for {db_label}")
-                    progress = st.progress(0)
-                    for i in range(5):
-                        time.sleep(0.1)
-                        progress.progress((i + 1) * 20)
-
-                    # === Discovery Phase ===
-                    if p == "discovery":
-                        discovery_result = crew.run_data_discovery(inputs)
-                        db_results["discovery"] = simplify_result(discovery_result)
-
-                        # Store discovery metadata/profiling to pass to cataloging
-                        discovery_outputs = discovery_result.get("results", [])
-                        metadata_all = [r["result"]["metadata"] for r in discovery_outputs if "result" in r]
-                        profiling_all = [r["result"]["profiling"] for r in discovery_outputs if "result" in r]
-
-                        # Attach to inputs for cataloging
-                        inputs["discovery_outputs"] = {
-                            "metadata": metadata_all,
-                            "profiling": profiling_all
-                        }
-
-                    # === Cataloging Phase ===
-                    elif p == "cataloging":
-                        # Use existing discovery outputs if available
-                        if "discovery_outputs" not in inputs:
-                            st.warning("⚠️ Discovery outputs not found. Cataloging will run independently.")
-                        
-                        cataloging_result = crew.run_data_cataloging(inputs)
-                        st.write("Raw Cataloging Result:", cataloging_result)
-                        logger.debug(f"[DEBUG] cataloging_result type: {type(cataloging_result)}")
-                        logger.debug(f"[DEBUG] cataloging_result: {cataloging_result}")
-                        
-                        if isinstance(cataloging_result, list):
-                            cataloging_result = cataloging_result[0] if cataloging_result else {}
-                        db_results["cataloging"] = simplify_result(cataloging_result)
-
-                        cataloging_md = wrap_cataloging_output(
-                            table_name=db_result.get("table_name", "unknown"),
-                            db_url=db_url,
-                            lineage=db_result.get("lineage", ""),
-                            validation=db_result.get("validation", ""),
-                            integration=db_result.get("integration", "")
-                        )
-
-                        if not cataloging_md.strip():
-                            logger.warning("⚠️ Cataloging markdown is empty. Nothing will be written.")
-                            st.warning("⚠️ Cataloging phase completed, but no markdown output was generated.")
-                        else:
-                            try:
-                                summary_path = Path("results/results_summary.md")
-                                with summary_path.open("a", encoding="utf-8") as f:
-                                    f.write("## 🗂️ Cataloging Phase\n\n")
-                                    f.write(cataloging_md + "\n")
-                                logger.info("✅ Cataloging summary appended to results_summary.md successfully.")
-                            except Exception as e:
-                                logger.error(f"❌ Failed to write cataloging markdown: {e}")
-                                st.error("❌ Could not append cataloging results to the summary markdown file.")
-
-                    # === Processing and Insights (no change) ===
-                    else:
-                        result = crew.run(phase=p, inputs=inputs)
-                        db_results[p] = simplify_result(result)
-
-                results[db_label] = db_results
-                
+
+            def db_label(db_url: str) -> str:
+                return Path(db_url.split("///")[-1]).name
+
+            # Every phase runs on all selected databases at once; results are grouped per database
+            results = {db_label(db): {} for db in selected_dbs}
+            phase_timings = []
+
+            for p in phases:
+                st.subheader(f"⏳ Running {p.title()} Phase for {len(selected_dbs)} database(s)")
+                progress = st.progress(0)
+                for i in range(5):
+                    time.sleep(0.1)
+                    progress.progress((i + 1) * 20)
+                phase_started = time.perf_counter()
+
+                # === Discovery Phase ===
+                if p == "discovery":
+                    discovery_result = crew.run(phase=p, inputs=inputs)
+                    for entry in simplify_result(discovery_result):
+                        results.setdefault(db_label(entry.get("db", "")), {}).setdefault("discovery", []).append(entry)
+                    db_timings = discovery_result.get("db_timings", {})
+
+                    # Store discovery metadata/profiling to pass to cataloging
+                    discovery_outputs = discovery_result.get("results", [])
+                    metadata_all = [r["result"]["metadata"] for r in discovery_outputs if "result" in r]
+                    profiling_all = [r["result"]["profiling"] for r in discovery_outputs if "result" in r]
+
+                    # Attach to inputs for cataloging
+                    inputs["discovery_outputs"] = {
+                        "metadata": metadata_all,
+                        "profiling": profiling_all
+                    }
+
+                # === Cataloging Phase ===
+                elif p == "cataloging":
+                    # Use existing discovery outputs if available
+                    if "discovery_outputs" not in inputs:
+                        st.warning("⚠️ Discovery outputs not found. Cataloging will run independently.")
+
+                    # The crew appends each table's cataloging markdown to results_summary.md
+                    cataloging_result = crew.run(phase=p, inputs=inputs)
+                    logger.debug(f"[DEBUG] cataloging_result: {cataloging_result}")
+                    for entry in cataloging_result.get("results", []):
+                        results.setdefault(db_label(entry["db"]), {}).setdefault("cataloging", []).append(entry)
+                    db_timings = cataloging_result.get("db_timings", {})
+
+                # === Processing and Insights ===
+                else:
+                    db_timings = {}
+                    for entry in crew.run(phase=p, inputs=inputs):
+                        outcome = {"error": entry["error"]} if "error" in entry else {"result": str(entry["result"])}
+                        results.setdefault(db_label(entry["db"]), {})[p] = {**outcome, "duration_ms": entry["duration_ms"]}
+                        db_timings[entry["db"]] = entry["duration_ms"]
+
+                phase_ms = (time.perf_counter() - phase_started) * 1000
+                for db_url, duration_ms in db_timings.items():
+                    phase_timings.append({"phase": p, "database": db_label(db_url), "duration_ms": round(duration_ms)})
+                st.caption(f"{p.title()} finished in {phase_ms:.0f} ms across {len(db_timings)} database(s)")
+
+            if phase_timings:
+                st.markdown("#### ⏱️ Per-database timing")
+                st.dataframe(phase_timings, use_container_width=True)
+
         # After all phases run for all databases:
         with open("results/platform_execution_results.json", "w") as f:
             json.dump(results, f, indent=2)
@@ -359,6 +388,23 @@ with TAB_RESULTS:
                 mime="text/markdown"
             )
 
+    with st.expander("🗃️ Data Catalog"):
+        try:
+            catalog = get_data_catalog()
+            overview = catalog.table_overview()
+            if overview:
+                st.markdown("**Catalogued tables**")
+                st.dataframe(overview, use_container_width=True)
+            else:
+                st.info("The catalog is empty. Run a pipeline to populate it.")
+
+            runs = catalog.recent_runs(limit=20)
+            if runs:
+                st.markdown("**Recent runs**")
+                st.dataframe(runs, use_container_width=True)
+        except Exception as e:
+            st.warning(f"⚠️ Could not read the data catalog: {e}")
+
 with TAB_ER_DIAGRAM:
     st.header("🧬 Entity-Relationship Diagram")
 
@@ -499,9 +545,8 @@ with TAB_REPORTS:
     Generate actionable, professional-grade reports using your uploaded databases and agentic analysis.
     """)
 
-    # 1. Load report templates once
-    from utils.report_templates import create_report_templates
-    all_templates = create_report_templates()
+    # 1. Report templates come from the registry built once per process
+    all_templates = get_template_registry().templates
 
     # 2. Identify active data product and its report suite
     active_dp = st.session_state.get("active_data_product", {})
@@ -562,8 +607,10 @@ with TAB_REPORTS:
                 st.markdown("## 📌 Summary")
                 st.markdown(report["data_summary"].get("summary", "No summary provided."))
 
+                charts = get_chart_renderer().submit_report(report)
                 for section in report.get("sections", []):
                     st.markdown(f"### 🔹 {section.get('title', 'Untitled Section')}")
+                    show_chart(charts.get(section.get("title")), section.get("title", "section"))
                     st.json(section.get("content", {}))
 
                 if report.get("recommendations"):
@@ -595,6 +642,56 @@ with TAB_REPORTS:
             **selected.get("parameters", {})
         }
 
+    use_report_cache = st.checkbox("♻️ Serve cached report when data is unchanged", value=True)
+    use_agent = st.checkbox("🤖 Let the reporting agent drive generation (slower, LLM in the loop)", value=False)
+    narrate_report = st.checkbox("🧠 Add AI narrative in the background", value=False)
+    export_format = st.selectbox("📦 Export full sections to results/exports", ["none", *EXPORT_FORMATS])
+    cache_col1, cache_col2 = st.columns(2)
+    with cache_col1:
+        if st.button("🔥 Warm report cache") and st.session_state.get("uploaded_dbs"):
+            with st.spinner("Generating every data product's report suite..."):
+                for db in st.session_state["uploaded_dbs"]:
+                    st.write(f"`{db['name']}`", warm_report_cache(db["path"]))
+    with cache_col2:
+        if st.button("🗑️ Clear report cache"):
+            st.info(f"Removed {get_report_cache().invalidate()} cached reports.")
+
+    with st.expander("🗓️ Scheduled Reports"):
+        scheduler = get_report_scheduler()
+        if st.checkbox("Run template schedules in the background", key="report_scheduler_enabled"):
+            for db in st.session_state.get("uploaded_dbs", []):
+                if db["path"] not in st.session_state.setdefault("scheduled_dbs", set()):
+                    scheduler.schedule_templates(db["path"])
+                    st.session_state["scheduled_dbs"].add(db["path"])
+            scheduler.start()
+            st.caption(f"Outputs are written to `{scheduler.output_dir}`; unchanged databases are skipped.")
+        jobs = scheduler.list_jobs()
+        if jobs:
+            columns = ["report_type", "data_product", "schedule", "next_run_at", "last_run_at", "last_status", "runs", "skips"]
+            st.dataframe([{column: job[column] for column in columns} for job in jobs], use_container_width=True)
+
+    # Narrative from an earlier run, written on a background worker
+    narration = st.session_state.get("report_narration")
+    if narration:
+        with st.expander(f"🧠 AI Narrative: {narration['report']}", expanded=narration["future"].done()):
+            if not narration["future"].done():
+                st.info("Narrative is still being written...")
+                st.button("🔄 Check narrative")
+            elif narration["future"].exception():
+                st.warning(f"⚠️ Narrative failed: {narration['future'].exception()}")
+            else:
+                st.markdown(narration["future"].result())
+
+    # Charts of the last report, rendered on a background worker
+    report_charts = st.session_state.get("report_charts")
+    if report_charts and report_charts["futures"]:
+        pending = sum(not future.done() for future in report_charts["futures"].values())
+        with st.expander(f"📊 Charts: {report_charts['report']}", expanded=not pending):
+            if pending:
+                st.button("🔄 Check charts")
+            for title, future in report_charts["futures"].items():
+                show_chart(future, title)
+
     if st.button("🚀 Generate Report"):
         if "uploaded_dbs" not in st.session_state or not st.session_state["uploaded_dbs"]:
             st.warning("Please upload databases in the 'Run Pipeline' tab before generating reports.")
@@ -613,9 +710,40 @@ with TAB_REPORTS:
                 **parameters,
                 "data_product": selected_data_product
             },
-            "data_sources": data_sources
+            "data_sources": data_sources,
+            "mode": "agent" if use_agent else "direct",
+            "narrate": narrate_report
         }
 
+        report_cache = get_report_cache()
+        cache_key = report_cache.key(
+            report_config["type"], data_source,
+            resolve_report_parameters(selected, report_config["parameters"]), data_sources
+        ) if use_report_cache else None
+        cached = report_cache.get(cache_key) if cache_key else None
+        if cached:
+            st.success(f"♻️ Served from report cache (generated {cached['created_at']}, data unchanged).")
+            md_path = Path(f"results/{report_config['type']}_report.md")
+            md_path.parent.mkdir(parents=True, exist_ok=True)
+            md_path.write_text(cached["markdown"], encoding="utf-8")
+            st.markdown(cached["markdown"])
+            st.download_button("📥 Download Report", cached["markdown"], file_name=md_path.name,
+                               mime="text/markdown", key="report_download")
+            st.session_state["report_charts"] = {
+                "report": selected["name"], "futures": get_chart_renderer().submit_report(cached["report"])
+            }
+            if export_format != "none":
+                show_exports(cached["report"], export_format)
+            if narrate_report:
+                st.session_state["report_narration"] = {
+                    "report": selected["name"],
+                    "future": get_report_narrator().submit(
+                        cached["report"], output_path=f"results/{report_config['type']}_narrative.md"
+                    )
+                }
+                st.info("🧠 Narrative queued; it will appear above once ready.")
+            st.stop()
+
         from crew import DataManagementCrew
         crew = DataManagementCrew()
 
@@ -630,6 +758,9 @@ with TAB_REPORTS:
                 st.json(report_output)
                 st.stop()
 
+            if getattr(report_output, "narration", None) is not None:
+                st.session_state["report_narration"] = {"report": selected["name"], "future": report_output.narration}
+
             if hasattr(report_output, "json_dict") and report_output.json_dict:
                 report_data = report_output.json_dict
             elif hasattr(report_output, "raw") and report_output.raw.strip():
@@ -648,16 +779,25 @@ with TAB_REPORTS:
             report_data["generation_date"] = report_data.get("generation_date", datetime.now().strftime("%B %d, %Y"))
             report_data["report_title"] = report_data.get("report_title", selected["name"])
 
+            st.session_state["report_charts"] = {
+                "report": selected["name"], "futures": get_chart_renderer().submit_report(report_data)
+            }
+
             from utils.report_generator import save_report_as_markdown
             output_file = f"results/{report_config['type']}_report.md"
             md_path = save_report_as_markdown(report_data, output_path=output_file)
 
-            st.success("✅ Report generated successfully!")
+            duration = getattr(report_output, "duration_ms", None)
+            st.success("✅ Report generated successfully!" + (f" ({duration:.0f} ms)" if duration else ""))
+            if narrate_report:
+                st.info("🧠 Narrative queued; it will appear above once ready.")
             with open(md_path, "r", encoding="utf-8") as f:
                 st.markdown(f.read())
 
             with open(md_path, "rb") as f:
                 st.download_button("📥 Download Report", f, file_name=Path(md_path).name, mime="text/markdown", key="report_download")
+            if export_format != "none":
+                show_exports(report_data, export_format)
 
 with TAB_DOCS:
     st.header("📘 Embedded Documentation")
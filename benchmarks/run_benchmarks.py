@@ -0,0 +1,336 @@
+# =============================================================================
+# benchmarks/run_benchmarks.py - Benchmark suite for the data tools
+# =============================================================================
+
+"""
+benchmarks/run_benchmarks.py
+Time and memory-profile the platform's data tools against synthetic ecommerce
+databases built at several scale factors by databases/ecommerce_db_setup.py.
+
+Usage (from the repository root):
+    python benchmarks/run_benchmarks.py --scales 0.05 0.25 1.0 --repeat 3
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/old.json benchmarks/results/new.json
+
+Results are written as JSON to benchmarks/results/ so runs can be compared across commits.
+"""
+import os
+import sys
+# Measure the tools themselves, not data catalog cache hits
+os.environ.setdefault("CACHE_ENABLED", "false")
+ROOT_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT_DIR)
+sys.path.append(os.path.join(ROOT_DIR, "databases"))
+import argparse
+import hashlib
+import json
+import logging
+import platform
+import random
+import sqlite3
+import statistics
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SCALES = [0.05, 0.25, 1.0]
+DEFAULT_TABLES = ["customers", "orders", "sales", "products", "financial_transactions"]
+DEFAULT_DATA_PRODUCTS = ["Customer 360 View", "Financial Reporting Suite"]
+
+# Representative ad-hoc statements, similar to what the Text2SQL agent produces
+TEXT2SQL_QUERIES = {
+    "customer_count_by_segment": "SELECT customer_segment, COUNT(*) AS customers FROM customers GROUP BY customer_segment",
+    "monthly_revenue": "SELECT strftime('%Y-%m', order_date) AS month, SUM(net_amount) AS revenue FROM orders GROUP BY month ORDER BY month",
+    "top_products_by_revenue": """
+        SELECT p.product_name, SUM(s.total_price) AS revenue
+        FROM sales s JOIN products p ON s.product_id = p.product_id
+        GROUP BY p.product_id ORDER BY revenue DESC LIMIT 20
+    """,
+    "net_margin_per_customer": """
+        SELECT c.customer_id, SUM(s.total_price - p.cost * s.quantity) AS net_margin
+        FROM sales s
+        JOIN products p ON s.product_id = p.product_id
+        JOIN orders o ON s.order_id = o.order_id
+        JOIN customers c ON o.customer_id = c.customer_id
+        GROUP BY c.customer_id
+    """
+}
+
+
+def _scale_label(scale: float) -> str:
+    """File-name safe label for a scale factor (connection strings reject dots)"""
+    return f"sf{scale:g}".replace(".", "_")
+
+
+def _generator_hash() -> str:
+    """Hash of the generator source, so cached databases are rebuilt when it changes"""
+    generator = Path(ROOT_DIR) / "databases" / "ecommerce_db_setup.py"
+    return hashlib.sha256(generator.read_bytes()).hexdigest()[:12]
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=ROOT_DIR, stderr=subprocess.DEVNULL
+        ).decode().strip()
+    except Exception:
+        return None
+
+
+def build_database(scale: float, seed: int, rebuild: bool = False) -> Path:
+    """
+    Build (or reuse) a synthetic ecommerce database for the given scale factor.
+
+    Databases live in databases/ so their connection strings pass the platform's
+    connection-string validation. A sidecar JSON records the generator hash and seed.
+    """
+    from ecommerce_db_setup import EnhancedECommerceDataSetup
+    from faker import Faker
+
+    db_path = Path("databases") / f"bench_ecommerce_{_scale_label(scale)}.db"
+    info_path = db_path.with_suffix(".json")
+    build_info = {"scale_factor": scale, "seed": seed, "generator_hash": _generator_hash()}
+
+    if not rebuild and db_path.exists() and info_path.exists():
+        try:
+            if json.loads(info_path.read_text(encoding="utf-8")) == build_info:
+                logger.info(f"♻️ Reusing cached benchmark database {db_path}")
+                return db_path
+        except json.JSONDecodeError:
+            pass
+
+    logger.info(f"🏗️ Building benchmark database {db_path} (scale factor {scale})")
+    random.seed(seed)
+    Faker.seed(seed)
+    setup = EnhancedECommerceDataSetup(db_path=str(db_path), scale_factor=scale)
+    setup.create_sample_databases()
+    info_path.write_text(json.dumps(build_info, indent=2), encoding="utf-8")
+    return db_path
+
+
+def _table_row_counts(db_path: Path) -> Dict[str, int]:
+    conn = sqlite3.connect(str(db_path))
+    try:
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type='table'")]
+        return {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+    finally:
+        conn.close()
+
+
+def _output_has_error(output: Any) -> Optional[str]:
+    """Tools report failures in their return value rather than raising"""
+    if isinstance(output, list):
+        errors = [row.get("error") for row in output if isinstance(row, dict) and row.get("error")]
+        return errors[0] if errors else None
+    if isinstance(output, str):
+        try:
+            parsed = json.loads(output)
+        except json.JSONDecodeError:
+            return output if output.startswith(("❌", "⚠️", "⛔")) else None
+        if isinstance(parsed, dict) and parsed.get("error"):
+            return str(parsed["error"])
+    return None
+
+
+def measure(func: Callable[[], Any], repeat: int) -> Dict[str, Any]:
+    """
+    Time `func` over `repeat` runs, then run it once more under tracemalloc for peak memory.
+    Timing and memory runs are separate because tracemalloc slows allocation-heavy code.
+    """
+    timings = []
+    error = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func()
+        timings.append(time.perf_counter() - start)
+        error = error or _output_has_error(output)
+
+    tracemalloc.start()
+    try:
+        func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "runs": repeat,
+        "min_s": round(min(timings), 6),
+        "median_s": round(statistics.median(timings), 6),
+        "mean_s": round(statistics.mean(timings), 6),
+        "max_s": round(max(timings), 6),
+        "peak_memory_mb": round(peak / (1024 * 1024), 3),
+        "error": error
+    }
+
+
+def _build_cases(db_path: Path, tables: List[str], data_products: List[str]) -> List[Dict[str, Any]]:
+    """Assemble (tool, target, callable) benchmark cases for one database"""
+    from tools.database_tools import MetadataExtractionTool
+    from tools.data_tools import DataProfilingTool, DataValidationTool
+    from tools.analytics_tools import CrewText2SQLTool, ReportGenerationTool
+    from utils.report_templates import create_report_templates
+    from utils.data_products_loader import load_data_products_config
+
+    connection_string = f"sqlite:///{db_path.as_posix()}"
+    all_tables = list(_table_row_counts(db_path).keys())
+
+    metadata_tool = MetadataExtractionTool()
+    profiling_tool = DataProfilingTool()
+    validation_tool = DataValidationTool()
+    text2sql_tool = CrewText2SQLTool()
+
+    report_templates = create_report_templates()
+    report_tool = ReportGenerationTool(
+        report_templates=report_templates,
+        data_product_reports={dp["name"]: dp["report_suite"] for dp in load_data_products_config()}
+    )
+
+    cases = []
+    for table in tables:
+        cases.append({
+            "tool": "MetadataExtractionTool", "target": table,
+            "func": lambda t=table: metadata_tool._run(table_name=t, connection_string=connection_string)
+        })
+        cases.append({
+            "tool": "DataProfilingTool", "target": table,
+            "func": lambda t=table: profiling_tool._run(table_name=t, connection_string=connection_string)
+        })
+        cases.append({
+            "tool": "DataValidationTool", "target": table,
+            "func": lambda t=table: validation_tool._run(table_name=t, connection_string=connection_string)
+        })
+
+    for product in data_products:
+        for template in report_templates.get(product, []):
+            parameters = {"data_product": product, "data_sources": all_tables}
+            cases.append({
+                "tool": "ReportGenerationTool", "target": template["type"],
+                "func": lambda tpl=template, params=parameters: report_tool._run(
+                    report_type=tpl["type"], data_source=str(db_path), parameters=dict(params)
+                )
+            })
+
+    db_files = [{"name": db_path.name, "path": str(db_path)}]
+    for name, sql in TEXT2SQL_QUERIES.items():
+        cases.append({
+            "tool": "execute_sql_across_dbs", "target": name,
+            "func": lambda q=sql: text2sql_tool.execute_sql_across_dbs(q, db_files)
+        })
+
+    return cases
+
+
+def run_benchmarks(scales: List[float], repeat: int, tables: List[str], data_products: List[str],
+                   seed: int, rebuild: bool, tool_filter: Optional[List[str]] = None) -> Dict[str, Any]:
+    results = []
+    databases = {}
+
+    for scale in scales:
+        db_path = build_database(scale, seed=seed, rebuild=rebuild)
+        row_counts = _table_row_counts(db_path)
+        databases[_scale_label(scale)] = {
+            "scale_factor": scale,
+            "path": str(db_path),
+            "size_mb": round(db_path.stat().st_size / (1024 * 1024), 3),
+            "row_counts": row_counts
+        }
+
+        for case in _build_cases(db_path, tables, data_products):
+            if tool_filter and case["tool"] not in tool_filter:
+                continue
+            logger.info(f"⏱️ [{_scale_label(scale)}] {case['tool']} -> {case['target']}")
+            stats = measure(case["func"], repeat)
+            results.append({
+                "scale_factor": scale,
+                "tool": case["tool"],
+                "target": case["target"],
+                "rows": row_counts.get(case["target"]),
+                **stats
+            })
+
+    return {
+        "generated_at": datetime.now().isoformat(),
+        "git_commit": _git_commit(),
+        "environment": {
+            "python": platform.python_version(),
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform()
+        },
+        "settings": {"scales": scales, "repeat": repeat, "seed": seed, "tables": tables, "data_products": data_products},
+        "databases": databases,
+        "results": results
+    }
+
+
+def compare_results(baseline_path: str, candidate_path: str) -> List[Dict[str, Any]]:
+    """Compare two result files case-by-case on median time and peak memory"""
+    baseline = json.loads(Path(baseline_path).read_text(encoding="utf-8"))
+    candidate = json.loads(Path(candidate_path).read_text(encoding="utf-8"))
+
+    def key(r):
+        return (r["scale_factor"], r["tool"], r["target"])
+
+    baseline_map = {key(r): r for r in baseline.get("results", [])}
+    rows = []
+    for r in candidate.get("results", []):
+        base = baseline_map.get(key(r))
+        if not base:
+            continue
+        rows.append({
+            "scale_factor": r["scale_factor"],
+            "tool": r["tool"],
+            "target": r["target"],
+            "baseline_median_s": base["median_s"],
+            "candidate_median_s": r["median_s"],
+            "speedup": round(base["median_s"] / r["median_s"], 2) if r["median_s"] else None,
+            "memory_delta_mb": round(r["peak_memory_mb"] - base["peak_memory_mb"], 3)
+        })
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the platform's data tools on synthetic databases")
+    parser.add_argument("--scales", type=float, nargs="+", default=DEFAULT_SCALES, help="Scale factors to build and benchmark")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed runs per case")
+    parser.add_argument("--tables", nargs="+", default=DEFAULT_TABLES, help="Tables for metadata/profiling/validation")
+    parser.add_argument("--data-products", nargs="+", default=DEFAULT_DATA_PRODUCTS, help="Data products whose report suites are benchmarked")
+    parser.add_argument("--tools", nargs="+", default=None, help="Only run these tools (e.g. DataProfilingTool)")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the data generator")
+    parser.add_argument("--rebuild", action="store_true", help="Rebuild databases even if a cached copy exists")
+    parser.add_argument("--output-dir", default="benchmarks/results", help="Directory for JSON results")
+    parser.add_argument("--compare", nargs=2, metavar=("BASELINE", "CANDIDATE"), help="Compare two result files and exit")
+    args = parser.parse_args(argv)
+
+    os.chdir(ROOT_DIR)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s: %(message)s")
+
+    if args.compare:
+        rows = compare_results(*args.compare)
+        print(json.dumps(rows, indent=2))
+        return 0
+
+    report = run_benchmarks(
+        scales=args.scales,
+        repeat=args.repeat,
+        tables=args.tables,
+        data_products=args.data_products,
+        seed=args.seed,
+        rebuild=args.rebuild,
+        tool_filter=args.tools
+    )
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    output_path = output_dir / f"bench_{report['git_commit'] or 'nogit'}_{timestamp}.json"
+    output_path.write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+    print(f"Benchmark results written to {output_path}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
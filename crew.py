@@ -5,23 +5,33 @@ Crew orchestration for the Agentic Data Management Platform
 from crewai.tools import BaseTool
 import os
 import logging
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Iterator, Tuple
 from pathlib import Path
 from crewai import Agent, Task, Crew, Process
 from tools.safe_file_read_tool import SafeFileReadTool
 from tools.safe_directory_read_tool import SafeDirectoryReadTool
-from utils.report_generator import save_report_as_markdown
-from utils.data_products_loader import load_data_products_config
-from utils.report_templates import create_report_templates
+from utils.report_generator import save_report_as_markdown, render_report_markdown
+from utils.report_narration import get_report_narrator
 from utils.discovery_engine import synthesize_discovery_results
 from utils.path_utils import sanitize_connection_string
 from utils.discovery_formatter import extract_json_block, extract_recommendations, wrap_discovery_output, extract_markdown_section
-from utils.helpers import setup_logging
+from utils.helpers import setup_logging, extract_schema_info
+from utils.cataloging_formatter import wrap_cataloging_output
+from utils.change_detection import get_change_detector
+from utils.data_catalog import get_data_catalog
+from utils.stats_maintenance import ensure_fresh_statistics
+from utils.db_fanout import fan_out_databases
+from utils.agent_registry import get_agent_registry
+from utils.discovery_context import get_table_context_precomputer, compact_metadata, compact_profiling, format_context
 from langchain.tools import Tool
 from datetime import datetime, timedelta
 import sqlite3
 import json
 import re
+import time
+import threading
+from contextlib import ExitStack, contextmanager
+from concurrent.futures import Future, ThreadPoolExecutor
 from dotenv import load_dotenv
 load_dotenv(override=True)
 
@@ -30,11 +40,11 @@ try:
     from tools.database_tools import DatabaseConnectionTool, MetadataExtractionTool
     from tools.data_tools import DataProfilingTool, DataValidationTool
     from tools.analytics_tools import CrewText2SQLTool, ReportGenerationTool
+    from tools.performance_tools import IndexAdvisorTool, QueryPlanTool
 except ImportError as e:
     logging.warning(f"Could not import custom tools: {e}")
 
-from models.data_models import PlatformConfig
-from utils.helpers import load_yaml_config
+from models.data_models import PlatformConfig, ReportResult
 
 setup_logging(log_level="DEBUG")
 logger = logging.getLogger(__name__)
@@ -46,9 +56,11 @@ class DataManagementCrew:
     
     def __init__(self, config: Optional[PlatformConfig] = None):
         self.config = config or self._get_default_config()
+        # Configs, tools and agents are process-wide, so a crew per request costs nothing
+        self.registry = get_agent_registry()
         self.agents_config = self._load_agents_config()
         self.tasks_config = self._load_tasks_config()
-        self.tools = self._initialize_tools()
+        self.tools = self.registry.tools(self._initialize_tools)
     
     def _get_default_config(self) -> PlatformConfig:
         """Get default configuration if none provided"""
@@ -61,7 +73,7 @@ class DataManagementCrew:
     def _load_agents_config(self) -> Dict[str, Any]:
         """Load agents configuration with fallback"""
         try:
-            return load_yaml_config("config/agents.yaml")
+            return self.registry.load_config("config/agents.yaml")
         except Exception as e:
             logger.warning(f"Could not load agents config: {e}")
             return self._get_default_agents_config()
@@ -69,11 +81,19 @@ class DataManagementCrew:
     def _load_tasks_config(self) -> Dict[str, Any]:
         """Load tasks configuration with fallback"""
         try:
-            return load_yaml_config("config/tasks.yaml")
+            return self.registry.load_config("config/tasks.yaml")
         except Exception as e:
             logger.warning(f"Could not load tasks config: {e}")
             return self._get_default_tasks_config()
-        
+
+    def _get_default_agents_config(self) -> Dict[str, Any]:
+        """No agent definitions: every agent falls back to a generic one without tools"""
+        return {}
+
+    def _get_default_tasks_config(self) -> Dict[str, Any]:
+        """No task definitions: every task falls back to a generic description of its inputs"""
+        return {}
+
     def _initialize_tools(self) -> Dict[str, Any]:
         tools = {}
 
@@ -88,17 +108,8 @@ class DataManagementCrew:
 
         try:
             text2sql_tool = CrewText2SQLTool()
-            report_templates = create_report_templates()
-            data_products = load_data_products_config()
-            data_product_reports = {
-                dp["name"]: dp["report_suite"]
-                for dp in data_products
-            }
-
-            report_generation_tool = ReportGenerationTool(
-                report_templates=report_templates,
-                data_product_reports=data_product_reports
-            )
+            # Templates and report suites come from the process-wide template registry
+            report_generation_tool = ReportGenerationTool()
 
             tools.update({
                 "database_connection": DatabaseConnectionTool(),
@@ -106,7 +117,9 @@ class DataManagementCrew:
                 "data_profiling": DataProfilingTool(),
                 "data_validation": DataValidationTool(),
                 "text2sql": text2sql_tool,
-                "report_generation": report_generation_tool
+                "report_generation": report_generation_tool,
+                "index_advisor": IndexAdvisorTool(),
+                "query_plan": QueryPlanTool()
             })
             logger.debug(f"Custom tools initialized: {list(tools.keys())}")
         except Exception as e:
@@ -152,6 +165,24 @@ class DataManagementCrew:
                 allow_delegation=False
             )
     
+    @contextmanager
+    def _agent(self, agent_name: str) -> Iterator[Agent]:
+        """Lease the agent for `agent_name`, built once per configuration and reused across tables and phases"""
+        agent_config = {"name": agent_name, **(self.agents_config.get(agent_name) or {})}
+        with self.registry.lease(agent_config, lambda: self._create_agent_from_config(agent_name)) as agent:
+            yield agent
+
+    def _run_crew(self, steps: List[Tuple[str, str, Dict[str, Any]]]) -> Any:
+        """Run (agent name, task name, inputs) steps as one sequential crew on leased agents"""
+        with ExitStack() as stack:
+            agents = [stack.enter_context(self._agent(agent_name)) for agent_name, _, _ in steps]
+            tasks = [
+                self._create_task_from_config(task_name, agent, task_inputs)
+                for agent, (_, task_name, task_inputs) in zip(agents, steps)
+            ]
+            crew = Crew(agents=agents, tasks=tasks, process=Process.sequential, verbose=True)
+            return crew.kickoff()
+
     def _create_task_from_config(self, task_name: str, agent: Agent, inputs: Dict[str, Any]) -> Task:
         """Create task from configuration"""
         try:
@@ -164,6 +195,14 @@ class DataManagementCrew:
             except (KeyError, ValueError) as e:
                 logger.warning(f"Could not format task description for {task_name}: {e}")
                 # Use description as-is if formatting fails
+
+            # Tool outputs computed ahead of time (JSON, so appended after formatting)
+            if inputs.get("precomputed_context"):
+                description += (
+                    "\n\nPrecomputed metadata and profiling for this table (already gathered by the "
+                    "platform; interpret these facts instead of calling the metadata or profiling tools):\n"
+                    + inputs["precomputed_context"]
+                )
             
             return Task(
                 description=description,
@@ -200,196 +239,73 @@ class DataManagementCrew:
         with summary_path.open("a", encoding="utf-8") as f:
             f.write("## 🔎 Discovery Phase\n\n")
 
-        for db_url in self.config.database_urls:
-            db_url = sanitize_connection_string(db_url)
-            if not db_url:
-                logger.warning(f"Skipping invalid connection string: {db_url}")
-                continue
-
-            logger.info(f"Running discovery for DB: {db_url}")
-
-            for table_name in data_sources:
-                logger.info(f"Executing for table: {table_name}")
-                metadata = {}
-                profiling = {}
-                foundation_parsed = {}
-                process_analysis = ""
-                recommendation_md = ""
-                formatted_md = ""
-
-                db_inputs = {
-                    **inputs,
-                    "config": {**inputs.get("config", {}), "database_url": db_url},
-                    "connection_string": db_url,
-                    "table_name": table_name,
-                    "allowed_tables": [table_name],
-                    "include_sample_data": False,
-                    "max_sample_size": 1000
-                }
-
-                try:
-                    # --- Step 1: Research Agent ---
-                    research_agent = self._create_agent_from_config("data_research_agent")
-                    research_task = self._create_task_from_config("data_research_task", research_agent, db_inputs)
-                    research_crew = Crew(agents=[research_agent], tasks=[research_task], process=Process.sequential, verbose=True)
-                    research_result = research_crew.kickoff()
-                    research_raw_result = research_result.get("raw") if isinstance(research_result, dict) else str(research_result)
-                    logger.debug(f"Raw research agent result (first 1K chars):\n{research_raw_result[:1000]}")
-
-                    parsed_result = extract_json_block(research_raw_result)
-                    if isinstance(parsed_result, str):
-                        try:
-                            parsed_result = json.loads(parsed_result)
-                        except Exception as e:
-                            logger.error(f"Failed to parse JSON from research result: {e}")
-                            parsed_result = {}
-
-                    metadata = parsed_result.get("metadata", {}) if isinstance(parsed_result, dict) else {}
-                    profiling = parsed_result.get("profiling", {}) if isinstance(parsed_result, dict) else {}
-
-                    if isinstance(metadata, str):
-                        try:
-                            metadata = json.loads(metadata)
-                        except Exception:
-                            logger.warning(f"Metadata is not valid JSON for {table_name}.")
-                            metadata = {}
-
-                    if isinstance(profiling, str):
-                        try:
-                            profiling = json.loads(profiling)
-                        except Exception:
-                            logger.warning(f"Profiling is not valid JSON for {table_name}.")
-                            profiling = {}
-
-                    # --- Step 2: Foundation Setup Agent ---
-                    foundation_agent = self._create_agent_from_config("data_foundation_setup_agent")
-                    foundation_task = self._create_task_from_config("foundation_setup_task", foundation_agent, db_inputs)
-                    foundation_crew = Crew(agents=[foundation_agent], tasks=[foundation_task], process=Process.sequential, verbose=True)
-                    foundation_result = foundation_crew.kickoff()
-                    foundation_raw_result = foundation_result.get("raw") if isinstance(foundation_result, dict) else str(foundation_result)
-                    logger.debug(f"Raw foundation agent result (first 1K chars):\n{foundation_raw_result[:1000]}")
-
-                    try:
-                        foundation_parsed = extract_json_block(foundation_raw_result)
-                        if isinstance(foundation_parsed, str):
-                            foundation_parsed = json.loads(foundation_parsed)
-                        if isinstance(foundation_parsed, dict):
-                            foundation_table_data = foundation_parsed.get(table_name) or foundation_parsed.get(table_name.lower())
-                            if isinstance(foundation_table_data, dict):
-                                foundation_parsed = foundation_table_data
-                    except Exception as e:
-                        logger.warning(f"Could not parse foundation setup result for {table_name}: {e}")
-                        foundation_parsed = {}
-
-                    # --- Step 3: Process Understanding Agent ---
-                    process_inputs = {
-                        **inputs,
-                        "config": db_inputs.get("config", {}),
-                        "connection_string": db_url,
-                        "table_name": table_name,
-                        "allowed_tables": data_sources,
-                        "data_sources": data_sources,
-                        "metadata": metadata,
-                        "profiling": profiling
-                    }
-
-                    process_agent = self._create_agent_from_config("process_understanding_agent")
-                    process_task = self._create_task_from_config("process_understanding_task", process_agent, process_inputs)
-                    process_crew = Crew(agents=[process_agent], tasks=[process_task], process=Process.sequential, verbose=True)
-                    process_result = process_crew.kickoff()
-                    logger.debug(f"[process_understanding] Raw result:\n{process_result}")
-                    process_raw_result = process_result.get("raw") if isinstance(process_result, dict) else str(process_result)
-                    logger.debug(f"Raw process agent result (first 1K chars):\n{process_raw_result[:1000]}")
-
-                    try:
-                        if isinstance(process_raw_result, str) and "### 🔄 Process Mapping" in process_raw_result:
-                            process_analysis = extract_markdown_section(process_raw_result)
-                        elif isinstance(process_raw_result, str):
-                            logger.warning("Expected markdown header missing. Using full output as fallback.")
-                            process_analysis = process_raw_result.strip()
-                        else:
-                            process_analysis = ""
-                    except Exception as e:
-                        logger.warning(f"Could not parse process understanding result for {table_name}: {e}")
-                        process_analysis = ""
-
-                    # --- Step 4: Governance Recommendations ---
+        use_cache = bool(self.config and self.config.cache_enabled) and not inputs.get("force_refresh", False)
+        detector = get_change_detector()
+
+        # (db, table) in discovery order, each with a cached result or a pending future
+        jobs = []
+        max_workers = max(1, self.config.max_concurrent_tasks)
+        # Per database: ms from the phase start until its last table finished
+        phase_start = time.perf_counter()
+        db_timings = {}
+        timings_lock = threading.Lock()
+
+        def record_finish(db_url: str) -> None:
+            with timings_lock:
+                db_timings[db_url] = round((time.perf_counter() - phase_start) * 1000, 3)
+
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="discovery") as executor:
+            for db_url in self.config.database_urls:
+                db_url = sanitize_connection_string(db_url)
+                if not db_url:
+                    logger.warning(f"Skipping invalid connection string: {db_url}")
+                    continue
+
+                logger.info(f"Running discovery for DB: {db_url}")
+                record_finish(db_url)
+
+                changed_tables = set(data_sources)
+                if use_cache:
                     try:
-                        governance_agent = self._create_agent_from_config("data_governance_recommender_agent")
-                        rec_inputs = {
-                            **db_inputs,
-                            "metadata": metadata,
-                            "profiling": profiling,
-                            "foundation": foundation_parsed
-                        }
-                        rec_task = self._create_task_from_config("data_recommendation_task", governance_agent, rec_inputs)
-                        rec_crew = Crew(agents=[governance_agent], tasks=[rec_task], process=Process.sequential, verbose=True)
-                        rec_result = rec_crew.kickoff()
-                        recommendation_md = rec_result.get("raw") if isinstance(rec_result, dict) else str(rec_result)
-                        logger.debug(f"AI Governance Recommendations:\n{recommendation_md[:1000]}")
+                        changed_tables = set(detector.changed_tables(db_url, data_sources, consumer="discovery"))
                     except Exception as e:
-                        logger.warning(f"Could not generate governance recommendations for table {table_name}: {e}")
-                        recommendation_md = ""
-
-                    # --- Step 5: Markdown Output ---
+                        logger.warning(f"Change detection failed for {db_url}, reprocessing all tables: {e}")
+
+                for table_name in data_sources:
+                    if table_name not in changed_tables:
+                        cached = self._load_cached_discovery(db_url, table_name)
+                        if cached:
+                            logger.info(f"⏭️ Skipping unchanged table {table_name}, reusing previous discovery result")
+                            jobs.append((db_url, table_name, cached))
+                            continue
+                    future = executor.submit(self._discover_table, db_url, table_name, inputs, data_sources)
+                    future.add_done_callback(lambda _, db_url=db_url: record_finish(db_url))
+                    jobs.append((db_url, table_name, future))
+
+            logger.info(f"Discovering {sum(isinstance(job, Future) for _, _, job in jobs)} tables "
+                        f"with up to {max_workers} concurrent workers")
+
+            # Collected in discovery order, so the summary and results are deterministic
+            for db_url, table_name, job in jobs:
+                if isinstance(job, Future):
                     try:
-                        rule_based_recs = extract_recommendations(metadata or {}, profiling or [])
-                        ai_recommendations_md = recommendation_md.strip() if isinstance(recommendation_md, str) else ""
-
-                        formatted_md = wrap_discovery_output(
-                            table_name=table_name,
-                            metadata=metadata,
-                            profiling=profiling,
-                            recommendations=rule_based_recs,
-                            foundation=foundation_parsed,
-                            process_analysis=process_analysis,
-                            ai_recommendations=ai_recommendations_md
-                        )
-
-                        with summary_path.open("a", encoding="utf-8") as f:
-                            f.write(formatted_md + "\n\n")
-
-                        results.append({
-                            "db": db_url,
-                            "table": table_name,
-                            "result": {
-                                "metadata": metadata,
-                                "profiling": profiling
-                            },
-                            "summary": formatted_md,
-                            "recommendations": rule_based_recs
-                        })
-
-                        if metadata:
-                            all_metadata.append(metadata)
-                        if profiling:
-                            all_profiling.append(profiling)
-
+                        entry = job.result()
                     except Exception as e:
-                        logger.error(f"Failed to format/save discovery output for {table_name}: {e}")
-                        results.append({
-                            "db": db_url,
-                            "table": table_name,
-                            "error": str(e),
-                            "result": {
-                                "metadata": {},
-                                "profiling": {}
-                            },
-                            "summary": ""
-                        })
-
-                except Exception as e:
-                    logger.error(f"Error processing table {table_name}: {e}")
-                    results.append({
-                        "db": db_url,
-                        "table": table_name,
-                        "error": str(e),
-                        "result": {
-                            "metadata": {},
-                            "profiling": {}
-                        },
-                        "summary": ""
-                    })
+                        logger.error(f"Error processing table {table_name}: {e}")
+                        entry = self._discovery_error(db_url, table_name, e)
+                else:
+                    entry = job
+                results.append(entry)
+                if entry.get("summary"):
+                    with summary_path.open("a", encoding="utf-8") as f:
+                        f.write(entry["summary"] + "\n\n")
+                if entry["result"].get("metadata"):
+                    all_metadata.append(entry["result"]["metadata"])
+                if entry["result"].get("profiling"):
+                    all_profiling.append(entry["result"]["profiling"])
+
+        timings = ", ".join(f"{db}: {ms:.0f} ms" for db, ms in db_timings.items())
+        logger.info(f"⏱️ discovery ran on {len(db_timings)} databases ({timings})")
 
         # Final synthesis
         try:
@@ -397,14 +313,221 @@ class DataManagementCrew:
                 from utils.discovery_engine import synthesize_discovery_results
                 final_summary = synthesize_discovery_results(all_metadata, all_profiling)
                 logger.info("Final discovery synthesis complete.")
-                return {"results": results, "summary": final_summary}
+                return {"results": results, "summary": final_summary, "db_timings": db_timings}
             else:
                 logger.warning("No metadata or profiling outputs found for final synthesis.")
-                return {"results": results}
+                return {"results": results, "db_timings": db_timings}
         except Exception as e:
             logger.error(f"Final synthesis failed: {e}")
-            return {"results": results}
+            return {"results": results, "db_timings": db_timings}
     
+    def _discover_table(self, db_url: str, table_name: str, inputs: Dict[str, Any],
+                        data_sources: List[str]) -> Dict[str, Any]:
+        """
+        Run the five discovery crews (research, foundation, process, governance, formatting)
+        for one table. Runs on a discovery worker thread; failures come back as an error
+        entry so other tables are unaffected.
+        """
+        logger.info(f"Executing for table: {table_name}")
+        metadata = {}
+        profiling = {}
+        foundation_parsed = {}
+        process_analysis = ""
+        recommendation_md = ""
+        formatted_md = ""
+
+        db_inputs = {
+            **inputs,
+            "config": {**inputs.get("config", {}), "database_url": db_url},
+            "connection_string": db_url,
+            "table_name": table_name,
+            "allowed_tables": [table_name],
+            "include_sample_data": False,
+            "max_sample_size": 1000
+        }
+
+        try:
+            # --- Step 1: Metadata and profiling, run directly by the tools ---
+            precomputed = get_table_context_precomputer().precompute(
+                table_name, db_url, self.tools.get("metadata_extraction"), self.tools.get("data_profiling")
+            )
+            metadata, profiling = precomputed["metadata"], precomputed["profiling"]
+
+            if not (metadata and profiling):
+                # --- Fallback: Research Agent gathers them through its tools ---
+                logger.warning(f"Precomputation incomplete for {table_name} ({'; '.join(precomputed['errors'])}), "
+                               f"falling back to the research agent")
+                research_result = self._run_crew([("data_research_agent", "data_research_task", db_inputs)])
+                research_raw_result = research_result.get("raw") if isinstance(research_result, dict) else str(research_result)
+                logger.debug(f"Raw research agent result (first 1K chars):\n{research_raw_result[:1000]}")
+
+                parsed_result = extract_json_block(research_raw_result)
+                if isinstance(parsed_result, str):
+                    try:
+                        parsed_result = json.loads(parsed_result)
+                    except Exception as e:
+                        logger.error(f"Failed to parse JSON from research result: {e}")
+                        parsed_result = {}
+
+                metadata = parsed_result.get("metadata", {}) if isinstance(parsed_result, dict) else {}
+                profiling = parsed_result.get("profiling", {}) if isinstance(parsed_result, dict) else {}
+
+                if isinstance(metadata, str):
+                    try:
+                        metadata = json.loads(metadata)
+                    except Exception:
+                        logger.warning(f"Metadata is not valid JSON for {table_name}.")
+                        metadata = {}
+
+                if isinstance(profiling, str):
+                    try:
+                        profiling = json.loads(profiling)
+                    except Exception:
+                        logger.warning(f"Profiling is not valid JSON for {table_name}.")
+                        profiling = {}
+
+            # Agents interpret a compact digest of the tool outputs instead of calling the tools
+            compact_meta, compact_prof = compact_metadata(metadata), compact_profiling(profiling)
+            db_inputs["precomputed_context"] = format_context({"metadata": compact_meta, "profiling": compact_prof})
+
+            # --- Step 2: Foundation Setup Agent ---
+            foundation_result = self._run_crew([("data_foundation_setup_agent", "foundation_setup_task", db_inputs)])
+            foundation_raw_result = foundation_result.get("raw") if isinstance(foundation_result, dict) else str(foundation_result)
+            logger.debug(f"Raw foundation agent result (first 1K chars):\n{foundation_raw_result[:1000]}")
+
+            try:
+                foundation_parsed = extract_json_block(foundation_raw_result)
+                if isinstance(foundation_parsed, str):
+                    foundation_parsed = json.loads(foundation_parsed)
+                if isinstance(foundation_parsed, dict):
+                    foundation_table_data = foundation_parsed.get(table_name) or foundation_parsed.get(table_name.lower())
+                    if isinstance(foundation_table_data, dict):
+                        foundation_parsed = foundation_table_data
+            except Exception as e:
+                logger.warning(f"Could not parse foundation setup result for {table_name}: {e}")
+                foundation_parsed = {}
+
+            # --- Step 3: Process Understanding Agent ---
+            process_inputs = {
+                **inputs,
+                "config": db_inputs.get("config", {}),
+                "connection_string": db_url,
+                "table_name": table_name,
+                "allowed_tables": data_sources,
+                "data_sources": data_sources,
+                "metadata": format_context(compact_meta),
+                "profiling": format_context(compact_prof)
+            }
+
+            process_result = self._run_crew([("process_understanding_agent", "process_understanding_task", process_inputs)])
+            logger.debug(f"[process_understanding] Raw result:\n{process_result}")
+            process_raw_result = process_result.get("raw") if isinstance(process_result, dict) else str(process_result)
+            logger.debug(f"Raw process agent result (first 1K chars):\n{process_raw_result[:1000]}")
+
+            try:
+                if isinstance(process_raw_result, str) and "### 🔄 Process Mapping" in process_raw_result:
+                    process_analysis = extract_markdown_section(process_raw_result)
+                elif isinstance(process_raw_result, str):
+                    logger.warning("Expected markdown header missing. Using full output as fallback.")
+                    process_analysis = process_raw_result.strip()
+                else:
+                    process_analysis = ""
+            except Exception as e:
+                logger.warning(f"Could not parse process understanding result for {table_name}: {e}")
+                process_analysis = ""
+
+            # --- Step 4: Governance Recommendations ---
+            try:
+                rec_inputs = {
+                    **db_inputs,
+                    "metadata": format_context(compact_meta),
+                    "profiling": format_context(compact_prof),
+                    "foundation": foundation_parsed
+                }
+                # The recommendation task already embeds the digest through {metadata} and {profiling}
+                rec_inputs.pop("precomputed_context")
+                rec_result = self._run_crew([("data_governance_recommender_agent", "data_recommendation_task", rec_inputs)])
+                recommendation_md = rec_result.get("raw") if isinstance(rec_result, dict) else str(rec_result)
+                logger.debug(f"AI Governance Recommendations:\n{recommendation_md[:1000]}")
+            except Exception as e:
+                logger.warning(f"Could not generate governance recommendations for table {table_name}: {e}")
+                recommendation_md = ""
+
+            # --- Step 5: Markdown Output ---
+            try:
+                rule_based_recs = extract_recommendations(metadata or {}, profiling or [])
+                ai_recommendations_md = recommendation_md.strip() if isinstance(recommendation_md, str) else ""
+
+                formatted_md = wrap_discovery_output(
+                    table_name=table_name,
+                    metadata=metadata,
+                    profiling=profiling,
+                    recommendations=rule_based_recs,
+                    foundation=foundation_parsed,
+                    process_analysis=process_analysis,
+                    ai_recommendations=ai_recommendations_md
+                )
+
+                entry = {
+                    "db": db_url,
+                    "table": table_name,
+                    "result": {
+                        "metadata": metadata,
+                        "profiling": profiling
+                    },
+                    "summary": formatted_md,
+                    "recommendations": rule_based_recs
+                }
+                self._store_cached_discovery(db_url, table_name, entry)
+                return entry
+
+            except Exception as e:
+                logger.error(f"Failed to format/save discovery output for {table_name}: {e}")
+                return self._discovery_error(db_url, table_name, e)
+
+        except Exception as e:
+            logger.error(f"Error processing table {table_name}: {e}")
+            return self._discovery_error(db_url, table_name, e)
+
+    @staticmethod
+    def _discovery_error(db_url: str, table_name: str, error: Exception) -> Dict[str, Any]:
+        return {
+            "db": db_url,
+            "table": table_name,
+            "error": str(error),
+            "result": {
+                "metadata": {},
+                "profiling": {}
+            },
+            "summary": ""
+        }
+
+    def _load_cached_discovery(self, db_url: str, table_name: str) -> Optional[Dict[str, Any]]:
+        """Previous discovery result for a table the change detector reports as unchanged"""
+        try:
+            return get_data_catalog().get_discovery_result(db_url, table_name)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable catalog entry for {table_name}: {e}")
+            return None
+
+    def _store_cached_discovery(self, db_url: str, table_name: str, result: Dict[str, Any]) -> None:
+        """Persist a table's discovery result in the data catalog and checkpoint its fingerprint"""
+        try:
+            get_data_catalog().record_discovery_result(db_url, table_name, result)
+            get_change_detector().mark_processed(db_url, consumer="discovery", tables=[table_name])
+        except Exception as e:
+            logger.warning(f"Could not cache discovery result for {table_name}: {e}")
+
+    def _record_run(self, phase: str, status: str, started_at: datetime, db_urls: List[str],
+                    details: Optional[Dict[str, Any]] = None) -> None:
+        """Append a phase run to the data catalog's run history"""
+        try:
+            catalog = get_data_catalog()
+            for db_url in db_urls or [None]:
+                catalog.record_run(phase, status, started_at, db_path=db_url, details=details)
+        except Exception as e:
+            logger.warning(f"Could not record run history for {phase}: {e}")
+
     def run_data_cataloging(self, inputs: Dict[str, Any] = None) -> Dict[str, Any]:
         logger.info("Initializing Multi-DB Data Cataloging...")
         if inputs is None:
@@ -422,98 +545,106 @@ class DataManagementCrew:
         with summary_path.open("a", encoding="utf-8") as f:
             f.write("## 🗂️ Cataloging Phase\n\n")
 
+        db_urls = []
         for db_url in self.config.database_urls:
             db_url = sanitize_connection_string(db_url)
             if not db_url:
                 logger.warning(f"Skipping invalid connection string: {db_url}")
                 continue
+            db_urls.append(db_url)
+
+        # Databases are cataloged concurrently; results are merged in database order
+        db_timings = {}
+        for db_entry in fan_out_databases(
+            db_urls, lambda db_url: self._catalog_database(db_url, inputs, data_sources),
+            self.config.max_concurrent_tasks, label="cataloging"
+        ):
+            db_timings[db_entry["db"]] = db_entry["duration_ms"]
+            if "error" in db_entry:
+                results.append({"db": db_entry["db"], "table": None, "lineage": "", "validation": "",
+                                "integration": "", "summary": "", "error": db_entry["error"]})
+                continue
+            for entry in db_entry["result"]:
+                if entry.get("summary"):
+                    with summary_path.open("a", encoding="utf-8") as f:
+                        f.write(entry["summary"] + "\n\n")
+                results.append(entry)
 
-            logger.info(f"Running cataloging for DB: {db_url}")
+        return {"results": results, "db_timings": db_timings}
 
-            for table_name in data_sources:
-                logger.info(f"Cataloging for table: {table_name}")
+    def _catalog_database(self, db_url: str, inputs: Dict[str, Any], data_sources: List[str]) -> List[Dict[str, Any]]:
+        """Cataloging crews for every table of one database (runs on a fan-out worker)"""
+        logger.info(f"Running cataloging for DB: {db_url}")
+        results = []
 
-                db_inputs = {
-                    **inputs,
-                    "config": {**inputs.get("config", {}), "database_url": db_url},
-                    "connection_string": db_url,
-                    "table_name": table_name,
-                    "allowed_tables": [table_name],
-                    "include_sample_data": False,
-                    "max_sample_size": 1000
-                }
+        for table_name in data_sources:
+            logger.info(f"Cataloging for table: {table_name}")
 
-                try:
-                    # Create agents
-                    lineage_agent = self._create_agent_from_config("data_lineage_agent")
-                    metadata_agent = self._create_agent_from_config("metadata_validation_agent")
-                    integration_agent = self._create_agent_from_config("data_integration_agent")
-
-                    # Create tasks
-                    lineage_task = self._create_task_from_config("data_lineage_task", lineage_agent, db_inputs)
-                    metadata_task = self._create_task_from_config("metadata_validation_task", metadata_agent, db_inputs)
-                    integration_task = self._create_task_from_config("data_integration_task", integration_agent, db_inputs)
-
-                    # Run crew
-                    crew = Crew(
-                        agents=[lineage_agent, metadata_agent, integration_agent],
-                        tasks=[lineage_task, metadata_task, integration_task],
-                        process=Process.sequential,
-                        verbose=True
-                    )
+            db_inputs = {
+                **inputs,
+                "config": {**inputs.get("config", {}), "database_url": db_url},
+                "connection_string": db_url,
+                "table_name": table_name,
+                "allowed_tables": [table_name],
+                "include_sample_data": False,
+                "max_sample_size": 1000
+            }
 
-                    result = crew.kickoff()
+            try:
+                result = self._run_crew([
+                    ("data_lineage_agent", "data_lineage_task", db_inputs),
+                    ("metadata_validation_agent", "metadata_validation_task", db_inputs),
+                    ("data_integration_agent", "data_integration_task", db_inputs)
+                ])
+
+                if isinstance(result, dict):
+                    lineage_result = result.get("lineage", "")
+                    validation_result = result.get("validation", "")
+                    integration_result = result.get("integration", "")
+                elif hasattr(result, "raw_output") and isinstance(result.raw_output, list):
+                    lineage_result = result.raw_output[0] if len(result.raw_output) > 0 else ""
+                    validation_result = result.raw_output[1] if len(result.raw_output) > 1 else ""
+                    integration_result = result.raw_output[2] if len(result.raw_output) > 2 else ""
+                else:
+                    lineage_result = validation_result = integration_result = ""
 
-                    if isinstance(result, dict):
-                        lineage_result = result.get("lineage", "")
-                        validation_result = result.get("validation", "")
-                        integration_result = result.get("integration", "")
-                    elif hasattr(result, "raw_output") and isinstance(result.raw_output, list):
-                        lineage_result = result.raw_output[0] if len(result.raw_output) > 0 else ""
-                        validation_result = result.raw_output[1] if len(result.raw_output) > 1 else ""
-                        integration_result = result.raw_output[2] if len(result.raw_output) > 2 else ""
-                    else:
-                        lineage_result = validation_result = integration_result = ""
+                # Format Markdown output
+                try:
+                    summary_md = wrap_cataloging_output(
+                        table_name=table_name,
+                        db_url=db_url,
+                        lineage=lineage_result,
+                        validation=validation_result,
+                        integration=integration_result
+                    )
 
-                    # Format Markdown output
-                    try:
-                        summary_md = wrap_cataloging_output(
-                            table_name=table_name,
-                            lineage=lineage_result,
-                            validation=validation_result,
-                            integration=integration_result
-                        )
+                except Exception as e:
+                    logger.warning(f"⚠️ Failed to write markdown for table {table_name}: {e}")
+                    summary_md = ""
+
+                results.append({
+                    "db": db_url,
+                    "table": table_name,
+                    "lineage": lineage_result,
+                    "validation": validation_result,
+                    "integration": integration_result,
+                    "summary": summary_md
+                })
 
-                        with summary_path.open("a", encoding="utf-8") as f:
-                            f.write(summary_md + "\n\n")
+            except Exception as e:
+                logger.error(f"❌ Error in cataloging for {db_url}, table {table_name}: {e}")
+                results.append({
+                    "db": db_url,
+                    "table": table_name,
+                    "lineage": "",
+                    "validation": "",
+                    "integration": "",
+                    "summary": "",
+                    "error": str(e)
+                })
 
-                    except Exception as e:
-                        logger.warning(f"⚠️ Failed to write markdown for table {table_name}: {e}")
-                        summary_md = ""
-
-                    results.append({
-                        "db": db_url,
-                        "table": table_name,
-                        "lineage": lineage_result,
-                        "validation": validation_result,
-                        "integration": integration_result,
-                        "summary": summary_md
-                    })
+        return results
 
-                except Exception as e:
-                    logger.error(f"❌ Error in cataloging for {db_url}, table {table_name}: {e}")
-                    results.append({
-                        "db": db_url,
-                        "table": table_name,
-                        "lineage": "",
-                        "validation": "",
-                        "integration": "",
-                        "summary": "",
-                        "error": str(e)
-                    })
-
-        return {"results": results}
-    
     def run_data_processing(self, inputs: Dict[str, Any] = None) -> Any:
         logger.info("Initializing Data Processing...")
         if inputs is None:
@@ -522,42 +653,29 @@ class DataManagementCrew:
         data_product = inputs.get("data_product", {})
         data_sources = data_product.get("data_sources", [])
         
-        results = []
-        for db_url in self.config.database_urls:
-            logger.info(f"Running processing for DB: {db_url}")
-            
-            db_inputs = {
-                **inputs,
-                "config": {**inputs.get("config", {}), "database_url": db_url},
-                "data_sources": data_sources  # ✅ Inject filter
-            }
-        
-            try:
-                # Create agents
-                quality_agent = self._create_agent_from_config("data_quality_agent")
-                observability_agent = self._create_agent_from_config("data_observability_agent")
-                performance_agent = self._create_agent_from_config("performance_tuning_agent")
-                
-                # Create tasks
-                quality_task = self._create_task_from_config("data_quality_task", quality_agent, db_inputs)
-                observability_task = self._create_task_from_config("data_observability_task", observability_agent, db_inputs)
-                performance_task = self._create_task_from_config("performance_tuning_task", performance_agent, db_inputs)
-                
-                # Create and run crew
-                crew = Crew(
-                    agents=[quality_agent, observability_agent, performance_agent],
-                    tasks=[quality_task, observability_task, performance_task],
-                    process=Process.sequential,
-                    verbose=True
-                )
-                
-                db_result = crew.kickoff()
-                results.append({"db": db_url, "result": db_result})
-            except Exception as e:
-                logger.error(f"Error in data processing for {db_url}: {e}")
-                results.append({"db": db_url, "error": str(e)})
-        return results
-    
+        # Databases run concurrently; entries keep database order and carry per-DB timing
+        return fan_out_databases(
+            self.config.database_urls,
+            lambda db_url: self._process_database(db_url, inputs, data_sources),
+            self.config.max_concurrent_tasks, label="processing"
+        )
+
+    def _process_database(self, db_url: str, inputs: Dict[str, Any], data_sources: List[str]) -> Any:
+        """Quality, observability and performance crew for one database (runs on a fan-out worker)"""
+        logger.info(f"Running processing for DB: {db_url}")
+
+        db_inputs = {
+            **inputs,
+            "config": {**inputs.get("config", {}), "database_url": db_url},
+            "data_sources": data_sources  # ✅ Inject filter
+        }
+
+        return self._run_crew([
+            ("data_quality_agent", "data_quality_task", db_inputs),
+            ("data_observability_agent", "data_observability_task", db_inputs),
+            ("performance_tuning_agent", "performance_tuning_task", db_inputs)
+        ])
+
     def run_insights_generation(self, inputs: Dict[str, Any] = None) -> Any:
         logger.info("Initializing Insight Generation...")
         if inputs is None:
@@ -566,53 +684,31 @@ class DataManagementCrew:
         data_product = inputs.get("data_product", {})
         data_sources = data_product.get("data_sources", [])
             
-        results = []
-        for db_url in self.config.database_urls:
-            logger.info(f"Running processing for DB: {db_url}")
-            
-            db_inputs = {
-                **inputs,
-                "config": {**inputs.get("config", {}), "database_url": db_url},
-                "data_sources": data_sources  # ✅ Inject filter
-            }
-        
-            try:
-                # Create agents
-                text2sql_agent = self._create_agent_from_config("text2sql_agent")
-                caching_agent = self._create_agent_from_config("caching_agent")
-                reports_agent = self._create_agent_from_config("reports_generation_agent")
-                
-                # Create tasks
-                text2sql_task = self._create_task_from_config("text2sql_task", text2sql_agent, db_inputs)
-                caching_task = self._create_task_from_config("caching_task", caching_agent, db_inputs)
-                reports_task = self._create_task_from_config("reports_generation_task", reports_agent, db_inputs)
-                
-                # Create and run crew
-                crew = Crew(
-                    agents=[text2sql_agent, caching_agent, reports_agent],
-                    tasks=[text2sql_task, caching_task, reports_task],
-                    process=Process.sequential,
-                    verbose=True
-                )
-                
-                db_result = crew.kickoff()
-                results.append({"db": db_url, "result": db_result})
-            except Exception as e:
-                logger.error(f"Error in data processing for {db_url}: {e}")
-                results.append({"db": db_url, "error": str(e)})
-        return results
-        
-    def run(self, phase: str = "discovery", inputs: Dict[str, Any] = None) -> Any:
-        """
-        Main run method that can execute different phases
-        This is the method that main.py will call
-        """
-        logger.info(f"Starting Data Management Crew - Phase: {phase}")
+        # Databases run concurrently; entries keep database order and carry per-DB timing
+        return fan_out_databases(
+            self.config.database_urls,
+            lambda db_url: self._generate_database_insights(db_url, inputs, data_sources),
+            self.config.max_concurrent_tasks, label="insights"
+        )
+
+    def _generate_database_insights(self, db_url: str, inputs: Dict[str, Any], data_sources: List[str]) -> Any:
+        """Text2SQL, caching and reporting crew for one database (runs on a fan-out worker)"""
+        logger.info(f"Running insights for DB: {db_url}")
+
+        db_inputs = {
+            **inputs,
+            "config": {**inputs.get("config", {}), "database_url": db_url},
+            "data_sources": data_sources  # ✅ Inject filter
+        }
 
-        if inputs is None:
-            inputs = {}
+        return self._run_crew([
+            ("text2sql_agent", "text2sql_task", db_inputs),
+            ("caching_agent", "caching_task", db_inputs),
+            ("reports_generation_agent", "reports_generation_task", db_inputs)
+        ])
 
-        # CLEANUP: Remove old summary markdowns before fresh run
+    def reset_summaries(self) -> None:
+        """Remove old summary markdowns before a fresh pipeline run (once, not per phase)"""
         summary_files = [
             "discovery_summary.md",
             "cataloging_summary.md",
@@ -626,6 +722,17 @@ class DataManagementCrew:
                 logger.debug(f"🧹 Removing old summary file: {path}")
                 path.unlink()
 
+    def run(self, phase: str = "discovery", inputs: Dict[str, Any] = None) -> Any:
+        """
+        Main run method that can execute different phases: refreshes planner statistics,
+        runs the phase and records it in the catalog run history. Summaries of earlier
+        phases are kept; call reset_summaries() before the first phase of a run.
+        """
+        logger.info(f"Starting Data Management Crew - Phase: {phase}")
+
+        if inputs is None:
+            inputs = {}
+
         # 🚀 Run selected phase
         phase_methods = {
             "discovery": self.run_data_discovery,
@@ -635,7 +742,18 @@ class DataManagementCrew:
         }
 
         method = phase_methods.get(phase.lower(), self.run_data_discovery)
-        result = method(inputs)
+        started_at = datetime.now()
+        db_urls = self.config.database_urls if self.config else []
+
+        # Give the planner current statistics for any database whose data changed
+        fan_out_databases(db_urls, ensure_fresh_statistics, self.config.max_concurrent_tasks if self.config else None,
+                          label="statistics")
+        try:
+            result = method(inputs)
+        except Exception as e:
+            self._record_run(phase, "failed", started_at, db_urls, {"error": str(e)})
+            raise
+        self._record_run(phase, "completed", started_at, db_urls)
 
         # 🧩 Generate combined summary only if any phase summary exists
         combined_summary = ""
@@ -662,11 +780,11 @@ class DataManagementCrew:
                     logger.error(f"Failed to auto-extract schema_info: {e}")
                     return {"error": f"Failed to extract schema_info: {e}", "query": query}
 
-            text2sql_agent = self._create_agent_from_config("text2sql_agent")
-            available_tables = "\n".join(f"- {table}" for table in schema_info.keys())
+            with self._agent("text2sql_agent") as text2sql_agent:
+                available_tables = "\n".join(f"- {table}" for table in schema_info.keys())
 
-            query_task = Task(
-                description=f"""
+                query_task = Task(
+                    description=f"""
     You are a SQL expert agent. Your task is to convert the user's natural language question into a valid SQL query.
 
     ## Question:
@@ -688,21 +806,21 @@ class DataManagementCrew:
     - Do not profile or validate other tables
 
     You MUST use the Text to SQL Tool to generate the SQL query.
-                """,
-                agent=text2sql_agent,
-                expected_output="SQL query with explanation and results",
-                tools=[self.tools["text2sql"]]
-            )
+                    """,
+                    agent=text2sql_agent,
+                    expected_output="SQL query with explanation and results",
+                    tools=[self.tools["text2sql"]]
+                )
 
-            crew = Crew(
-                agents=[text2sql_agent],
-                tasks=[query_task],
-                process=Process.sequential,
-                verbose=False
-            )
+                crew = Crew(
+                    agents=[text2sql_agent],
+                    tasks=[query_task],
+                    process=Process.sequential,
+                    verbose=False
+                )
 
-            logger.info("Running Text2SQL crew...")
-            agent_output = crew.kickoff()
+                logger.info("Running Text2SQL crew...")
+                agent_output = crew.kickoff()
 
             if not hasattr(agent_output, 'result') or not agent_output.result:
                 logger.info("🔧 Agent didn't generate proper output, calling tool directly...")
@@ -817,6 +935,11 @@ class DataManagementCrew:
     
     
     def generate_report(self, report_config: Dict[str, Any]) -> Any:
+        """
+        Generate a template report. The default "direct" mode runs the Report Generation Tool
+        without an LLM in the loop; "agent" mode lets a reporting agent drive the tool.
+        Set "narrate" to queue an LLM narrative in the background (ReportResult.narration).
+        """
         try:
             report_type = report_config.get("type", "sales_report")
             parameters = report_config.get("parameters", {})
@@ -825,33 +948,89 @@ class DataManagementCrew:
 
             parameters["data_sources"] = data_sources
 
-            reports_agent = Agent(
-                role="Data Analyst & Report Generator",
-                goal="Generate accurate, data-driven reports from real database queries",
-                backstory="""You are an expert data analyst who specializes in creating 
-                comprehensive business reports. You have direct access to database tools 
-                and can execute SQL queries to extract meaningful insights.""",
+            start = time.perf_counter()
+            if report_config.get("mode", "direct") == "agent":
+                result = self._generate_report_with_agent(report_type, data_source, parameters, data_sources)
+                mode = "agent"
+            else:
+                # Template SQL is known up front: execute and render it directly
+                result = self.tools["report_generation"]._run(report_type, data_source, parameters)
+                mode = "direct"
+
+            report = self._parse_report_output(result)
+            if report is None:
+                return result
+            if "error" in report:
+                return {
+                    "error": report["error"],
+                    "report_config": report_config,
+                    "timestamp": datetime.now().isoformat()
+                }
+
+            narration = None
+            if report_config.get("narrate"):
+                narrative_path = Path(self.config.results_path if self.config else "results") / f"{report_type}_narrative.md"
+                narration = get_report_narrator().submit(report, output_path=str(narrative_path))
+
+            duration_ms = round((time.perf_counter() - start) * 1000, 3)
+            logger.info(f"📝 Report {report_type} generated in {duration_ms} ms ({mode} mode)")
+            return ReportResult(
+                raw=json.dumps(report, indent=2, default=str),
+                json_dict=report,
+                markdown=render_report_markdown(report),
+                mode=mode,
+                duration_ms=duration_ms,
+                narration=narration
+            )
+
+        except Exception as e:
+            logger.error(f"Error generating report: {e}")
+            return {
+                "error": str(e), 
+                "report_config": report_config,
+                "timestamp": datetime.now().isoformat()
+            }
+
+    def _generate_report_with_agent(self, report_type: str, data_source: str, parameters: Dict[str, Any],
+                                    data_sources: List[str]) -> Any:
+        """Let a reporting agent call the Report Generation Tool and summarize its output"""
+        agent_config = {
+            "name": "report_generator",
+            "role": "Data Analyst & Report Generator",
+            "goal": "Generate accurate, data-driven reports from real database queries",
+            "backstory": """You are an expert data analyst who specializes in creating 
+            comprehensive business reports. You have direct access to database tools 
+            and can execute SQL queries to extract meaningful insights.""",
+            "tools": ["report_generation"]
+        }
+
+        def build_agent() -> Agent:
+            return Agent(
+                role=agent_config["role"],
+                goal=agent_config["goal"],
+                backstory=agent_config["backstory"],
                 tools=[self.tools["report_generation"]],
                 verbose=True,
                 allow_delegation=False
             )
 
+        with self.registry.lease(agent_config, build_agent) as reports_agent:
             report_task = Task(
                 description=f"""
-                Generate a comprehensive {report_type} report using real database data.
-
-                **Requirements:**
-                - Report Type: {report_type}
-                - Data Source: {data_source}
-                - Parameters: {json.dumps(parameters, indent=2)}
-
-                **Instructions:**
-                1. Execute the Report Generation Tool with the provided parameters
-                2. Only use tables listed in the following allowed list:
-                {json.dumps(data_sources, indent=2)}
-                3. Do not access or profile tables outside this list
-                4. Return a structured JSON report with results, summaries, and insights
-                """,
+            Generate a comprehensive {report_type} report using real database data.
+
+            **Requirements:**
+            - Report Type: {report_type}
+            - Data Source: {data_source}
+            - Parameters: {json.dumps(parameters, indent=2)}
+
+            **Instructions:**
+            1. Execute the Report Generation Tool with the provided parameters
+            2. Only use tables listed in the following allowed list:
+            {json.dumps(data_sources, indent=2)}
+            3. Do not access or profile tables outside this list
+            4. Return a structured JSON report with results, summaries, and insights
+            """,
                 agent=reports_agent,
                 expected_output="Complete JSON report with real database data and insights",
                 tools=[self.tools["report_generation"]]
@@ -863,37 +1042,25 @@ class DataManagementCrew:
                 process=Process.sequential,
                 verbose=True
             )
-
             return crew.kickoff()
-            
-            # Parse and return the result
-            if hasattr(result, 'raw') and result.raw:
+
+    def _parse_report_output(self, result: Any) -> Optional[Dict[str, Any]]:
+        """Report dict from tool JSON or agent output; None when no JSON can be extracted"""
+        if isinstance(result, dict):
+            return result
+        if getattr(result, "json_dict", None):
+            return result.json_dict
+        raw_content = result if isinstance(result, str) else getattr(result, "raw", None)
+        if not isinstance(raw_content, str):
+            return None
+        try:
+            return json.loads(raw_content)
+        except json.JSONDecodeError:
+            # Agents may wrap the JSON in prose
+            json_match = re.search(r'\{.*\}', raw_content, re.DOTALL)
+            if json_match:
                 try:
-                    # Try to extract JSON from the result
-                    raw_content = result.raw
-                    if isinstance(raw_content, str):
-                        # Look for JSON in the response
-                        import re
-                        json_match = re.search(r'\{.*\}', raw_content, re.DOTALL)
-                        if json_match:
-                            json_content = json_match.group()
-                            parsed_result = json.loads(json_content)
-                            return type('ReportResult', (), {
-                                'raw': json.dumps(parsed_result, indent=2),
-                                'json_dict': parsed_result
-                            })()
-                    
-                    return result
-                except (json.JSONDecodeError, AttributeError) as e:
+                    return json.loads(json_match.group())
+                except json.JSONDecodeError as e:
                     logger.warning(f"Could not parse JSON from result: {e}")
-                    return result
-            
-            return result
-            
-        except Exception as e:
-            logger.error(f"Error generating report: {e}")
-            return {
-                "error": str(e), 
-                "report_config": report_config,
-                "timestamp": datetime.now().isoformat()
-            }
+            return None
@@ -19,9 +19,31 @@ fake = Faker()
 logger = logging.getLogger(__name__)
 
 class EnhancedECommerceDataSetup:
-    def __init__(self):
-        self.db_path = "ecommerce_db.db"
+    def __init__(self, db_path: str = "ecommerce_db.db", scale_factor: float = 1.0):
+        self.db_path = db_path
         self.logger = logger
+        self.scale_factor = scale_factor
+
+        # Row volumes for entity and fact tables (scale_factor=1.0 reproduces the reference dataset).
+        # Small dimension tables (departments, warehouses, vendors, employees, campaigns) stay fixed.
+        self.num_customers = self._scaled(15000)
+        self.num_products = self._scaled(2000)
+        self.num_orders = self._scaled(25000)
+        self.num_interactions = self._scaled(75000)
+        self.num_support_tickets = self._scaled(12000)
+        self.num_returns = self._scaled(3000)
+        self.num_shipments = self._scaled(22500)
+        self.num_financial_transactions = self._scaled(40000)
+        self.num_reviews = self._scaled(30000)
+        self.num_abandoned_carts = self._scaled(7500)
+        self.num_email_sends = self._scaled(90000)
+        self.num_referrals = self._scaled(2250)
+        # Sales, returns, reviews and carts only reference the first half of the catalogue
+        self.num_sold_products = max(1, self.num_products // 2)
+
+    def _scaled(self, base_count: int) -> int:
+        """Scale a reference row count by the configured scale factor"""
+        return max(1, int(round(base_count * self.scale_factor)))
 
     def create_sample_databases(self):
         print("Creating comprehensive eCommerce database...")
@@ -593,7 +615,7 @@ class EnhancedECommerceDataSetup:
         channels = ['Organic', 'Social Media', 'Email', 'Paid Search', 'Referral', 'Direct']
         lifecycle_stages = ['New', 'Active', 'Dormant', 'Churned', 'Reactivated']
         
-        for i in range(15000):
+        for i in range(self.num_customers):
             email = f"customer_{i}_{fake.email()}"
             customer = (
                 fake.first_name(),
@@ -637,7 +659,7 @@ class EnhancedECommerceDataSetup:
         sizes = ['XS', 'S', 'M', 'L', 'XL', 'XXL', 'One Size']
         
         products = []
-        for i in range(2000):
+        for i in range(self.num_products):
             category = random.choice(categories)
             price = round(random.uniform(10, 2000), 2)
             cost = round(price * random.uniform(0.4, 0.7), 2)
@@ -675,7 +697,7 @@ class EnhancedECommerceDataSetup:
 
     def _populate_inventory(self, cursor):
         inventory = []
-        for product_id in range(1, 2001):
+        for product_id in range(1, self.num_products + 1):
             for warehouse_id in range(1, 6):
                 on_hand = random.randint(0, 500)
                 reserved = random.randint(0, min(on_hand, 50))
@@ -776,7 +798,7 @@ class EnhancedECommerceDataSetup:
         sources = ['Direct', 'Google', 'Facebook', 'Instagram', 'Email', 'Referral']
         
         orders = []
-        for i in range(1, 25001):  # 25000 orders (1.67 orders per customer on average)
+        for i in range(1, self.num_orders + 1):  # 25000 orders at scale 1.0 (1.67 orders per customer on average)
             order_date = fake.date_between(start_date='-2y', end_date='today')
             total_amount = round(random.uniform(25.0, 2500.0), 2)
             discount_amount = round(total_amount * random.uniform(0, 0.3), 2)
@@ -786,7 +808,7 @@ class EnhancedECommerceDataSetup:
             
             order = (
                 i,  # order_id
-                random.randint(1, 15000),  # customer_id (updated to match 15000 customers)
+                random.randint(1, self.num_customers),  # customer_id (updated to match 15000 customers)
                 order_date,
                 random.choice(statuses),
                 total_amount,
@@ -827,7 +849,7 @@ class EnhancedECommerceDataSetup:
         sales = []
         channels = ['Website', 'Mobile App', 'Phone', 'Store', 'Marketplace']
         
-        for order_id in range(1, 25001):  # Updated to match 25000 orders
+        for order_id in range(1, self.num_orders + 1):  # Updated to match 25000 orders
             # Each order has 1-5 sales items
             num_items = random.randint(1, 5)
             for _ in range(num_items):
@@ -840,7 +862,7 @@ class EnhancedECommerceDataSetup:
                 sale = (
                     len(sales) + 1,  # sale_id
                     order_id,
-                    random.randint(1, 1000),  # product_id
+                    random.randint(1, self.num_sold_products),  # product_id
                     quantity,
                     unit_price,
                     total_price,
@@ -869,10 +891,10 @@ class EnhancedECommerceDataSetup:
         devices = ['Desktop', 'Mobile', 'Tablet']
         
         interactions = []
-        for i in range(1, 75001):  # 75000 interactions (5 per customer on average)
+        for i in range(1, self.num_interactions + 1):  # 75000 interactions (5 per customer on average)
             interaction = (
                 i,
-                random.randint(1, 15000),  # customer_id (updated to match 15000 customers)
+                random.randint(1, self.num_customers),  # customer_id (updated to match 15000 customers)
                 random.choice(interaction_types),
                 random.choice(channels),
                 fake.date_time_between(start_date='-1y', end_date='now'),
@@ -900,13 +922,13 @@ class EnhancedECommerceDataSetup:
         statuses = ['Open', 'In Progress', 'Resolved', 'Closed', 'Escalated']
         
         tickets = []
-        for i in range(1, 12001):  # 12000 tickets (0.8 tickets per customer)
+        for i in range(1, self.num_support_tickets + 1):  # 12000 tickets (0.8 tickets per customer)
             created_date = fake.date_time_between(start_date='-1y', end_date='now')
             resolved_date = created_date + timedelta(hours=random.randint(1, 168)) if random.random() < 0.8 else None
             
             ticket = (
                 i,
-                random.randint(1, 15000),  # customer_id (updated to match 15000 customers)
+                random.randint(1, self.num_customers),  # customer_id (updated to match 15000 customers)
                 random.randint(1, 50),    # agent_id
                 random.choice(ticket_types),
                 random.choice(priorities),
@@ -936,7 +958,7 @@ class EnhancedECommerceDataSetup:
         tiers = ['Bronze', 'Silver', 'Gold', 'Platinum', 'Diamond']
         
         loyalty_records = []
-        for i in range(1, 15001):  # 15000 loyalty records (1:1 mapping with customers)
+        for i in range(1, self.num_customers + 1):  # 15000 loyalty records (1:1 mapping with customers)
             tier = random.choice(tiers)
             points_earned = random.randint(100, 50000)
             points_redeemed = random.randint(0, points_earned // 2)
@@ -970,15 +992,15 @@ class EnhancedECommerceDataSetup:
         statuses = ['Pending', 'Approved', 'Rejected', 'Processed', 'Completed']
         
         returns = []
-        for i in range(1, 3001):  # 3000 returns (12% return rate)
-            order_id = random.randint(1, 25000)  # Updated to match 25000 orders
+        for i in range(1, self.num_returns + 1):  # 3000 returns (12% return rate)
+            order_id = random.randint(1, self.num_orders)  # Updated to match 25000 orders
             refund_amount = round(random.uniform(10.0, 500.0), 2)
             
             return_record = (
                 i,
                 order_id,
-                random.randint(1, 1000),  # product_id
-                random.randint(1, 15000),  # customer_id (updated to match 15000 customers)
+                random.randint(1, self.num_sold_products),  # product_id
+                random.randint(1, self.num_customers),  # customer_id (updated to match 15000 customers)
                 fake.date_between(start_date='-1y', end_date='today'),
                 random.choice(reasons),
                 random.choice(conditions),
@@ -1005,7 +1027,7 @@ class EnhancedECommerceDataSetup:
         statuses = ['Pending', 'Completed', 'Failed', 'Refunded', 'Cancelled']
         
         payments = []
-        for i in range(1, 25001):  # 25000 payments (one payment per order)
+        for i in range(1, self.num_orders + 1):  # 25000 payments (one payment per order)
             payment = (
                 i,
                 i,  # order_id (updated to match 25000 orders)
@@ -1033,7 +1055,7 @@ class EnhancedECommerceDataSetup:
         statuses = ['Pending', 'Picked Up', 'In Transit', 'Out for Delivery', 'Delivered', 'Exception']
         
         shipments = []
-        for i in range(1, 22501):  # 22500 shipments (90% of orders)
+        for i in range(1, self.num_shipments + 1):  # 22500 shipments (90% of orders)
             ship_date = fake.date_between(start_date='-2y', end_date='today')
             estimated_delivery = ship_date + timedelta(days=random.randint(1, 7))
             delivery_date = estimated_delivery + timedelta(days=random.randint(-1, 3)) if random.random() < 0.9 else None
@@ -1067,7 +1089,7 @@ class EnhancedECommerceDataSetup:
         statuses = ['Pending', 'Completed', 'Failed', 'Cancelled']
         
         transactions = []
-        for i in range(1, 40001):  # 40000 transactions (increased for more financial data)
+        for i in range(1, self.num_financial_transactions + 1):  # 40000 transactions (increased for more financial data)
             transaction = (
                 i,
                 random.choice(transaction_types),
@@ -1093,11 +1115,11 @@ class EnhancedECommerceDataSetup:
     def _populate_product_reviews(self, cursor):
         """Generate product review data"""
         reviews = []
-        for i in range(1, 30001):  # 30000 reviews (2 per customer on average)
+        for i in range(1, self.num_reviews + 1):  # 30000 reviews (2 per customer on average)
             review = (
                 i,
-                random.randint(1, 1000),  # product_id
-                random.randint(1, 15000),  # customer_id (updated to match 15000 customers)
+                random.randint(1, self.num_sold_products),  # product_id
+                random.randint(1, self.num_customers),  # customer_id (updated to match 15000 customers)
                 random.randint(1, 5),     # rating
                 fake.text(max_nb_chars=500),  # review_text
                 fake.date_between(start_date='-2y', end_date='today'),
@@ -1116,12 +1138,12 @@ class EnhancedECommerceDataSetup:
     def _populate_abandoned_carts(self, cursor):
         """Generate abandoned cart data"""
         carts = []
-        for i in range(1, 7501):  # 7500 abandoned carts (0.5 per customer)
+        for i in range(1, self.num_abandoned_carts + 1):  # 7500 abandoned carts (0.5 per customer)
             cart = (
                 i,
-                random.randint(1, 15000),  # customer_id (updated to match 15000 customers)
+                random.randint(1, self.num_customers),  # customer_id (updated to match 15000 customers)
                 fake.uuid4(),  # session_id
-                random.randint(1, 1000),  # product_id
+                random.randint(1, self.num_sold_products),  # product_id
                 random.randint(1, 5),     # quantity
                 round(random.uniform(10.0, 500.0), 2),  # unit_price
                 fake.date_time_between(start_date='-6m', end_date='now'),
@@ -1143,11 +1165,11 @@ class EnhancedECommerceDataSetup:
         email_types = ['Welcome', 'Promotional', 'Abandoned Cart', 'Order Confirmation', 'Newsletter', 'Reactivation']
         
         campaigns = []
-        for i in range(1, 90001):  # 90000 email campaigns (6 per customer on average)
+        for i in range(1, self.num_email_sends + 1):  # 90000 email campaigns (6 per customer on average)
             campaign = (
                 i,
                 random.randint(1, 50),    # campaign_id
-                random.randint(1, 15000),  # customer_id (updated to match 15000 customers)
+                random.randint(1, self.num_customers),  # customer_id (updated to match 15000 customers)
                 random.choice(email_types),
                 fake.date_time_between(start_date='-1y', end_date='now'),
                 1 if random.random() < 0.25 else 0,  # opened
@@ -1170,11 +1192,11 @@ class EnhancedECommerceDataSetup:
         statuses = ['Pending', 'Completed', 'Expired', 'Cancelled']
         
         referrals = []
-        for i in range(1, 2251):  # 2250 referrals (15% of customers referring)
+        for i in range(1, self.num_referrals + 1):  # 2250 referrals (15% of customers referring)
             referral = (
                 i,
-                random.randint(1, 15000),  # referrer_id (updated to match 15000 customers)
-                random.randint(1, 15000),  # referee_id (updated to match 15000 customers)
+                random.randint(1, self.num_customers),  # referrer_id (updated to match 15000 customers)
+                random.randint(1, self.num_customers),  # referee_id (updated to match 15000 customers)
                 fake.date_between(start_date='-1y', end_date='today'),
                 fake.bothify(text='REF-########'),  # referral_code
                 random.choice(statuses),
@@ -75,6 +75,16 @@ class ExecutionResult:
         """Convert to dictionary"""
         return asdict(self)
 
+@dataclass
+class ReportResult:
+    """A generated report as JSON text, parsed dict and rendered markdown"""
+    raw: str
+    json_dict: Dict[str, Any]
+    markdown: str
+    mode: str = "direct"
+    duration_ms: float = 0.0
+    narration: Optional[Any] = None  # Future[str] when LLM narration was requested
+
 class PlatformConfig:
     """Configuration for the platform"""
     
@@ -111,6 +121,9 @@ class PlatformConfig:
         self.query_timeout = int(os.getenv("QUERY_TIMEOUT", "300"))
         self.cache_ttl = int(os.getenv("CACHE_TTL", "3600"))
         self.batch_size = int(os.getenv("BATCH_SIZE", "1000"))
+        self.report_cache_max_entries = int(os.getenv("REPORT_CACHE_MAX_ENTRIES", "500"))
+        self.report_cache_max_mb = float(os.getenv("REPORT_CACHE_MAX_MB", "100"))
+        self.narration_model = os.getenv("NARRATION_MODEL", "gpt-4o")
         
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary"""
@@ -124,5 +137,8 @@ class PlatformConfig:
             "quality_thresholds": self.quality_thresholds,
             "query_timeout": self.query_timeout,
             "cache_ttl": self.cache_ttl,
-            "batch_size": self.batch_size
+            "batch_size": self.batch_size,
+            "report_cache_max_entries": self.report_cache_max_entries,
+            "report_cache_max_mb": self.report_cache_max_mb,
+            "narration_model": self.narration_model
         }
\ No newline at end of file
@@ -0,0 +1,8 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Catalog state (fingerprints, materialized views) goes to a throwaway directory
+os.environ.setdefault("DATA_CATALOG_PATH", tempfile.mkdtemp(prefix="data_catalog_"))
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
@@ -0,0 +1,60 @@
+import sqlite3
+
+import pytest
+
+from utils.change_detection import ChangeDetector
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = tmp_path / "shop.db"
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE customers (id INTEGER PRIMARY KEY, name TEXT)")
+    conn.execute("CREATE TABLE products (id INTEGER PRIMARY KEY, price REAL)")
+    conn.executemany("INSERT INTO customers (name) VALUES (?)", [("ada",), ("grace",)])
+    conn.executemany("INSERT INTO products (price) VALUES (?)", [(9.5,), (12.0,)])
+    conn.commit()
+    conn.close()
+    return str(path)
+
+
+@pytest.fixture
+def detector(tmp_path):
+    detector = ChangeDetector(state_path=str(tmp_path / "fingerprints.json"))
+    yield detector
+    detector.close()
+
+
+def _execute(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    conn.execute(sql)
+    conn.commit()
+    conn.close()
+
+
+def test_unchanged_tables_are_skipped(detector, db_path):
+    detector.mark_processed(db_path, "discovery", tables=["customers", "products"])
+
+    assert detector.changed_tables(db_path, ["customers", "products"], "discovery") == []
+
+
+def test_partial_mark_after_change_keeps_other_changed_tables(detector, db_path):
+    detector.mark_processed(db_path, "discovery", tables=["customers", "products"])
+    _execute(db_path, "UPDATE products SET price = price * 2")
+    _execute(db_path, "UPDATE customers SET name = upper(name)")
+
+    # Only customers was processed again; products changed and still needs processing
+    detector.mark_processed(db_path, "discovery", tables=["customers"])
+
+    assert detector.changed_tables(db_path, ["customers", "products"], "discovery") == ["products"]
+
+
+def test_tables_skipped_as_unchanged_stay_checkpointed(detector, db_path):
+    detector.mark_processed(db_path, "discovery", tables=["customers", "products"])
+    _execute(db_path, "UPDATE customers SET name = upper(name)")
+
+    assert detector.changed_tables(db_path, ["customers", "products"], "discovery") == ["customers"]
+    # Only the changed table is processed again; products was skipped as unchanged
+    detector.mark_processed(db_path, "discovery", tables=["customers"])
+
+    assert detector.changed_tables(db_path, ["customers", "products"], "discovery") == []
@@ -0,0 +1,24 @@
+import pytest
+
+from utils.chart_rendering import ChartRenderer, chart_spec, MATPLOTLIB_AVAILABLE
+
+
+def _pie(values):
+    return {"title": "Revenue share", "visualization": "pie_chart",
+            "content": [{"region": f"r{i}", "revenue": value} for i, value in enumerate(values)]}
+
+
+def test_pie_chart_without_positive_values_is_skipped():
+    assert chart_spec(_pie([0, 0, None])) is None
+    assert chart_spec(_pie([-5, 0])) is None
+
+
+def test_pie_chart_with_positive_value_is_drawn():
+    assert chart_spec(_pie([0, 3.5]))["y"] == ["revenue"]
+
+
+@pytest.mark.skipif(not MATPLOTLIB_AVAILABLE, reason="matplotlib is not installed")
+def test_zero_pie_section_renders_no_chart(tmp_path):
+    renderer = ChartRenderer(cache_dir=str(tmp_path))
+    assert renderer.submit(_pie([0, 0])).result() is None
+    assert renderer.render(_pie([0, 2])).endswith(".svg")
@@ -0,0 +1,135 @@
+import sqlite3
+
+import pytest
+
+from utils.materialized_aggregates import MaterializedAggregateStore
+
+MONTHLY_COST = (
+    "SELECT strftime('%Y-%m', ship_date) AS month, AVG(shipping_cost) AS avg_cost "
+    "FROM {table} GROUP BY strftime('%Y-%m', ship_date)"
+)
+
+
+def _create(db_path, table):
+    conn = sqlite3.connect(db_path)
+    conn.execute(f"CREATE TABLE {table} (id INTEGER PRIMARY KEY, ship_date TEXT, shipping_cost REAL)")
+    conn.executemany(
+        f"INSERT INTO {table} (ship_date, shipping_cost) VALUES (?, ?)",
+        [(f"2023-{month:02d}-{day:02d}", 10.0 + month + day) for month in range(1, 7) for day in (3, 17)]
+    )
+    conn.commit()
+    conn.close()
+
+
+def _execute(db_path, sql, params=()):
+    conn = sqlite3.connect(db_path)
+    conn.execute(sql, params)
+    conn.commit()
+    conn.close()
+
+
+def _source(db_path, sql):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [tuple(row) for row in conn.execute(sql)]
+    finally:
+        conn.close()
+
+
+def _served(store, db_path, sql):
+    return [tuple(row.values()) for row in store.serve(str(db_path), sql)]
+
+
+@pytest.fixture
+def store(tmp_path):
+    return MaterializedAggregateStore(store_path=str(tmp_path / "aggregates.db"))
+
+
+def test_update_of_historical_row_in_mutable_table_is_served(store, tmp_path):
+    db_path = tmp_path / "shipping.db"
+    _create(db_path, "shipping")
+    sql = MONTHLY_COST.format(table="shipping")
+    assert store.register(str(db_path), sql)["status"] == "active"
+
+    _execute(db_path, "UPDATE shipping SET shipping_cost = shipping_cost + 100000 WHERE id = 1")
+
+    assert _served(store, db_path, sql) == pytest.approx(_source(db_path, sql))
+    view = store.list_views(str(db_path))[0]
+    assert view["refresh_mode"] == "full"
+
+
+def test_update_in_closed_bucket_of_default_registration_is_served(store, tmp_path):
+    db_path = tmp_path / "returns.db"
+    _create(db_path, "returns")
+    sql = MONTHLY_COST.format(table="returns")
+    assert store.register(str(db_path), sql)["append_only"] is False
+
+    _execute(db_path, "INSERT INTO returns (ship_date, shipping_cost) VALUES ('2023-06-28', 99.0)")
+    _execute(db_path, "UPDATE returns SET shipping_cost = 0 WHERE ship_date = '2023-01-03'")
+
+    assert _served(store, db_path, sql) == pytest.approx(_source(db_path, sql))
+    assert store.list_views(str(db_path))[0]["refresh_mode"] == "full"
+
+
+def test_row_moved_between_old_buckets_is_served(store, tmp_path):
+    db_path = tmp_path / "shipping.db"
+    _create(db_path, "shipping")
+    sql = MONTHLY_COST.format(table="shipping")
+    store.register(str(db_path), sql)
+
+    _execute(db_path, "UPDATE shipping SET ship_date = '2023-02-10' WHERE id = 1")
+    _execute(db_path, "DELETE FROM shipping WHERE id = 2")
+    _execute(db_path, "INSERT INTO shipping (ship_date, shipping_cost) VALUES ('2023-01-20', 7.5)")
+
+    assert _served(store, db_path, sql) == pytest.approx(_source(db_path, sql))
+
+
+def test_append_only_table_refreshes_open_buckets_only(store, tmp_path):
+    db_path = tmp_path / "sales.db"
+    _create(db_path, "sales")
+    sql = MONTHLY_COST.format(table="sales")
+    assert store.register(str(db_path), sql, append_only=True)["append_only"]
+
+    _execute(db_path, "INSERT INTO sales (ship_date, shipping_cost) VALUES ('2023-06-28', 99.0)")
+
+    assert _served(store, db_path, sql) == pytest.approx(_source(db_path, sql))
+    assert store.list_views(str(db_path))[0]["refresh_mode"] == "bucketed"
+
+
+def _create_payments(db_path):
+    conn = sqlite3.connect(db_path)
+    conn.execute("CREATE TABLE payments (id INTEGER PRIMARY KEY, payment_status TEXT, amount REAL)")
+    conn.executemany("INSERT INTO payments (payment_status, amount) VALUES (?, ?)",
+                     [("Completed", 20.0)] * 5 + [("Pending", 10.0)] * 5)
+    conn.commit()
+    conn.close()
+
+
+PAYMENTS_BY_STATUS = "SELECT payment_status, COUNT(*) AS n, SUM(amount) AS total FROM payments GROUP BY payment_status"
+
+
+def test_tables_are_not_append_only_unless_opted_in(store, tmp_path):
+    db_path = tmp_path / "payments.db"
+    _create_payments(db_path)
+    assert store.register(str(db_path), PAYMENTS_BY_STATUS)["append_only"] is False
+
+    _execute(db_path, "UPDATE payments SET payment_status = 'Completed' WHERE id = 6")
+    _execute(db_path, "INSERT INTO payments (payment_status, amount) VALUES ('Pending', 5.0)")
+
+    assert _served(store, db_path, PAYMENTS_BY_STATUS) == _source(db_path, PAYMENTS_BY_STATUS)
+    assert store.list_views(str(db_path))[0]["refresh_mode"] == "full"
+
+
+def test_views_from_older_stores_lose_implicit_append_only(tmp_path):
+    db_path = tmp_path / "payments.db"
+    _create_payments(db_path)
+    store_path = str(tmp_path / "aggregates.db")
+    MaterializedAggregateStore(store_path=store_path).register(str(db_path), PAYMENTS_BY_STATUS, append_only=True)
+    conn = sqlite3.connect(store_path)
+    conn.execute("PRAGMA user_version = 0")
+    conn.commit()
+    conn.close()
+
+    reopened = MaterializedAggregateStore(store_path=store_path)
+
+    assert reopened.list_views(str(db_path))[0]["append_only"] == 0
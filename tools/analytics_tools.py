@@ -1,12 +1,24 @@
 from crewai.tools import BaseTool
-from typing import Dict, List, Any, Type
+from typing import Dict, List, Any, Optional, Type
 from pydantic import BaseModel, Field
 import json
 import logging
 import re
 import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from openai import OpenAI
+from utils.data_catalog import get_data_catalog
+from utils.materialized_aggregates import MaterializedAggregateStore, get_aggregate_store
+from utils.report_cache import get_report_cache, resolve_report_parameters
+from utils.report_generator import render_report_markdown
+from utils.report_pagination import DEFAULT_PAGE_SIZE, continuation_token, paginate_rows
+from utils.change_detection import get_change_detector
+from utils.template_registry import CompiledTemplate, TemplateRegistry, get_template_registry
+from utils.suite_runner import execute_suite_queries
+from utils.sql_analysis import extract_table_dependencies
+from models.data_models import PlatformConfig
 from datetime import datetime, timedelta
 
 logger = logging.getLogger(__name__)
@@ -114,6 +126,13 @@ class CrewText2SQLTool(BaseTool):
 
         return "\n\n".join(lines)
 
+    def _log_executed_query(self, db_path: str, sql: str, duration_ms: float, row_count: int) -> None:
+        """Record the statement in the catalog query log (feeds the index advisor workload)"""
+        try:
+            get_data_catalog().record_query(db_path, sql, source="text2sql", duration_ms=duration_ms, row_count=row_count)
+        except Exception as e:
+            logger.debug(f"Could not log executed query: {e}")
+
     def execute_sql_across_dbs(self, sql: str, db_files: list) -> list:
         """Execute SQL across multiple databases"""
         if not db_files:
@@ -152,6 +171,7 @@ class CrewText2SQLTool(BaseTool):
                 cursor.execute(f"ATTACH DATABASE '{db_path}' AS {alias}")
 
             logger.info(f"🔍 Executing SQL:\n{sql}")
+            start = time.perf_counter()
             cursor.execute(sql)
     
             # Check if this query returns results
@@ -159,6 +179,7 @@ class CrewText2SQLTool(BaseTool):
                 return [{"message": "Query executed successfully, but no results returned."}]
     
             rows = cursor.fetchall()
+            self._log_executed_query(str(main_db_path), sql, (time.perf_counter() - start) * 1000, len(rows))
             headers = [desc[0] for desc in cursor.description]
             return [dict(zip(headers, row)) for row in rows]
     
@@ -340,12 +361,18 @@ class ReportGenerationTool(BaseTool):
     
     report_templates: Dict[str, List[Dict[str, Any]]] = {}
     data_product_reports: Dict[str, List[str]] = {}
+    template_registry: Optional[Any] = None
 
     # Add __init__ to inject fields correctly
     def __init__(self, report_templates=None, data_product_reports=None, **kwargs):
         super().__init__(**kwargs)
-        self.report_templates = report_templates or {}
-        self.data_product_reports = data_product_reports or {}
+        # Injected templates get their own registry; otherwise share the process-wide one
+        if report_templates or data_product_reports:
+            self.template_registry = TemplateRegistry(report_templates, data_product_reports)
+        else:
+            self.template_registry = get_template_registry()
+        self.report_templates = self.template_registry.templates
+        self.data_product_reports = self.template_registry.suites
     
     def _load_report_templates(self) -> Dict[str, Any]:
         """Load report templates from JSON file"""
@@ -370,9 +397,10 @@ class ReportGenerationTool(BaseTool):
             logger.error(f"Database connection failed: {e}")
             raise
             
-    def _execute_query(self, conn, query: str, limit: int = 100) -> List[Dict[str, Any]]:
+    def _execute_query(self, conn, query: str, limit: int = 100,
+                       params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
         try:
-            cursor = conn.execute(query)
+            cursor = conn.execute(query, params or {})
             columns = [desc[0] for desc in cursor.description]
             rows = cursor.fetchmany(limit)
             return [dict(zip(columns, row)) for row in rows]
@@ -380,6 +408,49 @@ class ReportGenerationTool(BaseTool):
             logger.warning(f"Failed to execute query: {e}")
             return []
             
+    def _execute_section_queries(self, db_path: str, jobs: List[tuple], parallel: bool = True,
+                                 use_materialized: bool = True, limit: int = DEFAULT_PAGE_SIZE + 1,
+                                 params: Optional[Dict[str, Any]] = None) -> Dict[int, Dict[str, Any]]:
+        """
+        Run a template's queries and return {query index: {"results", "duration_ms", "source"}}
+        with at most `limit` rows each (callers ask for one row beyond the page to detect more).
+        `params` supplies the values of named bind parameters such as :window_start.
+
+        In parallel mode the queries go to a thread pool and each borrows its own read-only
+        connection (sqlite3 releases the GIL while stepping), so report latency approaches the
+        slowest query instead of the sum. Connections come from the template registry's pool,
+        whose statement caches keep template queries prepared between reports. Queries with a
+        fresh materialized aggregate are answered from the aggregate store instead.
+        """
+        if not jobs:
+            return {}
+
+        store = get_aggregate_store() if use_materialized else None
+        connections = self.template_registry.pool
+
+        def run(job):
+            idx, query = job
+            with connections.connection(db_path) as conn:
+                return idx, self._timed_query(conn, query, db_path, store, limit, params)
+
+        if not parallel or len(jobs) == 1:
+            return dict(map(run, jobs))
+
+        max_workers = min(len(jobs), PlatformConfig().max_concurrent_tasks)
+        with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="report-section") as pool:
+            return dict(pool.map(run, jobs))
+
+    def _timed_query(self, conn: sqlite3.Connection, query: str, db_path: Optional[str] = None,
+                     store: Optional[MaterializedAggregateStore] = None, limit: int = 100,
+                     params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        start = time.perf_counter()
+        results = store.serve(db_path, query, limit) if store is not None else None
+        source = "materialized"
+        if results is None:
+            results = self._execute_query(conn, query, limit, params)
+            source = "database"
+        return {"results": results, "duration_ms": round((time.perf_counter() - start) * 1000, 3), "source": source}
+
     def safe_execute_query(self, conn: sqlite3.Connection, query: str, required_tables: set, data_sources: List[str]) -> List[Dict[str, Any]]:
         """Execute a query only if all required tables are present in data_sources"""
         if required_tables.issubset(set(data_sources)):
@@ -438,11 +509,194 @@ class ReportGenerationTool(BaseTool):
         }
         
     def _extract_tables_from_query(self, query: str) -> set:
-        """Basic SQL parser to extract table names from query"""
-        import re
-        matches = re.findall(r'\bFROM\s+(\w+)\b|\bJOIN\s+(\w+)\b', query, re.IGNORECASE)
-        return set([m[0] or m[1] for m in matches])
+        """Tables a query reads (CTE names, comments and string literals excluded)"""
+        return extract_table_dependencies(query)
     
+    def _runnable_queries(self, compiled: CompiledTemplate, data_source: str, data_sources: List[str]) -> List[tuple]:
+        """(index, sql) of the template queries that only read allowed tables and prepare on this database"""
+        registry = self.template_registry
+        runnable = []
+        allowed_queries = {query.index for query in registry.runnable_queries(compiled, data_sources)}
+        for query in compiled.queries:
+            if query.index not in allowed_queries:
+                logger.info(f"Skipping query {query.index+1} due to missing tables: {set(query.tables) - set(data_sources)}")
+                continue
+            tables, error = registry.check_query(data_source, query, compiled)
+            if error or not tables <= set(data_sources):
+                logger.info(f"Skipping query {query.index+1}: {error or f'reads {set(tables) - set(data_sources)}'}")
+                continue
+            runnable.append((query.index, query.sql))
+        return runnable
+
+    @staticmethod
+    def _page_size(parameters: Dict[str, Any]) -> int:
+        try:
+            return max(1, int(parameters.get("page_size", DEFAULT_PAGE_SIZE)))
+        except (TypeError, ValueError):
+            return DEFAULT_PAGE_SIZE
+
+    def _build_report(self, compiled: CompiledTemplate, data_source: str, parameters: Dict[str, Any],
+                      executed: Dict[int, Dict[str, Any]], execution_mode: str,
+                      fingerprint: Optional[str] = None, bindings: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Assemble the report object from executed query results (sections in template order).
+        Each section holds its first page of rows; a section with more rows than the page size
+        gets a continuation token for fetching or streaming the rest (utils.report_pagination).
+        `bindings` are the bound parameter values the queries ran with.
+        """
+        report_template = compiled.template
+        queries = report_template.get("queries", [])
+        visualizations = report_template.get("visualizations", [])
+        page_size = self._page_size(parameters)
+
+        skipped_sections = []
+        sections = []
+        for idx, query in enumerate(queries):
+            results = executed.get(idx, {}).get("results")
+            if not results:
+                skipped_sections.append(f"Query {idx+1}")
+                continue
+
+            page, has_more = paginate_rows(results, page_size)
+            sections.append({
+                "title": f"Section {idx+1}",
+                "content": page,
+                "visualization": visualizations[idx] if idx < len(visualizations) else None,
+                "pagination": {
+                    "offset": 0,
+                    "page_size": page_size,
+                    "rows": len(page),
+                    "has_more": has_more,
+                    "continuation_token": continuation_token(
+                        data_source, compiled.data_product, compiled.report_type, idx,
+                        len(page), page_size, fingerprint, bindings
+                    ) if has_more else None
+                }
+            })
+
+        period = f"Last {parameters.get('days_back', 30)} days"
+        if bindings and "window_start" in bindings:
+            last_day = datetime.fromisoformat(bindings["window_end"]) - timedelta(days=1)
+            period = f"Last {bindings['days_back']} days ({bindings['window_start']} to {last_day.date().isoformat()})"
+
+        # Final report object
+        report = {
+            "report_title": report_template.get("name", "Untitled Report"),
+            "generation_date": datetime.now().strftime("%B %d, %Y"),
+            "data_source": data_source,
+            "period": period,
+            "data_summary": {
+                "summary": report_template.get("description", "Data insights report."),
+                "metrics": {},
+                "queries_executed": queries,
+                "execution_mode": execution_mode,
+                "query_timings": [
+                    {"query": idx + 1, "duration_ms": item["duration_ms"],
+                     "rows": min(len(item["results"]), page_size),
+                     "has_more": len(item["results"]) > page_size, "source": item["source"]}
+                    for idx, item in sorted(executed.items())
+                ]
+            },
+            "sections": sections,
+            "recommendations": report_template.get("recommendations", []),
+            "conclusion": report_template.get("conclusion", "No conclusion available.")
+        }
+        if compiled.time_window and bindings:
+            index_name = self.template_registry.window_index(data_source, compiled)
+            if index_name is None:
+                logger.warning(
+                    f"⚠️ No index on {compiled.time_window['table']}.{compiled.time_window['column']}; "
+                    f"windowed queries of {compiled.report_type} scan the whole table"
+                )
+            report["data_summary"]["time_window"] = {**compiled.time_window, **bindings, "index": index_name}
+
+        if skipped_sections:
+            report["sections"].append({
+                "title": "⚠️ Sections Skipped",
+                "content": {
+                    "reason": "Some queries could not be executed due to missing tables or no data.",
+                    "skipped_sections": skipped_sections
+                }
+            })
+            report["conclusion"] += " Some sections were skipped due to restricted access or missing data."
+        return report
+
+    def generate_suite(self, data_source: str, data_product: str, parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Generate every report of a data product's suite in one pass (see generate_reports).
+        Returns {"data_product", "reports": {report type: report}, "stats"}.
+        """
+        parameters = dict(parameters or {})
+        parameters["data_product"] = data_product
+        outcome = self.generate_reports(data_source, self.template_registry.suite(data_product), parameters)
+        return {"data_product": data_product, **outcome}
+
+    def generate_reports(self, data_source: str, templates: List[CompiledTemplate],
+                         parameters: Dict[str, Any] = None) -> Dict[str, Any]:
+        """
+        Generate several reports in one pass. Statements shared by several reports run once,
+        compatible aggregations share a single table scan and table groups run in parallel.
+        Cached reports are reused; new ones are cached.
+        Returns {"reports": {report type: report}, "stats"}.
+        """
+        parameters = dict(parameters or {})
+        parameters["data_source"] = data_source
+        data_sources = parameters.get("data_sources", [])
+        cache = get_report_cache()
+        use_cache = parameters.get("use_cache", True)
+
+        reports: Dict[str, Dict[str, Any]] = {}
+        batches: Dict[str, List[tuple]] = {}
+        for compiled in templates:
+            bindings = self.template_registry.bind(data_source, compiled, parameters)
+            cache_key = cache.key(
+                compiled.report_type, data_source,
+                {**resolve_report_parameters(compiled.template, parameters), **bindings}, data_sources
+            ) if use_cache else None
+            cached = cache.get(cache_key) if cache_key else None
+            if cached:
+                report = cached["report"]
+                report["data_summary"]["cache"] = {"hit": True, "cached_at": cached["created_at"], "hits": cached["hits"]}
+                reports[compiled.report_type] = report
+                continue
+            # Statements are shared only between reports bound to the same parameter values
+            batches.setdefault(json.dumps(bindings, sort_keys=True), []).append(
+                (compiled, cache_key, bindings, self._runnable_queries(compiled, data_source, data_sources))
+            )
+
+        store = get_aggregate_store() if parameters.get("use_materialized", True) else None
+        fingerprint = get_change_detector().fingerprint(data_source).digest
+        stats: Dict[str, Any] = {}
+        for pending in batches.values():
+            results, batch_stats = execute_suite_queries(
+                data_source,
+                [sql for _, _, _, runnable in pending for _, sql in runnable],
+                self.template_registry.pool,
+                store=store,
+                parallel=parameters.get("parallel", True),
+                limit=self._page_size(parameters) + 1,
+                params=pending[0][2]
+            )
+            for key, value in batch_stats.items():
+                if key == "parallel_workers":
+                    stats[key] = max(stats.get(key, 0), value)
+                else:
+                    stats[key] = round(stats.get(key, 0) + value, 3)
+
+            for compiled, cache_key, bindings, runnable in pending:
+                executed = {idx: results[sql] for idx, sql in runnable if sql in results}
+                report = self._build_report(compiled, data_source, parameters, executed, "suite", fingerprint, bindings)
+                if cache_key:
+                    cache.put(cache_key, report, render_report_markdown(report))
+                    report["data_summary"]["cache"] = {"hit": False}
+                reports[compiled.report_type] = report
+
+        generated = sum(len(pending) for pending in batches.values())
+        stats["reports"] = len(reports)
+        stats["reports_from_cache"] = len(reports) - generated
+        stats["parameter_batches"] = len(batches)
+        return {"reports": reports, "stats": stats}
+
     def _run(self, report_type: str, data_source: str, parameters: Dict[str, Any] = None) -> str:
         try:
             if not parameters:
@@ -452,93 +706,53 @@ class ReportGenerationTool(BaseTool):
             data_sources = parameters.get("data_sources", [])
             data_product = parameters.get("data_product")
 
-            # Normalize report type
-            normalized_type = report_type.lower().strip().replace(" ", "_").replace("&", "and").replace("-", "_")
-
             # Check if report_type is allowed for this data product
-            allowed_names = self.data_product_reports.get(data_product, [])
-
-            # Find all template types matching allowed names
-            allowed_types = [
-                tpl.get("type")
-                for tpl in self.report_templates.get(data_product, [])
-                if tpl.get("name") in allowed_names
-            ]
-
-            if normalized_type not in allowed_types:
+            registry = self.template_registry
+            if not registry.is_allowed(data_product, report_type):
                 logger.warning(f"{report_type} not in selected data product suite.")
                 return json.dumps(self._create_error_report(
                     f"⚠️ Report '{report_type}' is not part of the '{data_product}' suite."
                 ), indent=2)
-                
-            logger.debug(f"[LOOKUP] Normalized type: {normalized_type}")
-            logger.debug(f"[LOOKUP] Available types: {[tpl.get('type') for tpl_list in self.report_templates.values() for tpl in tpl_list]}")
-                
-            # Find matching report template
-            report_template = next(
-                (tpl for tpl_list in self.report_templates.values() for tpl in tpl_list
-                 if tpl.get("type", "").lower().replace(" ", "_").replace("&", "and").replace("-", "_") == normalized_type),
-                None
-            )
 
-            if not report_template:
+            # Find matching report template
+            compiled = registry.get(report_type, data_product)
+            if not compiled:
                 return json.dumps(self._create_error_report(
                     f"⚠️ Report template '{report_type}' not found."
                 ), indent=2)
+            report_template = compiled.template
+            normalized_type = compiled.report_type
+            logger.debug(f"[LOOKUP] Normalized type: {normalized_type}")
 
-            # Connect to database
-            conn = self._connect_to_database(data_source)
-
-            skipped_sections = []
-            sections = []
-            queries = report_template.get("queries", [])
-            visualizations = report_template.get("visualizations", [])
-
-            for idx, query in enumerate(queries):
-                required_tables = self._extract_tables_from_query(query)
-                if not required_tables.issubset(set(data_sources)):
-                    logger.info(f"Skipping query {idx+1} due to missing tables: {required_tables - set(data_sources)}")
-                    skipped_sections.append(f"Query {idx+1}")
-                    continue
-
-                results = self._execute_query(conn, query)
-                if not results:
-                    skipped_sections.append(f"Query {idx+1}")
-                    continue
-
-                sections.append({
-                    "title": f"Section {idx+1}",
-                    "content": results,
-                    "visualization": visualizations[idx] if idx < len(visualizations) else None
-                })
-
-            conn.close()
-
-            # Final report object
-            report = {
-                "report_title": report_template.get("name", "Untitled Report"),
-                "generation_date": datetime.now().strftime("%B %d, %Y"),
-                "data_source": data_source,
-                "period": f"Last {parameters.get('days_back', 30)} days",
-                "data_summary": {
-                    "summary": report_template.get("description", "Data insights report."),
-                    "metrics": {},
-                    "queries_executed": queries
-                },
-                "sections": sections,
-                "recommendations": report_template.get("recommendations", []),
-                "conclusion": report_template.get("conclusion", "No conclusion available.")
-            }
+            # Identical request on unchanged data: serve the stored report
+            cache = get_report_cache()
+            use_cache = parameters.get("use_cache", True)
+            bindings = registry.bind(data_source, compiled, parameters)
+            cache_key = cache.key(
+                normalized_type, data_source,
+                {**resolve_report_parameters(report_template, parameters), **bindings}, data_sources
+            ) if use_cache else None
+            cached = cache.get(cache_key) if cache_key else None
+            if cached:
+                report = cached["report"]
+                report["data_summary"]["cache"] = {"hit": True, "cached_at": cached["created_at"], "hits": cached["hits"]}
+                return json.dumps(report, indent=2)
+
+            runnable = self._runnable_queries(compiled, data_source, data_sources)
+            parallel = parameters.get("parallel", True)
+            fingerprint = cache_key["fingerprint"] if cache_key else get_change_detector().fingerprint(data_source).digest
+            executed = self._execute_section_queries(
+                data_source, runnable, parallel, use_materialized=parameters.get("use_materialized", True),
+                limit=self._page_size(parameters) + 1, params=bindings
+            )
+            report = self._build_report(
+                compiled, data_source, parameters, executed,
+                "parallel" if parallel and len(runnable) > 1 else "sequential", fingerprint, bindings
+            )
 
-            if skipped_sections:
-                report["sections"].append({
-                    "title": "⚠️ Sections Skipped",
-                    "content": {
-                        "reason": "Some queries could not be executed due to missing tables or no data.",
-                        "skipped_sections": skipped_sections
-                    }
-                })
-                report["conclusion"] += " Some sections were skipped due to restricted access or missing data."
+            if cache_key:
+                cache.put(cache_key, report, render_report_markdown(report))
+                report["data_summary"]["cache"] = {"hit": False}
 
             return json.dumps(report, indent=2)
 
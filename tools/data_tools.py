@@ -16,8 +16,12 @@ from typing import Dict, List, Any, Optional, Type, Tuple
 from crewai.tools import BaseTool
 from pydantic import BaseModel, Field
 from utils.validation import is_valid_sqlite_connection_string
+from utils.catalog_snapshot import get_catalog_snapshot
+from utils.change_detection import get_change_detector
+from utils.data_catalog import get_data_catalog
 import sqlite3
 import json
+import warnings
 from collections import Counter
 from datetime import datetime, timedelta
 import re
@@ -46,14 +50,24 @@ class DataProfilingTool(BaseTool):
             return json.dumps({"error": f"⛔ Table `{table_name}` is not permitted", "table": table_name})
 
         try:
-            conn = sqlite3.connect(connection_string.replace("sqlite:///", ""))
+            db_path = connection_string.replace("sqlite:///", "")
+            catalog = get_data_catalog()
+            fingerprint = get_change_detector().fingerprint(db_path).digest
+            cached = catalog.get_table_profile(db_path, table_name, fingerprint)
+            if cached is not None:
+                logger.debug(f"📚 Serving profile for {table_name} from the data catalog")
+                return json.dumps(cached, indent=2, default=str)
+
+            conn = sqlite3.connect(db_path)
             df = pd.read_sql_query(f"SELECT * FROM {table_name}", conn)
-            cursor = conn.cursor()
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            schema_info = cursor.fetchall()
+            snapshot = get_catalog_snapshot(db_path, conn)
+            schema_info = snapshot.table_info(table_name)
+            # The full read already counted the rows; share it with metadata extraction
+            snapshot.record_row_count(table_name, len(df))
 
             profile = self._profile_table(df, table_name, schema_info)
             conn.close()
+            catalog.record_table_profile(db_path, fingerprint, profile)
             return json.dumps(profile, indent=2, default=str)
 
         except Exception as e:
@@ -65,9 +79,12 @@ class DataProfilingTool(BaseTool):
         quality_issues = []
         anomalies = []
 
+        # One vectorized pass over every numeric column instead of per-column quantiles
+        numeric_anomalies = self._detect_numeric_anomalies(df)
+
         for col in df.columns:
             try:
-                col_profile = self._enhanced_column_profiling(df, col, schema_info)
+                col_profile = self._enhanced_column_profiling(df, col, schema_info, numeric_anomalies.get(col))
                 column_profiles[col] = col_profile
 
                 score = col_profile.get("quality_score", None)
@@ -110,7 +127,8 @@ class DataProfilingTool(BaseTool):
 
         return profile
 
-    def _enhanced_column_profiling(self, df: pd.DataFrame, col: str, schema_info: List) -> Dict:
+    def _enhanced_column_profiling(self, df: pd.DataFrame, col: str, schema_info: List,
+                                   precomputed_anomalies: Optional[List[Dict]] = None) -> Dict:
         s = df[col]
         total_records = len(df)
         null_count = s.isnull().sum()
@@ -143,7 +161,10 @@ class DataProfilingTool(BaseTool):
 
         profile["quality_breakdown"] = self._assess_column_quality(s, col, semantic_type)
         profile["quality_score"] = self._calculate_quality_score(profile["quality_breakdown"])
-        profile["anomalies"] = self._detect_anomalies(safe_series, col)
+        if precomputed_anomalies is not None:
+            profile["anomalies"] = precomputed_anomalies
+        else:
+            profile["anomalies"] = self._detect_anomalies(safe_series, col)
         profile["business_rules"] = self._validate_business_rules(safe_series, col, semantic_type)
         profile["recommendations"] = self._generate_column_recommendations(profile)
 
@@ -290,6 +311,73 @@ class DataProfilingTool(BaseTool):
                    for metric, weight in weights.items())
         return round(score, 3)
 
+    def _detect_numeric_anomalies(self, df: pd.DataFrame) -> Dict[str, List[Dict]]:
+        """
+        Detect statistical and business anomalies for all numeric columns at once.
+
+        The numeric columns are stacked into a single 2-D array so quartiles, IQR bounds,
+        z-scores and the age rule are evaluated with one vectorized call along axis 0.
+        Returns a mapping of column name -> anomalies in the same format as `_detect_anomalies`.
+        Non-numeric columns are not included and fall back to the per-column path.
+        """
+        numeric_cols = df.select_dtypes(include="number").columns
+        if len(numeric_cols) == 0:
+            return {}
+
+        anomalies: Dict[str, List[Dict]] = {col: [] for col in numeric_cols}
+
+        try:
+            values = df[numeric_cols].to_numpy(dtype=float, na_value=np.nan)
+            valid = ~np.isnan(values)
+            valid_counts = valid.sum(axis=0)
+
+            with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+                # All-NaN columns legitimately produce NaN statistics
+                warnings.simplefilter("ignore", RuntimeWarning)
+                q1, q3 = np.nanquantile(values, [0.25, 0.75], axis=0)
+                iqr = q3 - q1
+                lower_bounds = q1 - 1.5 * iqr
+                upper_bounds = q3 + 1.5 * iqr
+                outlier_counts = ((values < lower_bounds) | (values > upper_bounds)).sum(axis=0)
+
+                means = np.nanmean(values, axis=0)
+                stds = np.nanstd(values, axis=0)
+                z_scores = np.abs((values - means) / np.where(stds > 0, stds, np.nan))
+                max_z_scores = np.nanmax(np.where(np.isnan(z_scores), -np.inf, z_scores), axis=0)
+
+                # Business rule: ages must fall within [0, 120]
+                age_mask = np.array(["age" in str(col).lower() for col in numeric_cols])
+                invalid_age_counts = (((values < 0) | (values > 120)) & age_mask).sum(axis=0)
+        except Exception as e:
+            logger.warning(f"⚠️ Vectorized anomaly detection failed, falling back to per-column checks: {e}")
+            return {}
+
+        for idx, col in enumerate(numeric_cols):
+            n_valid = int(valid_counts[idx])
+            n_outliers = int(outlier_counts[idx])
+
+            if n_valid > 10 and n_outliers > 0:
+                anomalies[col].append({
+                    "type": "statistical_outlier",
+                    "severity": "medium" if n_outliers / n_valid < 0.05 else "high",
+                    "count": n_outliers,
+                    "percentage": round((n_outliers / n_valid) * 100, 2),
+                    "description": f"{n_outliers} outliers detected outside [{lower_bounds[idx]:.2f}, {upper_bounds[idx]:.2f}]",
+                    "max_abs_z_score": round(float(max_z_scores[idx]), 2) if np.isfinite(max_z_scores[idx]) else None,
+                    "recommendation": "Review data entry process and validate extreme values"
+                })
+
+            if age_mask[idx] and invalid_age_counts[idx] > 0:
+                anomalies[col].append({
+                    "type": "business_rule_violation",
+                    "severity": "high",
+                    "count": int(invalid_age_counts[idx]),
+                    "description": f"{int(invalid_age_counts[idx])} records with invalid age values",
+                    "recommendation": "Implement age validation rules"
+                })
+
+        return anomalies
+
     def _detect_anomalies(self, series: pd.Series, col_name: str) -> List[Dict]:
         """Detect statistical and business anomalies."""
         anomalies = []
@@ -21,6 +21,10 @@ from pydantic import BaseModel, Field
 import pandas as pd
 import numpy as np
 from utils.validation import is_valid_sqlite_connection_string
+from utils.catalog_snapshot import CatalogSnapshot, get_catalog_snapshot
+from utils.change_detection import get_change_detector
+from utils.data_catalog import get_data_catalog, options_hash
+from utils.stats_maintenance import statistics_freshness
 
 logger = logging.getLogger(__name__)
 
@@ -76,6 +80,8 @@ class MetadataExtractionInput(BaseModel):
     allowed_tables: List[str] = Field(default=None, description="Optional list of allowed tables")
     include_sample_data: Optional[bool] = Field(default=True, description="Whether to include sample data analysis")
     max_sample_size: int = Field(default=10000, description="Maximum number of rows to sample for analysis")
+    exact_count_threshold: Optional[int] = Field(default=None, description="Skip exact COUNT(*) and use sqlite_stat1 estimates for tables with more rows than this")
+    refresh_statistics: Optional[bool] = Field(default=False, description="Run a bounded ANALYZE on the table when sqlite_stat1 has no estimate for it")
 
 class MetadataExtractionTool(BaseTool):
     name: str = "Metadata Extraction Tool"
@@ -83,7 +89,8 @@ class MetadataExtractionTool(BaseTool):
     args_schema: Type[BaseModel] = MetadataExtractionInput
 
     def _run(self, table_name: str, connection_string: str, allowed_tables: Optional[List[str]] = None, 
-             include_sample_data: bool = True, max_sample_size: int = 10000) -> str:
+             include_sample_data: bool = True, max_sample_size: int = 10000,
+             exact_count_threshold: Optional[int] = None, refresh_statistics: bool = False) -> str:
         logger.debug(f"📥 MetadataExtractionTool Input - Table: {table_name}, Conn: {connection_string}")
         
         if not connection_string:
@@ -105,8 +112,31 @@ class MetadataExtractionTool(BaseTool):
             })
 
         try:
-            conn = sqlite3.connect(connection_string.replace("sqlite:///", ""))
-            cursor = conn.cursor()
+            db_path = connection_string.replace("sqlite:///", "")
+            catalog = get_data_catalog()
+            options = options_hash(include_sample_data=include_sample_data, max_sample_size=max_sample_size,
+                                   exact_count_threshold=exact_count_threshold)
+            fingerprint = get_change_detector().fingerprint(db_path).digest
+            cached = catalog.get_table_metadata(db_path, table_name, fingerprint, options)
+            if cached is not None:
+                logger.debug(f"📚 Serving metadata for {table_name} from the data catalog")
+                return json.dumps(cached, indent=2, default=str)
+
+            conn = sqlite3.connect(db_path)
+            snapshot = get_catalog_snapshot(db_path, conn)
+
+            if not snapshot.has_table(table_name):
+                conn.close()
+                return json.dumps({
+                    "error": f"❌ Metadata extraction failed: no such table: {table_name}",
+                    "table": table_name,
+                    "timestamp": datetime.now().isoformat()
+                })
+
+            if refresh_statistics and snapshot.estimated_row_count(table_name, conn) is None:
+                snapshot = self._refresh_table_statistics(conn, db_path, table_name)
+                # ANALYZE wrote sqlite_stat1, so the result belongs to the new database state
+                fingerprint = get_change_detector().fingerprint(db_path).digest
 
             # Initialize metadata structure
             metadata = {
@@ -137,22 +167,20 @@ class MetadataExtractionTool(BaseTool):
                 }
             }
 
-            # Basic table information
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            schema = cursor.fetchall()
-            
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            row_count = cursor.fetchone()[0]
-            
-            # Get table creation SQL for analysis
-            cursor.execute(f"SELECT sql FROM sqlite_master WHERE type='table' AND name='{table_name}'")
-            create_sql = cursor.fetchone()
+            # Basic table information (catalog facts come from the shared snapshot)
+            schema = snapshot.table_info(table_name)
+            row_count, row_count_source = snapshot.resolve_row_count(table_name, conn, exact_count_threshold)
             
             metadata["basic_info"] = {
                 "row_count": row_count,
+                "row_count_source": row_count_source,
                 "column_count": len(schema),
-                "estimated_size_mb": self._estimate_table_size(cursor, table_name),
-                "creation_sql": create_sql[0] if create_sql else None
+                **self._measure_table_size(snapshot, table_name, conn, row_count),
+                "statistics": {
+                    "has_sqlite_stat1": snapshot.estimated_row_count(table_name, conn) is not None,
+                    **statistics_freshness(db_path)
+                },
+                "creation_sql": snapshot.create_sql(table_name)
             }
 
             # Load sample data for analysis
@@ -177,8 +205,8 @@ class MetadataExtractionTool(BaseTool):
                     metadata["relationships"]["primary_keys"].append(name)
 
             # Enhanced relationship detection
-            metadata["relationships"]["foreign_key_hints"] = self._detect_foreign_keys(schema, cursor)
-            metadata["relationships"]["indexes"] = self._get_indexes(cursor, table_name)
+            metadata["relationships"]["foreign_key_hints"] = self._detect_foreign_keys(schema, snapshot)
+            metadata["relationships"]["indexes"] = self._get_indexes(snapshot, table_name)
 
             # Data quality assessment
             metadata["data_quality"] = self._assess_data_quality(schema, df, quality_issues, row_count)
@@ -193,7 +221,8 @@ class MetadataExtractionTool(BaseTool):
             )
 
             conn.close()
-            return json.dumps(metadata, indent=2)
+            catalog.record_table_metadata(db_path, fingerprint, metadata, options)
+            return json.dumps(metadata, indent=2, default=str)
 
         except Exception as e:
             return json.dumps({
@@ -376,13 +405,12 @@ class MetadataExtractionTool(BaseTool):
 
         return suggestions
 
-    def _detect_foreign_keys(self, schema: List, cursor) -> List[Dict]:
+    def _detect_foreign_keys(self, schema: List, snapshot: CatalogSnapshot) -> List[Dict]:
         """Enhanced foreign key detection"""
         fk_hints = []
         
-        # Get all table names
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table'")
-        all_tables = [row[0] for row in cursor.fetchall()]
+        # All table names come from the shared catalog snapshot
+        all_tables = snapshot.table_names
         
         for col in schema:
             col_id, name, dtype, not_null, default_val, is_pk = col
@@ -410,28 +438,55 @@ class MetadataExtractionTool(BaseTool):
         
         return fk_hints
 
-    def _get_indexes(self, cursor, table_name: str) -> List[Dict]:
+    def _get_indexes(self, snapshot: CatalogSnapshot, table_name: str) -> List[Dict]:
         """Get existing indexes for the table"""
-        cursor.execute(f"PRAGMA index_list({table_name})")
-        indexes = []
-        for index_info in cursor.fetchall():
-            cursor.execute(f"PRAGMA index_info({index_info[1]})")
-            columns = [col[2] for col in cursor.fetchall()]
-            indexes.append({
-                "name": index_info[1],
-                "unique": bool(index_info[2]),
-                "columns": columns
-            })
-        return indexes
+        return [
+            {
+                "name": index["name"],
+                "unique": index["unique"],
+                "columns": index["columns"]
+            }
+            for index in snapshot.indexes(table_name)
+        ]
 
-    def _estimate_table_size(self, cursor, table_name: str) -> float:
-        """Estimate table size in MB"""
+    def _refresh_table_statistics(self, conn: sqlite3.Connection, db_path: str, table_name: str) -> CatalogSnapshot:
+        """Run a bounded ANALYZE for one table so sqlite_stat1 can answer row counts"""
         try:
-            cursor.execute(f"SELECT COUNT(*) FROM {table_name}")
-            row_count = cursor.fetchone()[0]
-            
-            cursor.execute(f"PRAGMA table_info({table_name})")
-            columns = cursor.fetchall()
+            conn.execute("PRAGMA analysis_limit = 1000")
+            conn.execute(f'ANALYZE "{table_name}"')
+            conn.commit()
+            logger.info(f"📈 Refreshed planner statistics for {table_name}")
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ ANALYZE failed for {table_name}: {e}")
+        return get_catalog_snapshot(db_path, conn)
+
+    def _measure_table_size(self, snapshot: CatalogSnapshot, table_name: str,
+                            conn: sqlite3.Connection, row_count: int) -> Dict:
+        """Table and index sizes in MB, measured via dbstat with a type-based fallback"""
+        mb = 1024 * 1024
+        try:
+            storage = snapshot.table_storage(table_name, conn)
+        except sqlite3.Error:
+            storage = None
+
+        if storage is not None:
+            return {
+                "estimated_size_mb": round(storage["table_bytes"] / mb, 4),
+                "index_size_mb": round(storage["total_index_bytes"] / mb, 4),
+                "index_sizes_mb": {name: round(size / mb, 4) for name, size in storage["index_bytes"].items()},
+                "size_source": "dbstat"
+            }
+
+        return {
+            "estimated_size_mb": self._estimate_table_size(snapshot, table_name, row_count),
+            "database_size_mb": round(snapshot.page_stats(conn)["database_bytes"] / mb, 4),
+            "size_source": "column_type_estimate"
+        }
+
+    def _estimate_table_size(self, snapshot: CatalogSnapshot, table_name: str, row_count: int) -> float:
+        """Estimate table size in MB from declared column types (used when dbstat is unavailable)"""
+        try:
+            columns = snapshot.table_info(table_name)
             
             # Rough estimation based on column types
             estimated_row_size = 0
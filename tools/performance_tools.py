@@ -0,0 +1,492 @@
+# =============================================================================
+# tools/performance_tools.py - Query performance analysis tools
+# =============================================================================
+
+"""
+tools/performance_tools.py
+Performance tools that measure how SQLite executes the platform's workload
+"""
+import os
+import sys
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import re
+import json
+import time
+import shutil
+import sqlite3
+import tempfile
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Type, Tuple
+from crewai.tools import BaseTool
+from pydantic import BaseModel, Field
+from utils.validation import is_valid_sqlite_connection_string
+from utils.catalog_snapshot import get_catalog_snapshot
+from utils.data_catalog import get_data_catalog
+from utils.template_registry import get_template_registry
+from utils.sql_analysis import (
+    normalize_sql, is_read_only_sql, explain_query_plan, build_plan_tree, format_plan_tree,
+    find_plan_issues, indexes_used, table_aliases, analyze_column_usage, time_query
+)
+
+logger = logging.getLogger(__name__)
+
+
+def collect_workload(conn: sqlite3.Connection, db_path: str, data_product: Optional[str] = None,
+                     include_query_log: bool = True) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Gather the statements the platform actually runs against a database: report template
+    queries plus Text2SQL statements logged in the data catalog. Statements that do not
+    prepare against this database (missing tables/columns) are returned separately.
+    """
+    candidates = []
+    registry = get_template_registry()
+    for product in registry.templates:
+        if data_product and product != data_product:
+            continue
+        for compiled in registry.for_product(product):
+            # Windowed templates are analyzed with the window a default report would use
+            params = registry.bind(db_path, compiled) if compiled.time_window else {}
+            for query in compiled.queries:
+                candidates.append({
+                    "id": f"{compiled.template.get('type')}#{query.index + 1}",
+                    "source": "report_template",
+                    "sql": normalize_sql(query.raw_sql),
+                    "params": params,
+                    "weight": 1
+                })
+
+    if include_query_log:
+        try:
+            for idx, logged in enumerate(get_data_catalog().logged_queries(db_path, source="text2sql")):
+                candidates.append({
+                    "id": f"text2sql#{idx + 1}",
+                    "source": "text2sql",
+                    "sql": normalize_sql(logged["sql_text"]),
+                    "weight": logged["executions"]
+                })
+        except Exception as e:
+            logger.warning(f"⚠️ Could not read the query log: {e}")
+
+    workload, skipped = [], []
+    seen = set()
+    for item in candidates:
+        if not item["sql"] or item["sql"] in seen:
+            continue
+        seen.add(item["sql"])
+        try:
+            explain_query_plan(conn, item["sql"], item.get("params"))
+            workload.append(item)
+        except sqlite3.Error as e:
+            skipped.append({"id": item["id"], "reason": str(e)})
+    return workload, skipped
+
+
+class IndexAdvisorInput(BaseModel):
+    connection_string: str = Field(..., description="Valid SQLite path. Passed from platform, e.g., 'sqlite:///uploaded_dbs/ecommerce_db.db'")
+    data_product: Optional[str] = Field(default=None, description="Limit the template workload to one data product's reports")
+    include_query_log: Optional[bool] = Field(default=True, description="Include executed Text2SQL statements from the data catalog")
+    repeat: int = Field(default=3, description="Timed warm runs per query")
+    max_candidates: int = Field(default=20, description="Maximum number of candidate indexes to evaluate")
+    min_speedup: float = Field(default=1.2, description="Minimum measured speedup for an index to be recommended")
+    max_index_columns: int = Field(default=5, description="Widest composite/covering index to consider")
+
+
+class IndexAdvisorTool(BaseTool):
+    name: str = "Index Advisor Tool"
+    description: str = (
+        "Analyze the real query workload (report templates and executed Text2SQL statements) with EXPLAIN QUERY PLAN, "
+        "propose single-column, composite and covering indexes, and measure their speedup on a scratch copy of the database"
+    )
+    args_schema: Type[BaseModel] = IndexAdvisorInput
+
+    def _run(self, connection_string: str, data_product: Optional[str] = None, include_query_log: bool = True,
+             repeat: int = 3, max_candidates: int = 20, min_speedup: float = 1.2, max_index_columns: int = 5) -> str:
+        logger.debug(f"📥 IndexAdvisorTool Input - Conn: {connection_string}, Product: {data_product}")
+
+        if not connection_string or not is_valid_sqlite_connection_string(connection_string):
+            return json.dumps({"error": f"❌ Invalid or missing connection string: {connection_string}"})
+
+        db_path = connection_string.replace("sqlite:///", "")
+        scratch_dir = tempfile.mkdtemp(prefix="index_advisor_")
+        try:
+            scratch = self._create_scratch_copy(db_path, os.path.join(scratch_dir, "scratch.db"))
+            snapshot = get_catalog_snapshot(db_path)
+
+            workload, skipped = collect_workload(scratch, db_path, data_product, include_query_log)
+            if not workload:
+                scratch.close()
+                return json.dumps({
+                    "error": "❌ No workload queries could be prepared against this database",
+                    "skipped_queries": skipped
+                }, indent=2)
+
+            # Baseline plans, issues and timings
+            analysis = []
+            for item in workload:
+                usage = analyze_column_usage(scratch, item["sql"], item.get("params"))
+                plan = explain_query_plan(scratch, item["sql"], item.get("params"))
+                analysis.append({
+                    **item,
+                    "usage": usage,
+                    "issues": find_plan_issues(plan, usage.aliases),
+                    "indexes_used": indexes_used(plan),
+                    "baseline": time_query(scratch, item["sql"], repeat, params=item.get("params"))
+                })
+
+            existing = {
+                table: [tuple(index["columns"]) for index in snapshot.indexes(table)]
+                for table in snapshot.table_names
+            }
+            # INTEGER PRIMARY KEY columns are the rowid itself; indexes leading with them are useless
+            rowid_columns = {}
+            for table in snapshot.table_names:
+                pk_columns = [col for col in snapshot.table_info(table) if col[5]]
+                if len(pk_columns) == 1 and pk_columns[0][2].upper() == "INTEGER":
+                    rowid_columns[table] = pk_columns[0][1]
+            candidates = self._propose_candidates(analysis, existing, rowid_columns, max_index_columns)[:max_candidates]
+            evaluated = [self._evaluate_candidate(scratch, candidate, analysis, repeat) for candidate in candidates]
+            recommended = self._select_indexes(evaluated, min_speedup)
+
+            workload_timing = self._measure_combined(scratch, analysis, recommended, repeat)
+            scratch.close()
+
+            report = {
+                "database": connection_string,
+                "analysis_timestamp": datetime.now().isoformat(),
+                "workload": {
+                    "queries_analyzed": len(analysis),
+                    "by_source": {
+                        source: sum(1 for item in analysis if item["source"] == source)
+                        for source in sorted({item["source"] for item in analysis})
+                    },
+                    "skipped_queries": skipped
+                },
+                "plan_issues": [
+                    {
+                        "query_id": item["id"],
+                        "issues": [issue["detail"] for issue in item["issues"]],
+                        "baseline_ms": item["baseline"]["median_ms"]
+                    }
+                    for item in analysis if item["issues"]
+                ],
+                "candidates_evaluated": evaluated,
+                "recommended_indexes": recommended,
+                "workload_timing": workload_timing
+            }
+            return json.dumps(report, indent=2, default=str)
+
+        except Exception as e:
+            logger.error(f"❌ Index advisor failed: {e}")
+            return json.dumps({"error": f"❌ Index advisor failed: {str(e)}"})
+        finally:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    def _create_scratch_copy(self, db_path: str, scratch_path: str) -> sqlite3.Connection:
+        """Consistent copy of the source database via the online backup API"""
+        source = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+        scratch = sqlite3.connect(scratch_path)
+        try:
+            source.backup(scratch)
+        finally:
+            source.close()
+        return scratch
+
+    def _propose_candidates(self, analysis: List[Dict], existing: Dict[str, List[Tuple]],
+                            rowid_columns: Dict[str, str], max_columns: int) -> List[Dict[str, Any]]:
+        """Single-column, composite (equality, range, then GROUP/ORDER BY) and covering candidates"""
+        proposals: Dict[Tuple[str, Tuple[str, ...]], Dict[str, Any]] = {}
+
+        def propose(table: str, columns: List[str], kind: str, query_id: str) -> None:
+            columns = tuple(dict.fromkeys(columns))
+            if not columns or len(columns) > max_columns or rowid_columns.get(table) == columns[0]:
+                return
+            # An existing index with the same leading columns already serves this access path
+            if any(index[:len(columns)] == columns for index in existing.get(table, [])):
+                return
+            entry = proposals.setdefault((table, columns), {"table": table, "columns": list(columns), "kind": kind, "queries": []})
+            if query_id not in entry["queries"]:
+                entry["queries"].append(query_id)
+
+        for item in analysis:
+            if not item["issues"]:
+                continue
+            usage = item["usage"]
+            scanned = {issue["table"] for issue in item["issues"] if issue["type"] == "full_scan"}
+            temp_purposes = " ".join(issue["purpose"] for issue in item["issues"] if issue["type"] == "temp_btree")
+
+            for table in usage.read_columns:
+                equality = usage.equality.get(table, []) + [
+                    col for col in usage.joins.get(table, []) if col not in usage.equality.get(table, [])
+                ]
+                ranges = usage.ranges.get(table, [])
+                group_by = usage.group_by.get(table, []) if "GROUP BY" in temp_purposes else []
+                order_by = usage.order_by.get(table, []) if "ORDER BY" in temp_purposes else []
+
+                if table in scanned:
+                    for col in equality + ranges:
+                        propose(table, [col], "single_column", item["id"])
+                    if len(equality) + min(len(ranges), 1) > 1:
+                        propose(table, equality + ranges[:1], "composite", item["id"])
+
+                for ordering in (group_by, order_by):
+                    if ordering:
+                        key = [col for col in equality if col not in ordering] + ordering
+                        propose(table, key, "composite" if len(key) > 1 else "single_column", item["id"])
+                        # Covering variant lets SQLite answer from the index alone
+                        rest = sorted(usage.read_columns[table] - set(key))
+                        if rest:
+                            propose(table, key + rest, "covering", item["id"])
+
+                if table in scanned and (equality or ranges):
+                    key = equality + ranges[:1]
+                    rest = sorted(usage.read_columns[table] - set(key))
+                    if rest:
+                        propose(table, key + rest, "covering", item["id"])
+
+        return sorted(proposals.values(), key=lambda c: (-len(c["queries"]), len(c["columns"])))
+
+    @staticmethod
+    def _index_name(table: str, columns: List[str]) -> str:
+        return re.sub(r"\W", "_", f"idx_{table}_{'_'.join(columns)}")[:60]
+
+    def _ddl(self, candidate: Dict[str, Any]) -> str:
+        cols = ", ".join(f'"{col}"' for col in candidate["columns"])
+        return f'CREATE INDEX "{self._index_name(candidate["table"], candidate["columns"])}" ON "{candidate["table"]}" ({cols})'
+
+    def _evaluate_candidate(self, scratch: sqlite3.Connection, candidate: Dict[str, Any],
+                            analysis: List[Dict], repeat: int) -> Dict[str, Any]:
+        """Create the index on the scratch copy, re-plan and re-time the queries that touch its table"""
+        name = self._index_name(candidate["table"], candidate["columns"])
+        result = {**candidate, "index_name": name, "ddl": self._ddl(candidate), "used_by": [], "size_kb": None,
+                  "before_ms": 0.0, "after_ms": 0.0, "speedup": 1.0, "time_saved_ms": 0.0}
+        try:
+            scratch.execute(result["ddl"])
+            try:
+                size = scratch.execute("SELECT SUM(pgsize) FROM dbstat WHERE name = ?", (name,)).fetchone()[0]
+                result["size_kb"] = round((size or 0) / 1024, 1)
+            except sqlite3.Error:
+                pass
+
+            for item in analysis:
+                if candidate["table"] not in item["usage"].read_columns:
+                    continue
+                if name not in indexes_used(explain_query_plan(scratch, item["sql"], item.get("params"))):
+                    continue
+                after = time_query(scratch, item["sql"], repeat, params=item.get("params"))
+                result["used_by"].append({
+                    "query_id": item["id"],
+                    "before_ms": item["baseline"]["median_ms"],
+                    "after_ms": after["median_ms"]
+                })
+                result["before_ms"] += item["baseline"]["median_ms"] * item["weight"]
+                result["after_ms"] += after["median_ms"] * item["weight"]
+        except sqlite3.Error as e:
+            result["error"] = str(e)
+        finally:
+            scratch.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+        if result["used_by"] and result["after_ms"] > 0:
+            result["speedup"] = round(result["before_ms"] / result["after_ms"], 2)
+        result["time_saved_ms"] = round(result["before_ms"] - result["after_ms"], 3)
+        result["before_ms"] = round(result["before_ms"], 3)
+        result["after_ms"] = round(result["after_ms"], 3)
+        return result
+
+    def _select_indexes(self, evaluated: List[Dict], min_speedup: float) -> List[Dict[str, Any]]:
+        """Keep the best measured index per query; drop indexes that become redundant"""
+        ranked = sorted(
+            (c for c in evaluated if c["used_by"] and c["speedup"] >= min_speedup and c["time_saved_ms"] > 0),
+            key=lambda c: -c["time_saved_ms"]
+        )
+        selected, served = [], set()
+        for candidate in ranked:
+            queries = {use["query_id"] for use in candidate["used_by"]}
+            if queries <= served:
+                continue
+            selected.append({
+                "table": candidate["table"],
+                "columns": candidate["columns"],
+                "kind": candidate["kind"],
+                "ddl": candidate["ddl"],
+                "speedup": candidate["speedup"],
+                "time_saved_ms": candidate["time_saved_ms"],
+                "size_kb": candidate["size_kb"],
+                "queries": sorted(queries - served)
+            })
+            served |= queries
+        return selected
+
+    def _measure_combined(self, scratch: sqlite3.Connection, analysis: List[Dict],
+                          recommended: List[Dict], repeat: int) -> Dict[str, Any]:
+        """Re-time the whole workload with every recommended index applied together"""
+        before = sum(item["baseline"]["median_ms"] * item["weight"] for item in analysis)
+        if not recommended:
+            return {"before_ms": round(before, 3), "after_ms": round(before, 3), "speedup": 1.0}
+
+        for index in recommended:
+            scratch.execute(index["ddl"])
+        after = sum(time_query(scratch, item["sql"], repeat, params=item.get("params"))["median_ms"] * item["weight"] for item in analysis)
+        return {
+            "before_ms": round(before, 3),
+            "after_ms": round(after, 3),
+            "speedup": round(before / after, 2) if after > 0 else None
+        }
+
+
+# Authorizer actions a read-only statement may need; anything else is denied
+_READ_ONLY_ACTIONS = {sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION}
+if hasattr(sqlite3, "SQLITE_RECURSIVE"):
+    _READ_ONLY_ACTIONS.add(sqlite3.SQLITE_RECURSIVE)
+
+
+def _read_only_authorizer(action, arg1, arg2, db_name, source):
+    return sqlite3.SQLITE_OK if action in _READ_ONLY_ACTIONS else sqlite3.SQLITE_DENY
+
+
+class QueryPlanInput(BaseModel):
+    connection_string: str = Field(..., description="Valid SQLite path. Passed from platform, e.g., 'sqlite:///uploaded_dbs/ecommerce_db.db'")
+    sql: str = Field(..., description="Single read-only SQL statement (SELECT or WITH ... SELECT) to inspect")
+    runs: int = Field(default=5, description="Number of warm timed runs")
+    timeout_seconds: Optional[float] = Field(default=30.0, description="Abort the inspection (plan plus all runs) after this many seconds")
+
+
+class QueryPlanTool(BaseTool):
+    name: str = "Query Plan Tool"
+    description: str = (
+        "Show how SQLite executes a read-only SQL statement: EXPLAIN QUERY PLAN tree, indexes used, "
+        "planner row estimates versus actual rows, and wall-clock timing over N warm runs. Write statements are refused."
+    )
+    args_schema: Type[BaseModel] = QueryPlanInput
+
+    def _run(self, connection_string: str, sql: str, runs: int = 5, timeout_seconds: Optional[float] = 30.0) -> str:
+        logger.debug(f"📥 QueryPlanTool Input - Conn: {connection_string}, SQL: {sql}")
+
+        if not connection_string or not is_valid_sqlite_connection_string(connection_string):
+            return json.dumps({"error": f"❌ Invalid or missing connection string: {connection_string}"})
+
+        # Layer 1: keyword check; layer 2: read-only connection; layer 3: authorizer
+        if not is_read_only_sql(sql):
+            return json.dumps({"error": "⛔ Only single read-only SELECT statements can be inspected", "sql": sql})
+
+        db_path = connection_string.replace("sqlite:///", "")
+        conn = None
+        try:
+            conn = sqlite3.connect(f"file:{os.path.abspath(db_path)}?mode=ro", uri=True)
+            conn.set_authorizer(_read_only_authorizer)
+            if timeout_seconds:
+                self._install_timeout(conn, timeout_seconds)
+
+            statement = normalize_sql(sql)
+            plan = explain_query_plan(conn, statement)
+            aliases = table_aliases(statement)
+            snapshot = get_catalog_snapshot(db_path)
+
+            steps = [self._describe_step(row["detail"], aliases, snapshot, conn) for row in plan]
+            timing = time_query(conn, statement, repeat=runs)
+
+            result = {
+                "database": connection_string,
+                "sql": statement,
+                "plan_tree": build_plan_tree(plan),
+                "plan_text": format_plan_tree(build_plan_tree(plan)),
+                "indexes_used": indexes_used(plan),
+                "issues": find_plan_issues(plan, aliases),
+                "steps": steps,
+                "rows": {
+                    "estimated_rows_visited": self._estimate_rows_visited(steps),
+                    "actual_rows_returned": timing["rows"]
+                },
+                "statistics_available": snapshot.has_table("sqlite_stat1"),
+                "timing": timing,
+                "analysis_timestamp": datetime.now().isoformat()
+            }
+            if not result["statistics_available"]:
+                result["note"] = "No sqlite_stat1 statistics: estimates fall back to table row counts. Run ANALYZE for planner estimates."
+            return json.dumps(result, indent=2, default=str)
+
+        except sqlite3.DatabaseError as e:
+            message = str(e)
+            if "not authorized" in message or "readonly" in message:
+                return json.dumps({"error": f"⛔ Statement refused (read-only inspection): {message}", "sql": sql})
+            if "interrupted" in message:
+                return json.dumps({"error": f"⏱️ Query exceeded {timeout_seconds}s timeout", "sql": sql})
+            return json.dumps({"error": f"❌ Query plan inspection failed: {message}", "sql": sql})
+        except Exception as e:
+            return json.dumps({"error": f"❌ Query plan inspection failed: {str(e)}", "sql": sql})
+        finally:
+            if conn:
+                conn.close()
+
+    def _install_timeout(self, conn: sqlite3.Connection, timeout_seconds: float) -> None:
+        """Interrupt execution once the whole inspection exceeds the time budget"""
+        deadline = time.monotonic() + timeout_seconds
+        conn.set_progress_handler(lambda: 1 if time.monotonic() > deadline else 0, 10000)
+
+    def _describe_step(self, detail: str, aliases: Dict[str, str], snapshot,
+                       conn: sqlite3.Connection) -> Dict[str, Any]:
+        """Per-step table, access path and estimated rows from sqlite_stat1 (or table row counts)"""
+        step = {"detail": detail}
+        match = re.match(r"^(SCAN|SEARCH) (\w+)(?: USING (?:(COVERING) )?(?:INDEX (\S+)|(INTEGER PRIMARY KEY)|(PRIMARY KEY)))?(?: \((.*)\))?", detail)
+        if not match:
+            return step
+
+        operation, name, covering, index_name, ipk, _pk, constraint = match.groups()
+        table = aliases.get(name, name)
+        if not snapshot.has_table(table):
+            return step
+
+        table_rows = snapshot.estimated_row_count(table)
+        estimate_source = "sqlite_stat1"
+        if table_rows is None:
+            table_rows = snapshot.row_count(table)
+            estimate_source = "row_count"
+
+        step.update({
+            "operation": operation.lower(),
+            "table": table,
+            "index": index_name or ("rowid" if ipk else None),
+            "covering": bool(covering),
+            "table_rows": table_rows
+        })
+
+        if operation == "SCAN":
+            step["estimated_rows"] = table_rows
+        elif ipk and constraint and "=" in constraint and "<" not in constraint and ">" not in constraint:
+            step["estimated_rows"] = 1
+        else:
+            equality_terms = len(re.findall(r"\w+=\?", constraint or ""))
+            step["estimated_rows"] = self._index_rows_per_key(conn, snapshot, table, index_name, equality_terms, table_rows)
+            if constraint and re.search(r"[<>]", constraint):
+                # SQLite assumes a range constraint keeps about 1/4 of the rows
+                step["estimated_rows"] = max(1, step["estimated_rows"] // 4)
+        step["estimate_source"] = estimate_source
+        return step
+
+    def _index_rows_per_key(self, conn: sqlite3.Connection, snapshot, table: str, index_name: Optional[str],
+                            equality_terms: int, table_rows: int) -> int:
+        """Average rows per equality prefix from sqlite_stat1, else SQLite's default guess of 10"""
+        index = next((i for i in snapshot.indexes(table) if i["name"] == index_name), None)
+        if index and index["unique"] and equality_terms >= len(index["columns"]):
+            return 1
+        if index_name and equality_terms and snapshot.has_table("sqlite_stat1"):
+            try:
+                row = conn.execute("SELECT stat FROM sqlite_stat1 WHERE tbl = ? AND idx = ?", (table, index_name)).fetchone()
+                if row:
+                    values = [int(v) for v in str(row[0]).split() if v.isdigit()]
+                    if len(values) > equality_terms:
+                        return values[equality_terms]
+            except sqlite3.Error:
+                pass
+        return min(table_rows, 10) if equality_terms else table_rows
+
+    @staticmethod
+    def _estimate_rows_visited(steps: List[Dict[str, Any]]) -> Optional[int]:
+        """Nested-loop estimate: product of the per-step row estimates"""
+        estimates = [step["estimated_rows"] for step in steps if "estimated_rows" in step]
+        if not estimates:
+            return None
+        total = 1
+        for estimate in estimates:
+            total *= max(1, estimate)
+        return total
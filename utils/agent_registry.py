@@ -0,0 +1,111 @@
+"""
+utils/agent_registry.py
+Process-wide registry of the long-lived pieces of an agent crew: YAML configs re-read only
+when the file changes, the tool set built once per process, and agents built once per
+configuration hash and leased out one crew at a time. A leased agent is never shared by two
+running crews; concurrent tables and databases get their own instances, which go back to an
+idle pool for the next table or phase. DataManagementCrew instances are cheap to create
+because everything expensive lives here.
+"""
+import os
+import json
+import queue
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, Optional, Tuple
+from models.data_models import PlatformConfig
+from utils.helpers import load_yaml_config
+
+logger = logging.getLogger(__name__)
+
+
+def config_hash(config: Dict[str, Any]) -> str:
+    """Stable hash of an agent configuration (role, goal, tools, ...)"""
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class AgentRegistry:
+    """
+    Configs, tools and agents shared by every crew in the process.
+
+    Configs and the tool dict are shared read-only; agents are leased so a crew has
+    exclusive use of its agents until it finishes.
+    """
+
+    def __init__(self, max_idle: Optional[int] = None):
+        self.max_idle = max_idle or PlatformConfig().max_concurrent_tasks
+        self._configs: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        self._tools: Optional[Dict[str, Any]] = None
+        self._agents: Dict[str, "queue.LifoQueue[Any]"] = {}
+        self._lock = threading.Lock()
+        self._tools_lock = threading.Lock()
+
+    def load_config(self, path: str) -> Dict[str, Any]:
+        """YAML config, parsed again only when the file's mtime or size changes (treat as read-only)"""
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+        with self._lock:
+            cached = self._configs.get(path)
+            if cached and cached[0] == version:
+                return cached[1]
+        config = load_yaml_config(path) or {}
+        with self._lock:
+            self._configs[path] = (version, config)
+        logger.debug(f"Loaded config {path}")
+        return config
+
+    def tools(self, build: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """The process-wide tool set, built by `build` on first use"""
+        with self._tools_lock:
+            if self._tools is None:
+                self._tools = build()
+            return self._tools
+
+    def _pool(self, key: str) -> "queue.LifoQueue[Any]":
+        with self._lock:
+            pool = self._agents.get(key)
+            if pool is None:
+                pool = self._agents[key] = queue.LifoQueue()
+            return pool
+
+    @contextmanager
+    def lease(self, config: Dict[str, Any], build: Callable[[], Any]) -> Iterator[Any]:
+        """
+        Exclusive use of an agent for `config` for the duration of the block: an idle one
+        built earlier for the same configuration hash, else a new one from `build`
+        """
+        key = config_hash(config)
+        pool = self._pool(key)
+        try:
+            agent = pool.get_nowait()
+        except queue.Empty:
+            agent = build()
+            logger.debug(f"Built agent {config.get('name', key)} ({key})")
+        try:
+            yield agent
+        finally:
+            if pool.qsize() < self.max_idle:
+                pool.put(agent)
+
+    def clear(self) -> None:
+        """Drop cached configs, tools and idle agents (they are rebuilt on next use)"""
+        with self._tools_lock, self._lock:
+            self._configs.clear()
+            self._agents.clear()
+            self._tools = None
+
+
+_registry: Optional[AgentRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_agent_registry() -> AgentRegistry:
+    """Process-wide agent registry, built on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = AgentRegistry()
+        return _registry
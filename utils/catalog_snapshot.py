@@ -0,0 +1,279 @@
+"""
+utils/catalog_snapshot.py
+Single, shared snapshot of a SQLite database catalog (tables, columns, indexes, foreign keys)
+built with the table-valued pragma functions in a handful of queries per database.
+"""
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Tuple
+from utils.change_detection import get_change_detector
+
+logger = logging.getLogger(__name__)
+
+_TABLES_SQL = "SELECT name, sql FROM sqlite_master WHERE type='table' ORDER BY rowid"
+
+_COLUMNS_SQL = """
+    SELECT m.name, p.cid, p.name, p.type, p."notnull", p.dflt_value, p.pk
+    FROM sqlite_master AS m
+    JOIN pragma_table_info(m.name) AS p
+    WHERE m.type = 'table'
+    ORDER BY m.name, p.cid
+"""
+
+_INDEXES_SQL = """
+    SELECT m.name, il.seq, il.name, il."unique", il.origin, il.partial, ii.seqno, ii.name
+    FROM sqlite_master AS m
+    JOIN pragma_index_list(m.name) AS il
+    LEFT JOIN pragma_index_info(il.name) AS ii
+    WHERE m.type = 'table'
+    ORDER BY m.name, il.seq, ii.seqno
+"""
+
+# aggregate=TRUE (SQLite >= 3.31) returns one row per b-tree instead of one per page
+_DBSTAT_AGGREGATE_SQL = "SELECT name, pgsize FROM dbstat WHERE aggregate = TRUE"
+_DBSTAT_SQL = "SELECT name, SUM(pgsize) FROM dbstat GROUP BY name"
+
+_FOREIGN_KEYS_SQL = """
+    SELECT m.name, fk.id, fk.seq, fk."table", fk."from", fk."to", fk.on_update, fk.on_delete, fk."match"
+    FROM sqlite_master AS m
+    JOIN pragma_foreign_key_list(m.name) AS fk
+    WHERE m.type = 'table'
+    ORDER BY m.name, fk.id, fk.seq
+"""
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of one database's catalog plus lazily cached row counts.
+
+    Column and foreign key rows keep the tuple layout of `PRAGMA table_info` and
+    `PRAGMA foreign_key_list`, so callers that previously issued those pragmas per table
+    can switch to the snapshot without changing their unpacking logic.
+    """
+
+    def __init__(self, db_path: str, tables: Dict[str, Optional[str]], columns: Dict[str, List[Tuple]],
+                 indexes: Dict[str, List[Dict[str, Any]]], foreign_keys: Dict[str, List[Tuple]]):
+        self.db_path = db_path
+        self._tables = tables
+        self._columns = columns
+        self._indexes = indexes
+        self._foreign_keys = foreign_keys
+        self._row_counts: Dict[str, int] = {}
+        self._storage_bytes: Optional[Dict[str, int]] = None
+        self._page_stats: Optional[Dict[str, int]] = None
+        self._stat1_rows: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def build(cls, conn: sqlite3.Connection, db_path: str = "") -> "CatalogSnapshot":
+        """Read the whole catalog with four queries"""
+        tables = {name: sql for name, sql in conn.execute(_TABLES_SQL).fetchall()}
+
+        columns: Dict[str, List[Tuple]] = {name: [] for name in tables}
+        for table, *col in conn.execute(_COLUMNS_SQL).fetchall():
+            columns.setdefault(table, []).append(tuple(col))
+
+        indexes: Dict[str, List[Dict[str, Any]]] = {name: [] for name in tables}
+        by_name: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        for table, _seq, index_name, unique, origin, partial, _seqno, column in conn.execute(_INDEXES_SQL).fetchall():
+            index = by_name.get((table, index_name))
+            if index is None:
+                index = {
+                    "name": index_name,
+                    "unique": bool(unique),
+                    "origin": origin,
+                    "partial": bool(partial),
+                    "columns": []
+                }
+                by_name[(table, index_name)] = index
+                indexes.setdefault(table, []).append(index)
+            if column is not None:
+                index["columns"].append(column)
+
+        foreign_keys: Dict[str, List[Tuple]] = {name: [] for name in tables}
+        for table, *fk in conn.execute(_FOREIGN_KEYS_SQL).fetchall():
+            foreign_keys.setdefault(table, []).append(tuple(fk))
+
+        logger.debug(f"📚 Catalog snapshot built for {db_path or 'connection'}: {len(tables)} tables")
+        return cls(db_path, tables, columns, indexes, foreign_keys)
+
+    @property
+    def table_names(self) -> List[str]:
+        return list(self._tables.keys())
+
+    def has_table(self, table_name: str) -> bool:
+        return table_name in self._tables
+
+    def create_sql(self, table_name: str) -> Optional[str]:
+        return self._tables.get(table_name)
+
+    def table_info(self, table_name: str) -> List[Tuple]:
+        """Rows shaped like `PRAGMA table_info`: (cid, name, type, notnull, dflt_value, pk)"""
+        return list(self._columns.get(table_name, []))
+
+    def indexes(self, table_name: str) -> List[Dict[str, Any]]:
+        """Indexes with their ordered column lists"""
+        return [dict(index, columns=list(index["columns"])) for index in self._indexes.get(table_name, [])]
+
+    def foreign_keys(self, table_name: str) -> List[Tuple]:
+        """Rows shaped like `PRAGMA foreign_key_list`: (id, seq, table, from, to, on_update, on_delete, match)"""
+        return list(self._foreign_keys.get(table_name, []))
+
+    def record_row_count(self, table_name: str, row_count: int) -> None:
+        """Share a row count another tool already paid for (e.g. a full table read)"""
+        with self._lock:
+            self._row_counts[table_name] = int(row_count)
+
+    def row_count(self, table_name: str, conn: Optional[sqlite3.Connection] = None) -> int:
+        """Exact row count, computed at most once per snapshot"""
+        with self._lock:
+            if table_name in self._row_counts:
+                return self._row_counts[table_name]
+
+        if not self.has_table(table_name):
+            raise sqlite3.OperationalError(f"no such table: {table_name}")
+
+        own_conn = conn is None
+        conn = conn or sqlite3.connect(self.db_path)
+        try:
+            count = conn.execute(f'SELECT COUNT(*) FROM "{table_name}"').fetchone()[0]
+        finally:
+            if own_conn:
+                conn.close()
+
+        self.record_row_count(table_name, count)
+        return count
+
+    def estimated_row_count(self, table_name: str, conn: Optional[sqlite3.Connection] = None) -> Optional[int]:
+        """
+        Row count estimate from `sqlite_stat1` (populated by ANALYZE), or None without statistics.
+        The first integer of each stat row is the number of rows in the table.
+        """
+        if self._stat1_rows is None:
+            stat1_rows: Dict[str, int] = {}
+            if self.has_table("sqlite_stat1"):
+                for table, stat in self._query("SELECT tbl, stat FROM sqlite_stat1", conn):
+                    try:
+                        stat1_rows[table] = max(stat1_rows.get(table, 0), int(str(stat).split()[0]))
+                    except (ValueError, IndexError):
+                        continue
+            with self._lock:
+                self._stat1_rows = stat1_rows
+        return self._stat1_rows.get(table_name)
+
+    def resolve_row_count(self, table_name: str, conn: Optional[sqlite3.Connection] = None,
+                          exact_count_threshold: Optional[int] = None) -> Tuple[int, str]:
+        """
+        Row count plus its source ("exact" or "sqlite_stat1").
+
+        When `exact_count_threshold` is set and statistics say the table is larger than it,
+        the O(1) statistics estimate is returned instead of running COUNT(*).
+        """
+        with self._lock:
+            if table_name in self._row_counts:
+                return self._row_counts[table_name], "exact"
+
+        if exact_count_threshold is not None:
+            estimate = self.estimated_row_count(table_name, conn)
+            if estimate is not None and estimate > exact_count_threshold:
+                return estimate, "sqlite_stat1"
+
+        return self.row_count(table_name, conn), "exact"
+
+    def storage_bytes(self, conn: Optional[sqlite3.Connection] = None) -> Optional[Dict[str, int]]:
+        """
+        Bytes used per b-tree (tables and indexes) from the `dbstat` virtual table.
+        Returns None when SQLite was compiled without SQLITE_ENABLE_DBSTAT_VTAB.
+        """
+        if self._storage_bytes is None:
+            sizes = None
+            for sql in (_DBSTAT_AGGREGATE_SQL, _DBSTAT_SQL):
+                try:
+                    sizes = {name: int(size or 0) for name, size in self._query(sql, conn)}
+                    break
+                except sqlite3.Error as e:
+                    logger.debug(f"dbstat query failed ({e}), trying fallback")
+            with self._lock:
+                self._storage_bytes = sizes if sizes is not None else {}
+        return self._storage_bytes or None
+
+    def page_stats(self, conn: Optional[sqlite3.Connection] = None) -> Dict[str, int]:
+        """Whole-database page size, page count and free pages"""
+        if self._page_stats is None:
+            page_size = self._query("PRAGMA page_size", conn)[0][0]
+            page_count = self._query("PRAGMA page_count", conn)[0][0]
+            freelist_count = self._query("PRAGMA freelist_count", conn)[0][0]
+            with self._lock:
+                self._page_stats = {
+                    "page_size": page_size,
+                    "page_count": page_count,
+                    "freelist_count": freelist_count,
+                    "database_bytes": page_size * page_count
+                }
+        return dict(self._page_stats)
+
+    def table_storage(self, table_name: str, conn: Optional[sqlite3.Connection] = None) -> Optional[Dict[str, Any]]:
+        """Measured table and index sizes in bytes for one table, or None without dbstat"""
+        sizes = self.storage_bytes(conn)
+        if sizes is None:
+            return None
+        index_bytes = {index["name"]: sizes.get(index["name"], 0) for index in self.indexes(table_name)}
+        return {
+            "table_bytes": sizes.get(table_name, 0),
+            "index_bytes": index_bytes,
+            "total_index_bytes": sum(index_bytes.values())
+        }
+
+    def _query(self, sql: str, conn: Optional[sqlite3.Connection] = None) -> List[Tuple]:
+        own_conn = conn is None
+        conn = conn or sqlite3.connect(self.db_path)
+        try:
+            return conn.execute(sql).fetchall()
+        finally:
+            if own_conn:
+                conn.close()
+
+
+_snapshot_cache: Dict[str, Tuple[Tuple, CatalogSnapshot]] = {}
+_snapshot_cache_lock = threading.Lock()
+
+
+def get_catalog_snapshot(db_path: str, conn: Optional[sqlite3.Connection] = None) -> CatalogSnapshot:
+    """
+    Return the shared snapshot for a database file, rebuilding it only when the change
+    detector reports a new file state, schema version or committed data version.
+
+    Args:
+        db_path: Path to the SQLite file (a `sqlite:///` prefix is tolerated)
+        conn: Optional open connection to reuse when the snapshot has to be (re)built
+    """
+    db_path = str(Path(db_path.replace("sqlite:///", "")).resolve())
+    signature = get_change_detector().signature(db_path)
+
+    with _snapshot_cache_lock:
+        cached = _snapshot_cache.get(db_path)
+        if cached and cached[0] == signature:
+            return cached[1]
+
+    own_conn = conn is None
+    conn = conn or sqlite3.connect(db_path)
+    try:
+        snapshot = CatalogSnapshot.build(conn, db_path)
+    finally:
+        if own_conn:
+            conn.close()
+
+    with _snapshot_cache_lock:
+        _snapshot_cache[db_path] = (signature, snapshot)
+    return snapshot
+
+
+def invalidate_catalog_snapshot(db_path: Optional[str] = None) -> None:
+    """Drop the cached snapshot for one database, or all of them"""
+    with _snapshot_cache_lock:
+        if db_path is None:
+            _snapshot_cache.clear()
+        else:
+            _snapshot_cache.pop(str(Path(db_path.replace("sqlite:///", "")).resolve()), None)
@@ -0,0 +1,282 @@
+"""
+utils/change_detection.py
+Change detection for SQLite sources: cheap database fingerprints (file size, mtime,
+PRAGMA schema_version / data_version), optional per-table content checksums and
+persisted per-consumer checkpoints, so repeat runs only reprocess what changed.
+"""
+import os
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, field, asdict
+from typing import Dict, List, Any, Optional, Tuple
+from models.data_models import PlatformConfig
+
+logger = logging.getLogger(__name__)
+
+CHECKSUM_BATCH_SIZE = 5000
+
+
+def normalize_db_path(db_path: str) -> str:
+    """Resolve a file path or `sqlite:///` URL to an absolute path used as cache key"""
+    return str(Path(db_path.replace("sqlite:///", "")).resolve())
+
+
+@dataclass
+class DatabaseFingerprint:
+    """Point-in-time identity of a database file"""
+    db_path: str
+    file_size: int
+    mtime_ns: int
+    wal_size: int
+    wal_mtime_ns: int
+    schema_version: int
+    data_version: int
+    table_checksums: Dict[str, str] = field(default_factory=dict)
+    created_at: str = field(default_factory=lambda: datetime.now().isoformat())
+
+    @property
+    def state_key(self) -> Tuple[int, int, int, int, int]:
+        """
+        Process-independent part of the fingerprint.
+        `data_version` is only comparable on the same connection, so it is left out here.
+        """
+        return (self.file_size, self.mtime_ns, self.wal_size, self.wal_mtime_ns, self.schema_version)
+
+    @property
+    def signature(self) -> Tuple[int, ...]:
+        """In-process cache key: state key plus the watch connection's data_version"""
+        return self.state_key + (self.data_version,)
+
+    @property
+    def digest(self) -> str:
+        """Short stable hash of the state key and table checksums"""
+        payload = json.dumps([self.state_key, sorted(self.table_checksums.items())])
+        return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:16]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "DatabaseFingerprint":
+        return cls(**{key: data[key] for key in cls.__dataclass_fields__ if key in data})
+
+
+def compute_table_checksum(conn: sqlite3.Connection, table_name: str) -> str:
+    """Content checksum of a table, streamed in batches in storage (rowid) order"""
+    digest = hashlib.blake2b(digest_size=16)
+    cursor = conn.execute(f'SELECT * FROM "{table_name}"')
+    while True:
+        rows = cursor.fetchmany(CHECKSUM_BATCH_SIZE)
+        if not rows:
+            break
+        digest.update(repr(rows).encode("utf-8"))
+    return digest.hexdigest()
+
+
+class ChangeDetector:
+    """
+    Fingerprints databases and remembers, per consumer (e.g. "discovery", "profiling",
+    "reports"), which fingerprint each database/table was last processed at.
+
+    A watch connection is kept open per database so `PRAGMA data_version` detects commits
+    made by other connections, including WAL-mode commits that do not touch the main file.
+    """
+
+    def __init__(self, state_path: Optional[str] = None):
+        if state_path is None:
+            state_path = str(Path(PlatformConfig().data_catalog_path) / "fingerprints.json")
+        self.state_path = Path(state_path)
+        self._watch_connections: Dict[str, Tuple[Tuple[int, int], sqlite3.Connection]] = {}
+        self._state: Optional[Dict[str, Any]] = None
+        self._lock = threading.RLock()
+
+    # ------------------------------------------------------------------
+    # Fingerprinting
+    # ------------------------------------------------------------------
+
+    def _watch_connection(self, db_path: str) -> sqlite3.Connection:
+        """Long-lived read-only connection; reopened when the file is replaced"""
+        stat = os.stat(db_path)
+        identity = (stat.st_dev, stat.st_ino)
+        cached = self._watch_connections.get(db_path)
+        if cached and cached[0] == identity:
+            return cached[1]
+        if cached:
+            cached[1].close()
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True, check_same_thread=False)
+        self._watch_connections[db_path] = (identity, conn)
+        return conn
+
+    def fingerprint(self, db_path: str, include_table_checksums: bool = False,
+                    tables: Optional[List[str]] = None) -> DatabaseFingerprint:
+        """
+        Fingerprint a database. Table checksums scan the data, so they are opt-in and
+        can be restricted to specific tables.
+        """
+        db_path = normalize_db_path(db_path)
+        with self._lock:
+            conn = self._watch_connection(db_path)
+            stat = os.stat(db_path)
+            wal_path = f"{db_path}-wal"
+            wal_stat = os.stat(wal_path) if os.path.exists(wal_path) else None
+
+            fingerprint = DatabaseFingerprint(
+                db_path=db_path,
+                file_size=stat.st_size,
+                mtime_ns=stat.st_mtime_ns,
+                wal_size=wal_stat.st_size if wal_stat else 0,
+                wal_mtime_ns=wal_stat.st_mtime_ns if wal_stat else 0,
+                schema_version=conn.execute("PRAGMA schema_version").fetchone()[0],
+                data_version=conn.execute("PRAGMA data_version").fetchone()[0]
+            )
+
+            if include_table_checksums:
+                if tables is None:
+                    tables = [row[0] for row in conn.execute(
+                        "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+                    )]
+                for table in tables:
+                    try:
+                        fingerprint.table_checksums[table] = compute_table_checksum(conn, table)
+                    except sqlite3.Error as e:
+                        logger.warning(f"⚠️ Could not checksum table {table}: {e}")
+
+        return fingerprint
+
+    def signature(self, db_path: str) -> Tuple[int, ...]:
+        """Cheap in-process cache key for a database (no table scans)"""
+        return self.fingerprint(db_path).signature
+
+    # ------------------------------------------------------------------
+    # Persisted checkpoints
+    # ------------------------------------------------------------------
+
+    def _load_state(self) -> Dict[str, Any]:
+        if self._state is None:
+            try:
+                self._state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                self._state = {}
+            except (OSError, ValueError) as e:
+                logger.warning(f"⚠️ Could not read change detection state {self.state_path}: {e}")
+                self._state = {}
+        return self._state
+
+    def _save_state(self) -> None:
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.state_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps(self._state, indent=2), encoding="utf-8")
+        os.replace(tmp_path, self.state_path)
+
+    def last_fingerprint(self, db_path: str, consumer: str) -> Optional[DatabaseFingerprint]:
+        """Fingerprint stored by the last `mark_processed` call for this consumer"""
+        with self._lock:
+            data = self._load_state().get(consumer, {}).get(normalize_db_path(db_path))
+        return DatabaseFingerprint.from_dict(data) if data else None
+
+    def has_changed(self, db_path: str, consumer: str) -> bool:
+        """True when the database changed (or was never processed) since the consumer's checkpoint"""
+        previous = self.last_fingerprint(db_path, consumer)
+        if previous is None:
+            return True
+        return self.fingerprint(db_path).state_key != previous.state_key
+
+    def changed_tables(self, db_path: str, tables: List[str], consumer: str) -> List[str]:
+        """
+        Tables whose content changed since the consumer's checkpoint.
+
+        An untouched file short-circuits to no changes without scanning anything; otherwise
+        only the requested tables are checksummed and compared. Tables found unchanged are
+        checkpointed at the new file state, so the next run skips them without a rescan.
+        """
+        previous = self.last_fingerprint(db_path, consumer)
+        if previous is None:
+            return list(tables)
+
+        current = self.fingerprint(db_path)
+        if current.state_key == previous.state_key:
+            return [table for table in tables if table not in previous.table_checksums]
+
+        current = self.fingerprint(db_path, include_table_checksums=True, tables=tables)
+        changed = [
+            table for table in tables
+            if table not in current.table_checksums
+            or current.table_checksums[table] != previous.table_checksums.get(table)
+        ]
+        unchanged = {table: current.table_checksums[table] for table in tables if table not in changed}
+        if unchanged:
+            current.table_checksums = unchanged
+            self._save_checkpoint(normalize_db_path(db_path), consumer, current, {})
+        return changed
+
+    def mark_processed(self, db_path: str, consumer: str, tables: Optional[List[str]] = None) -> DatabaseFingerprint:
+        """
+        Record that the consumer processed the database (and optionally these tables)
+        at its current state. Checksums of previously recorded tables are kept only while
+        the file is untouched; after a change, only the tables marked now are recorded.
+        """
+        db_path = normalize_db_path(db_path)
+        previous = self.last_fingerprint(db_path, consumer)
+        fingerprint = self.fingerprint(db_path)
+        # A checksum taken at another state may describe content the consumer never saw, so it is not carried forward
+        known = previous.table_checksums if previous and previous.state_key == fingerprint.state_key else {}
+
+        if tables:
+            to_scan = [table for table in tables if table not in known]
+            if to_scan:
+                fingerprint.table_checksums = self.fingerprint(
+                    db_path, include_table_checksums=True, tables=to_scan
+                ).table_checksums
+        return self._save_checkpoint(db_path, consumer, fingerprint, known)
+
+    def _save_checkpoint(self, db_path: str, consumer: str, fingerprint: DatabaseFingerprint,
+                         known: Dict[str, str]) -> DatabaseFingerprint:
+        """Store a checkpoint with the fingerprint's checksums on top of `known` ones from the same state"""
+        with self._lock:
+            state = self._load_state()
+            # Re-read under the lock: concurrent workers checkpoint other tables of the same database,
+            # whose checksums are only merged when they were taken at this same state of the file
+            latest = state.get(consumer, {}).get(db_path)
+            if latest and DatabaseFingerprint.from_dict(latest).state_key == fingerprint.state_key:
+                known = {**known, **latest.get("table_checksums", {})}
+            fingerprint.table_checksums = {**known, **fingerprint.table_checksums}
+            state.setdefault(consumer, {})[db_path] = fingerprint.to_dict()
+            self._save_state()
+        logger.debug(f"🧬 Checkpoint saved for {consumer} on {db_path} ({fingerprint.digest})")
+        return fingerprint
+
+    def forget(self, db_path: Optional[str] = None, consumer: Optional[str] = None) -> None:
+        """Drop checkpoints so the next run reprocesses everything"""
+        with self._lock:
+            state = self._load_state()
+            consumers = [consumer] if consumer else list(state.keys())
+            for name in consumers:
+                if db_path is None:
+                    state.pop(name, None)
+                else:
+                    state.get(name, {}).pop(normalize_db_path(db_path), None)
+            self._save_state()
+
+    def close(self) -> None:
+        with self._lock:
+            for _, conn in self._watch_connections.values():
+                conn.close()
+            self._watch_connections.clear()
+
+
+_detector: Optional[ChangeDetector] = None
+_detector_lock = threading.Lock()
+
+
+def get_change_detector() -> ChangeDetector:
+    """Process-wide change detector"""
+    global _detector
+    with _detector_lock:
+        if _detector is None:
+            _detector = ChangeDetector()
+        return _detector
@@ -0,0 +1,243 @@
+"""
+utils/chart_rendering.py
+Chart rendering for report sections. A section's template visualization (bar_chart,
+line_chart, pie_chart, scatter_plot) is turned into a chart spec over its rows and drawn
+with matplotlib (optional dependency) on a single background worker, so reports are
+returned without waiting for charts. Rendered files are cached under the results folder,
+keyed by a hash of the section rows plus the chart spec; repeated views and exports reuse
+them and never render twice.
+"""
+import os
+import json
+import hashlib
+import logging
+import tempfile
+import threading
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
+from models.data_models import PlatformConfig
+
+try:
+    from matplotlib.figure import Figure
+    MATPLOTLIB_AVAILABLE = True
+except ImportError:
+    Figure = None
+    MATPLOTLIB_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+CHARTS_DIRNAME = "charts"
+CHART_KINDS = ("bar_chart", "line_chart", "pie_chart", "scatter_plot")
+CHART_FORMATS = ("svg", "png")
+
+# Bumped whenever the drawing code changes, so cached charts are redrawn
+_RENDERER_VERSION = 1
+# Categories drawn per bar/pie chart and numeric series per chart; the rest is left to the table
+MAX_CATEGORIES = 30
+MAX_SERIES = 3
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def chart_spec(section: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    {"kind", "title", "x", "y"} for a section whose visualization can be drawn from its
+    rows, else None (no rows, unsupported visualization such as map/table, no numbers,
+    a pie chart without positive values).
+    `x` is the first non-numeric column (None: row order), `y` the numeric columns.
+    """
+    kind = section.get("visualization")
+    rows = section.get("content")
+    if kind not in CHART_KINDS or not isinstance(rows, list) or not rows or not isinstance(rows[0], dict):
+        return None
+
+    columns = list(rows[0].keys())
+    numeric = [
+        column for column in columns
+        if all(_is_number(row.get(column)) or row.get(column) is None for row in rows)
+        and any(_is_number(row.get(column)) for row in rows)
+    ]
+    labels = [column for column in columns if column not in numeric]
+
+    if kind == "scatter_plot":
+        if len(numeric) < 2:
+            return None
+        return {"kind": kind, "title": section.get("title"), "x": numeric[0], "y": numeric[1:2]}
+    if not numeric:
+        return None
+    # Pie wedges need at least one positive value (draw_chart drops the others)
+    if kind == "pie_chart" and not any(_is_number(row.get(numeric[0])) and row.get(numeric[0]) > 0
+                                       for row in rows[:MAX_CATEGORIES]):
+        return None
+    return {
+        "kind": kind,
+        "title": section.get("title"),
+        "x": labels[0] if labels else None,
+        "y": numeric[:1] if kind == "pie_chart" else numeric[:MAX_SERIES]
+    }
+
+
+def chart_key(rows: List[Dict[str, Any]], spec: Dict[str, Any]) -> str:
+    """Cache key of a chart: the section data plus the spec it is drawn with"""
+    payload = json.dumps({"rows": rows, "spec": spec, "v": _RENDERER_VERSION}, sort_keys=True, default=str)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:24]
+
+
+def draw_chart(rows: List[Dict[str, Any]], spec: Dict[str, Any]) -> "Figure":
+    """Matplotlib figure for a chart spec (object API only, safe off the main thread)"""
+    figure = Figure(figsize=(8, 4.5), dpi=100)
+    ax = figure.subplots()
+    kind, x, series = spec["kind"], spec["x"], spec["y"]
+
+    if kind == "scatter_plot":
+        points = [(row.get(x), row.get(series[0])) for row in rows]
+        points = [(a, b) for a, b in points if a is not None and b is not None]
+        ax.scatter([a for a, _ in points], [b for _, b in points], s=14, alpha=0.7)
+        ax.set_xlabel(x)
+        ax.set_ylabel(series[0])
+    else:
+        if kind == "line_chart" and x:
+            rows = sorted(rows, key=lambda row: str(row.get(x)))
+        elif kind != "line_chart":
+            rows = rows[:MAX_CATEGORIES]
+        labels = [str(row.get(x)) if x else str(i + 1) for i, row in enumerate(rows)]
+
+        if kind == "pie_chart":
+            slices = [(label, row.get(series[0])) for label, row in zip(labels, rows)]
+            slices = [(label, value) for label, value in slices if value is not None and value > 0]
+            ax.pie([value for _, value in slices], labels=[label for label, _ in slices],
+                   autopct="%1.1f%%", textprops={"fontsize": 8})
+            ax.axis("equal")
+        else:
+            positions = range(len(rows))
+            width = 0.8 / len(series)
+            for i, column in enumerate(series):
+                values = [row.get(column) if row.get(column) is not None else float("nan") for row in rows]
+                if kind == "line_chart":
+                    ax.plot(positions, values, marker="o", markersize=3, label=column)
+                else:
+                    ax.bar([p + i * width - 0.4 + width / 2 for p in positions], values, width=width, label=column)
+            ax.set_xticks(list(positions))
+            ax.set_xticklabels(labels, rotation=45, ha="right", fontsize=8)
+            if x:
+                ax.set_xlabel(x)
+            if len(series) > 1:
+                ax.legend(fontsize=8)
+            else:
+                ax.set_ylabel(series[0])
+
+    if spec.get("title"):
+        ax.set_title(spec["title"])
+    figure.tight_layout()
+    return figure
+
+
+class ChartRenderer:
+    """
+    Renders section charts on a single background worker into a keyed file cache.
+
+    A chart that is already cached resolves immediately; concurrent requests for the same
+    chart share one rendering.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None, fmt: str = "svg"):
+        if fmt not in CHART_FORMATS:
+            raise ValueError(f"Unsupported chart format '{fmt}'; expected one of {CHART_FORMATS}")
+        if cache_dir is None:
+            cache_dir = str(Path(PlatformConfig().results_path) / CHARTS_DIRNAME)
+        self.cache_dir = Path(cache_dir)
+        self.fmt = fmt
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="chart-rendering")
+        self._pending: Dict[str, "Future[Optional[str]]"] = {}
+        self._lock = threading.Lock()
+
+    def chart_path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.{self.fmt}"
+
+    def cached(self, section: Dict[str, Any]) -> Optional[str]:
+        """Path of the section's chart if it was rendered already (never renders)"""
+        spec = chart_spec(section)
+        if spec is None:
+            return None
+        path = self.chart_path(chart_key(section["content"], spec))
+        return str(path) if path.exists() else None
+
+    def render(self, section: Dict[str, Any]) -> Optional[str]:
+        """Path of the section's chart, rendering it unless cached (blocking); None without a chart"""
+        spec = chart_spec(section)
+        if spec is None or not MATPLOTLIB_AVAILABLE:
+            return None
+        path = self.chart_path(chart_key(section["content"], spec))
+        if path.exists():
+            return str(path)
+
+        figure = draw_chart(section["content"], spec)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Write then rename, so readers never see a half-written chart
+        fd, tmp_path = tempfile.mkstemp(dir=path.parent, suffix=f".{self.fmt}")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                figure.savefig(f, format=self.fmt)
+            os.replace(tmp_path, path)
+        except Exception:
+            Path(tmp_path).unlink(missing_ok=True)
+            raise
+        logger.debug(f"📊 Rendered {spec['kind']} for {spec.get('title')} -> {path.name}")
+        return str(path)
+
+    def submit(self, section: Dict[str, Any]) -> "Future[Optional[str]]":
+        """Future resolving to the section's chart path (None when it has no chart)"""
+        spec = chart_spec(section) if MATPLOTLIB_AVAILABLE else None
+        if spec is None:
+            future: "Future[Optional[str]]" = Future()
+            future.set_result(None)
+            return future
+
+        key = chart_key(section["content"], spec)
+        if self.chart_path(key).exists():
+            future = Future()
+            future.set_result(str(self.chart_path(key)))
+            return future
+
+        with self._lock:
+            future = self._pending.get(key)
+            if future is not None:
+                return future
+            future = self._executor.submit(self.render, section)
+            self._pending[key] = future
+        # Outside the lock: the callback runs right away if rendering already finished
+        future.add_done_callback(lambda _, key=key: self._forget(key))
+        return future
+
+    def _forget(self, key: str) -> None:
+        with self._lock:
+            self._pending.pop(key, None)
+
+    def submit_report(self, report: Dict[str, Any]) -> Dict[str, "Future[Optional[str]]"]:
+        """Queue charts for every chartable section of a report; {section title: future}"""
+        if not MATPLOTLIB_AVAILABLE:
+            logger.info("matplotlib is not installed; report charts are skipped")
+            return {}
+        futures = {
+            section.get("title", f"Section {i + 1}"): self.submit(section)
+            for i, section in enumerate(report.get("sections", []))
+            if chart_spec(section) is not None
+        }
+        logger.info(f"📊 Queued {len(futures)} charts for {report.get('report_title', 'report')}")
+        return futures
+
+
+_renderer: Optional[ChartRenderer] = None
+_renderer_lock = threading.Lock()
+
+
+def get_chart_renderer() -> ChartRenderer:
+    """Process-wide chart renderer"""
+    global _renderer
+    with _renderer_lock:
+        if _renderer is None:
+            _renderer = ChartRenderer()
+        return _renderer
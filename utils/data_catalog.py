@@ -0,0 +1,509 @@
+"""
+utils/data_catalog.py
+Persistent, SQLite-backed data catalog stored at PlatformConfig.data_catalog_path.
+Holds table schemas/metadata, column profiles, quality scores, FK hints, discovery
+results and run history, keyed by database fingerprint, table and column.
+All writes are serialized through one writer thread; reads use per-thread WAL connections.
+"""
+import json
+import queue
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional, Callable
+from models.data_models import PlatformConfig
+from utils.change_detection import normalize_db_path
+
+logger = logging.getLogger(__name__)
+
+CATALOG_FILENAME = "catalog.db"
+WRITE_BATCH_SIZE = 100
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS databases (
+    db_path TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    fingerprint_json TEXT,
+    last_seen TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS table_schemas (
+    db_path TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    options_hash TEXT NOT NULL,
+    row_count INTEGER,
+    column_count INTEGER,
+    size_mb REAL,
+    creation_sql TEXT,
+    metadata_json TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (db_path, table_name)
+);
+
+CREATE TABLE IF NOT EXISTS table_profiles (
+    db_path TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    profile_json TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (db_path, table_name)
+);
+
+CREATE TABLE IF NOT EXISTS column_profiles (
+    db_path TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    data_type TEXT,
+    semantic_type TEXT,
+    null_percentage REAL,
+    unique_count INTEGER,
+    quality_score REAL,
+    profile_json TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (db_path, table_name, column_name)
+);
+
+CREATE TABLE IF NOT EXISTS quality_scores (
+    db_path TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    source TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    overall_score REAL,
+    details_json TEXT,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (db_path, table_name, source)
+);
+
+CREATE TABLE IF NOT EXISTS fk_hints (
+    db_path TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    column_name TEXT NOT NULL,
+    referenced_table TEXT,
+    confidence TEXT,
+    fingerprint TEXT NOT NULL,
+    PRIMARY KEY (db_path, table_name, column_name)
+);
+
+CREATE TABLE IF NOT EXISTS discovery_results (
+    db_path TEXT NOT NULL,
+    table_name TEXT NOT NULL,
+    result_json TEXT NOT NULL,
+    updated_at TEXT NOT NULL,
+    PRIMARY KEY (db_path, table_name)
+);
+
+CREATE TABLE IF NOT EXISTS run_history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    phase TEXT NOT NULL,
+    db_path TEXT,
+    table_name TEXT,
+    status TEXT NOT NULL,
+    started_at TEXT NOT NULL,
+    finished_at TEXT,
+    duration_seconds REAL,
+    details_json TEXT
+);
+
+CREATE TABLE IF NOT EXISTS query_log (
+    db_path TEXT NOT NULL,
+    sql_text TEXT NOT NULL,
+    source TEXT NOT NULL,
+    executions INTEGER NOT NULL DEFAULT 0,
+    total_ms REAL NOT NULL DEFAULT 0,
+    last_rows INTEGER,
+    last_executed_at TEXT NOT NULL,
+    PRIMARY KEY (db_path, sql_text, source)
+);
+
+CREATE TABLE IF NOT EXISTS statistics_refreshes (
+    db_path TEXT PRIMARY KEY,
+    fingerprint TEXT NOT NULL,
+    refreshed_at TEXT NOT NULL,
+    method TEXT,
+    analysis_limit INTEGER,
+    tables_analyzed INTEGER,
+    duration_ms REAL
+);
+
+CREATE INDEX IF NOT EXISTS idx_run_history_target ON run_history (db_path, table_name, phase);
+CREATE INDEX IF NOT EXISTS idx_table_schemas_fingerprint ON table_schemas (fingerprint);
+CREATE INDEX IF NOT EXISTS idx_column_profiles_column ON column_profiles (column_name);
+"""
+
+
+def _json_default(value: Any) -> Any:
+    """Serialize numpy scalars as plain numbers, everything else as text"""
+    if hasattr(value, "item"):
+        return value.item()
+    return str(value)
+
+
+def _to_json(value: Any) -> str:
+    return json.dumps(value, default=_json_default)
+
+
+def _scalar(value: Any) -> Any:
+    """Plain Python value that sqlite3 can bind"""
+    return value.item() if hasattr(value, "item") else value
+
+
+def options_hash(**options: Any) -> str:
+    """Stable hash of the tool options a cached result was computed with"""
+    return hashlib.sha1(json.dumps(options, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:12]
+
+
+class DataCatalog:
+    """
+    Catalog database with a single writer thread.
+
+    Write methods enqueue work and return immediately; call `flush()` when a subsequent
+    read must observe the write. Cached-fact reads return None for unknown entries, when
+    a fingerprint no longer matches (the fact is stale) and when caching is disabled.
+    """
+
+    def __init__(self, catalog_path: Optional[str] = None, cache_enabled: Optional[bool] = None):
+        config = PlatformConfig()
+        if catalog_path is None:
+            catalog_path = str(Path(config.data_catalog_path) / CATALOG_FILENAME)
+        self.cache_enabled = config.cache_enabled if cache_enabled is None else cache_enabled
+        self.catalog_path = Path(catalog_path)
+        self.catalog_path.parent.mkdir(parents=True, exist_ok=True)
+
+        conn = sqlite3.connect(self.catalog_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA_SQL)
+            conn.commit()
+        finally:
+            conn.close()
+
+        self._queue: "queue.Queue[Optional[Callable[[sqlite3.Connection], None]]]" = queue.Queue()
+        self._local = threading.local()
+        self._writer = threading.Thread(target=self._writer_loop, name="data-catalog-writer", daemon=True)
+        self._writer.start()
+
+    # ------------------------------------------------------------------
+    # Writer thread
+    # ------------------------------------------------------------------
+
+    def _writer_loop(self) -> None:
+        conn = sqlite3.connect(self.catalog_path)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        while True:
+            job = self._queue.get()
+            batch = [job]
+            # Group whatever is already queued into one transaction
+            while len(batch) < WRITE_BATCH_SIZE:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+
+            stop = False
+            try:
+                with conn:
+                    for item in batch:
+                        if item is None:
+                            stop = True
+                        elif isinstance(item, threading.Event):
+                            continue
+                        else:
+                            try:
+                                item(conn)
+                            except sqlite3.Error as e:
+                                logger.error(f"❌ Data catalog write failed: {e}")
+            except Exception as e:
+                logger.error(f"❌ Data catalog commit failed: {e}")
+            finally:
+                for item in batch:
+                    if isinstance(item, threading.Event):
+                        item.set()
+                    self._queue.task_done()
+            if stop:
+                conn.close()
+                return
+
+    def _submit(self, job: Callable[[sqlite3.Connection], None]) -> None:
+        self._queue.put(job)
+
+    def flush(self, timeout: Optional[float] = 10.0) -> bool:
+        """Block until every write queued so far is committed"""
+        done = threading.Event()
+        self._queue.put(done)
+        return done.wait(timeout)
+
+    def close(self) -> None:
+        self._queue.put(None)
+        self._writer.join(timeout=10)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+
+    def _reader(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.catalog_path)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA query_only=1")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def _fetch_json(self, sql: str, params: tuple, column: str) -> Optional[Any]:
+        if not self.cache_enabled:
+            return None
+        row = self._reader().execute(sql, params).fetchone()
+        return json.loads(row[column]) if row else None
+
+    # ------------------------------------------------------------------
+    # Databases
+    # ------------------------------------------------------------------
+
+    def record_database(self, db_path: str, fingerprint: Any) -> None:
+        """Store the latest fingerprint seen for a database (DatabaseFingerprint)"""
+        db_path = normalize_db_path(db_path)
+        payload = _to_json(fingerprint.to_dict())
+        now = datetime.now().isoformat()
+        self._submit(lambda conn: conn.execute(
+            "INSERT OR REPLACE INTO databases (db_path, fingerprint, fingerprint_json, last_seen) VALUES (?, ?, ?, ?)",
+            (db_path, fingerprint.digest, payload, now)
+        ))
+
+    # ------------------------------------------------------------------
+    # Metadata extraction
+    # ------------------------------------------------------------------
+
+    def record_table_metadata(self, db_path: str, fingerprint: str, metadata: Dict[str, Any],
+                              options: str = "") -> None:
+        """Store MetadataExtractionTool output plus its FK hints and quality score"""
+        db_path = normalize_db_path(db_path)
+        table_name = metadata["table_name"]
+        basic_info = metadata.get("basic_info", {})
+        quality = metadata.get("data_quality", {})
+        fk_hints = metadata.get("relationships", {}).get("foreign_key_hints", [])
+        payload = _to_json(metadata)
+        now = datetime.now().isoformat()
+
+        def write(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                """INSERT OR REPLACE INTO table_schemas
+                   (db_path, table_name, fingerprint, options_hash, row_count, column_count, size_mb,
+                    creation_sql, metadata_json, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (db_path, table_name, fingerprint, options, _scalar(basic_info.get("row_count")),
+                 basic_info.get("column_count"), _scalar(basic_info.get("estimated_size_mb")),
+                 basic_info.get("creation_sql"), payload, now)
+            )
+            conn.execute("DELETE FROM fk_hints WHERE db_path = ? AND table_name = ?", (db_path, table_name))
+            conn.executemany(
+                """INSERT OR REPLACE INTO fk_hints
+                   (db_path, table_name, column_name, referenced_table, confidence, fingerprint)
+                   VALUES (?, ?, ?, ?, ?, ?)""",
+                [(db_path, table_name, hint.get("column"), hint.get("referenced_table"),
+                  hint.get("confidence"), fingerprint) for hint in fk_hints if hint.get("column")]
+            )
+            conn.execute(
+                """INSERT OR REPLACE INTO quality_scores
+                   (db_path, table_name, source, fingerprint, overall_score, details_json, updated_at)
+                   VALUES (?, ?, 'metadata', ?, ?, ?, ?)""",
+                (db_path, table_name, fingerprint, _scalar(quality.get("overall_score")),
+                 _to_json(quality), now)
+            )
+
+        self._submit(write)
+
+    def get_table_metadata(self, db_path: str, table_name: str, fingerprint: str,
+                           options: str = "") -> Optional[Dict[str, Any]]:
+        """Stored metadata when it was computed at this fingerprint with the same options"""
+        return self._fetch_json(
+            """SELECT metadata_json FROM table_schemas
+               WHERE db_path = ? AND table_name = ? AND fingerprint = ? AND options_hash = ?""",
+            (normalize_db_path(db_path), table_name, fingerprint, options),
+            "metadata_json"
+        )
+
+    # ------------------------------------------------------------------
+    # Profiling
+    # ------------------------------------------------------------------
+
+    def record_table_profile(self, db_path: str, fingerprint: str, profile: Dict[str, Any]) -> None:
+        """Store DataProfilingTool output, split into per-column rows"""
+        db_path = normalize_db_path(db_path)
+        table_name = profile["table_name"]
+        payload = _to_json(profile)
+        now = datetime.now().isoformat()
+        column_rows = [
+            (db_path, table_name, column, fingerprint, col.get("data_type"), col.get("semantic_type"),
+             _scalar(col.get("null_percentage")), _scalar(col.get("unique_count")), _scalar(col.get("quality_score")),
+             _to_json(col), now)
+            for column, col in profile.get("column_profiles", {}).items()
+        ]
+
+        def write(conn: sqlite3.Connection) -> None:
+            conn.execute(
+                """INSERT OR REPLACE INTO table_profiles (db_path, table_name, fingerprint, profile_json, updated_at)
+                   VALUES (?, ?, ?, ?, ?)""",
+                (db_path, table_name, fingerprint, payload, now)
+            )
+            conn.execute("DELETE FROM column_profiles WHERE db_path = ? AND table_name = ?", (db_path, table_name))
+            conn.executemany(
+                """INSERT INTO column_profiles
+                   (db_path, table_name, column_name, fingerprint, data_type, semantic_type,
+                    null_percentage, unique_count, quality_score, profile_json, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                column_rows
+            )
+            conn.execute(
+                """INSERT OR REPLACE INTO quality_scores
+                   (db_path, table_name, source, fingerprint, overall_score, details_json, updated_at)
+                   VALUES (?, ?, 'profiling', ?, ?, ?, ?)""",
+                (db_path, table_name, fingerprint, _scalar(profile.get("table_quality_score")),
+                 _to_json({"quality_issues": profile.get("quality_issues", [])}), now)
+            )
+
+        self._submit(write)
+
+    def get_table_profile(self, db_path: str, table_name: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """Stored profile when it was computed at this fingerprint"""
+        return self._fetch_json(
+            "SELECT profile_json FROM table_profiles WHERE db_path = ? AND table_name = ? AND fingerprint = ?",
+            (normalize_db_path(db_path), table_name, fingerprint),
+            "profile_json"
+        )
+
+    def get_column_profiles(self, db_path: str, table_name: str) -> List[Dict[str, Any]]:
+        rows = self._reader().execute(
+            """SELECT column_name, data_type, semantic_type, null_percentage, unique_count, quality_score, updated_at
+               FROM column_profiles WHERE db_path = ? AND table_name = ? ORDER BY column_name""",
+            (normalize_db_path(db_path), table_name)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    # ------------------------------------------------------------------
+    # Discovery results and run history
+    # ------------------------------------------------------------------
+
+    def record_discovery_result(self, db_path: str, table_name: str, result: Dict[str, Any]) -> None:
+        db_path = normalize_db_path(db_path)
+        payload = _to_json(result)
+        now = datetime.now().isoformat()
+        self._submit(lambda conn: conn.execute(
+            "INSERT OR REPLACE INTO discovery_results (db_path, table_name, result_json, updated_at) VALUES (?, ?, ?, ?)",
+            (db_path, table_name, payload, now)
+        ))
+
+    def get_discovery_result(self, db_path: str, table_name: str) -> Optional[Dict[str, Any]]:
+        return self._fetch_json(
+            "SELECT result_json FROM discovery_results WHERE db_path = ? AND table_name = ?",
+            (normalize_db_path(db_path), table_name),
+            "result_json"
+        )
+
+    def record_run(self, phase: str, status: str, started_at: datetime, finished_at: Optional[datetime] = None,
+                   db_path: Optional[str] = None, table_name: Optional[str] = None,
+                   details: Optional[Dict[str, Any]] = None) -> None:
+        """Append one entry to the run history"""
+        finished_at = finished_at or datetime.now()
+        row = (
+            phase,
+            normalize_db_path(db_path) if db_path else None,
+            table_name,
+            status,
+            started_at.isoformat(),
+            finished_at.isoformat(),
+            round((finished_at - started_at).total_seconds(), 3),
+            _to_json(details) if details else None
+        )
+        self._submit(lambda conn: conn.execute(
+            """INSERT INTO run_history
+               (phase, db_path, table_name, status, started_at, finished_at, duration_seconds, details_json)
+               VALUES (?, ?, ?, ?, ?, ?, ?, ?)""",
+            row
+        ))
+
+    def record_statistics_refresh(self, db_path: str, fingerprint: str, refresh: Dict[str, Any]) -> None:
+        row = (normalize_db_path(db_path), fingerprint, refresh["refreshed_at"], refresh.get("method"),
+               refresh.get("analysis_limit"), refresh.get("tables_analyzed"), refresh.get("duration_ms"))
+        self._submit(lambda conn: conn.execute(
+            """INSERT OR REPLACE INTO statistics_refreshes
+               (db_path, fingerprint, refreshed_at, method, analysis_limit, tables_analyzed, duration_ms)
+               VALUES (?, ?, ?, ?, ?, ?, ?)""",
+            row
+        ))
+
+    def get_statistics_refresh(self, db_path: str) -> Optional[Dict[str, Any]]:
+        """Latest optimizer statistics refresh (not subject to CACHE_ENABLED)"""
+        row = self._reader().execute(
+            "SELECT * FROM statistics_refreshes WHERE db_path = ?", (normalize_db_path(db_path),)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def record_query(self, db_path: str, sql: str, source: str, duration_ms: float,
+                     row_count: Optional[int] = None) -> None:
+        """Log an executed statement so workload-driven tools can replay it"""
+        row = (normalize_db_path(db_path), sql.strip(), source, float(duration_ms), row_count, datetime.now().isoformat())
+        self._submit(lambda conn: conn.execute(
+            """INSERT INTO query_log (db_path, sql_text, source, executions, total_ms, last_rows, last_executed_at)
+               VALUES (?, ?, ?, 1, ?, ?, ?)
+               ON CONFLICT (db_path, sql_text, source) DO UPDATE SET
+                   executions = executions + 1,
+                   total_ms = total_ms + excluded.total_ms,
+                   last_rows = excluded.last_rows,
+                   last_executed_at = excluded.last_executed_at""",
+            row
+        ))
+
+    def logged_queries(self, db_path: str, source: Optional[str] = None, limit: int = 200) -> List[Dict[str, Any]]:
+        """Most frequently executed statements for a database (not subject to CACHE_ENABLED)"""
+        sql = """SELECT sql_text, source, executions, total_ms, last_executed_at FROM query_log
+                 WHERE db_path = ?"""
+        params: list = [normalize_db_path(db_path)]
+        if source:
+            sql += " AND source = ?"
+            params.append(source)
+        sql += " ORDER BY executions DESC, total_ms DESC LIMIT ?"
+        params.append(limit)
+        return [dict(row) for row in self._reader().execute(sql, params).fetchall()]
+
+    def recent_runs(self, limit: int = 50) -> List[Dict[str, Any]]:
+        rows = self._reader().execute(
+            """SELECT phase, db_path, table_name, status, started_at, duration_seconds
+               FROM run_history ORDER BY id DESC LIMIT ?""",
+            (limit,)
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+    def table_overview(self) -> List[Dict[str, Any]]:
+        """One row per catalogued table with size, row count and latest quality scores"""
+        rows = self._reader().execute(
+            """SELECT s.db_path, s.table_name, s.row_count, s.column_count, s.size_mb,
+                      qm.overall_score AS metadata_quality, qp.overall_score AS profiling_quality,
+                      s.updated_at
+               FROM table_schemas AS s
+               LEFT JOIN quality_scores AS qm
+                    ON qm.db_path = s.db_path AND qm.table_name = s.table_name AND qm.source = 'metadata'
+               LEFT JOIN quality_scores AS qp
+                    ON qp.db_path = s.db_path AND qp.table_name = s.table_name AND qp.source = 'profiling'
+               ORDER BY s.db_path, s.table_name"""
+        ).fetchall()
+        return [dict(row) for row in rows]
+
+
+_catalog: Optional[DataCatalog] = None
+_catalog_lock = threading.Lock()
+
+
+def get_data_catalog() -> DataCatalog:
+    """Process-wide catalog instance (one writer thread per process)"""
+    global _catalog
+    with _catalog_lock:
+        if _catalog is None:
+            _catalog = DataCatalog()
+        return _catalog
@@ -0,0 +1,47 @@
+"""
+utils/db_fanout.py
+Database-level fan-out for pipeline phases: the per-database work of a phase runs on a
+bounded thread pool (agent crews spend their time waiting on the LLM and SQLite, so
+threads suffice), results come back in the original database order and every database
+reports how long its work took. A failing database does not affect the others.
+"""
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+from models.data_models import PlatformConfig
+
+logger = logging.getLogger(__name__)
+
+
+def fan_out_databases(db_urls: List[str], work: Callable[[str], Any], max_workers: Optional[int] = None,
+                      label: str = "phase") -> List[Dict[str, Any]]:
+    """
+    Run `work(db_url)` for every database concurrently (at most `max_workers` at once,
+    default PlatformConfig.max_concurrent_tasks). Returns one entry per database, in input
+    order: {"db", "result", "duration_ms"} or {"db", "error", "duration_ms"}.
+    """
+    if not db_urls:
+        return []
+    if max_workers is None:
+        max_workers = PlatformConfig().max_concurrent_tasks
+    max_workers = max(1, min(max_workers, len(db_urls)))
+
+    def timed(db_url: str) -> Dict[str, Any]:
+        start = time.perf_counter()
+        try:
+            entry = {"db": db_url, "result": work(db_url)}
+        except Exception as e:
+            logger.error(f"❌ {label} failed for {db_url}: {e}")
+            entry = {"db": db_url, "error": str(e)}
+        entry["duration_ms"] = round((time.perf_counter() - start) * 1000, 3)
+        return entry
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"{label}-db") as executor:
+        entries = list(executor.map(timed, db_urls))
+
+    total_ms = round((time.perf_counter() - start) * 1000, 3)
+    timings = ", ".join(f"{entry['db']}: {entry['duration_ms']:.0f} ms" for entry in entries)
+    logger.info(f"⏱️ {label} ran on {len(entries)} databases in {total_ms:.0f} ms ({timings})")
+    return entries
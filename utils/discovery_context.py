@@ -0,0 +1,166 @@
+"""
+utils/discovery_context.py
+Deterministic pre-computation for discovery: the metadata extraction and data profiling
+tools are run directly in Python, side by side, before any agent is involved. Their full
+JSON is kept for the discovery summary and cache, and a compact digest (per-column facts,
+issues and tool recommendations, no empty fields) is injected into the agent tasks so
+agents only interpret results instead of calling the tools and echoing their output back.
+"""
+import json
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+from models.data_models import PlatformConfig
+
+logger = logging.getLogger(__name__)
+
+# Same tool arguments the research task asks the agent to use
+TOOL_ARGS = {"include_sample_data": False, "max_sample_size": 1000}
+
+
+def _run_tool(tool: Any, **kwargs: Any) -> Dict[str, Any]:
+    """Tool output as a dict; failures and tool error payloads come back as {"error": ...}"""
+    if tool is None:
+        return {"error": "tool not available"}
+    try:
+        output = json.loads(tool._run(**kwargs))
+    except Exception as e:
+        return {"error": str(e)}
+    if not isinstance(output, dict):
+        return {"error": f"unexpected {type(output).__name__} output"}
+    return output
+
+
+class TableContextPrecomputer:
+    """Runs the metadata and profiling tools for a table concurrently on a shared pool"""
+
+    def __init__(self, max_workers: Optional[int] = None):
+        max_workers = max_workers or PlatformConfig().max_concurrent_tasks
+        self._executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="precompute")
+
+    def precompute(self, table_name: str, connection_string: str, metadata_tool: Any,
+                   profiling_tool: Any) -> Dict[str, Any]:
+        """
+        {"metadata", "profiling", "errors"} for one table. A tool that fails leaves its
+        part empty and adds a message to "errors".
+        """
+        # Metadata on the pool, profiling on the calling thread
+        metadata_future = self._executor.submit(
+            _run_tool, metadata_tool, table_name=table_name, connection_string=connection_string,
+            allowed_tables=[table_name], **TOOL_ARGS
+        )
+        profiling = _run_tool(profiling_tool, table_name=table_name, connection_string=connection_string,
+                              allowed_tables=[table_name])
+        metadata = metadata_future.result()
+
+        errors = []
+        if "error" in metadata:
+            errors.append(f"metadata: {metadata['error']}")
+            metadata = {}
+        if "error" in profiling:
+            errors.append(f"profiling: {profiling['error']}")
+            profiling = {}
+        return {"metadata": metadata, "profiling": profiling, "errors": errors}
+
+
+def _compact(value: Any) -> Any:
+    """Drop empty values recursively so the digest only carries facts"""
+    if isinstance(value, dict):
+        items = {key: _compact(item) for key, item in value.items()}
+        return {key: item for key, item in items.items() if item not in (None, "", [], {})}
+    if isinstance(value, list):
+        items = [_compact(item) for item in value]
+        return [item for item in items if item not in (None, "", [], {})]
+    return value
+
+
+def compact_metadata(metadata: Dict[str, Any]) -> Dict[str, Any]:
+    """Schema facts of a metadata extraction result: sizes, keys, indexes, columns, recommendations"""
+    if not isinstance(metadata, dict) or not metadata:
+        return {}
+    basic = metadata.get("basic_info", {})
+    relationships = metadata.get("relationships", {})
+    recommendations = metadata.get("recommendations", {})
+    return _compact({
+        "table": metadata.get("table_name"),
+        "row_count": basic.get("row_count"),
+        "column_count": basic.get("column_count"),
+        "estimated_size_mb": basic.get("estimated_size_mb"),
+        "primary_keys": relationships.get("primary_keys"),
+        "foreign_key_hints": relationships.get("foreign_key_hints"),
+        "indexes": [
+            f"{index.get('name')}({', '.join(index.get('columns', []))}){' unique' if index.get('unique') else ''}"
+            for index in relationships.get("indexes", []) if isinstance(index, dict)
+        ],
+        "columns": [
+            {
+                "name": column.get("name"),
+                "type": column.get("type"),
+                "not_null": True if column.get("nullable") is False else None,
+                "default": column.get("default"),
+                "pk": True if column.get("is_primary_key") else None,
+                "suggestions": column.get("suggestions")
+            }
+            for column in metadata.get("columns", []) if isinstance(column, dict)
+        ],
+        "issues": metadata.get("data_quality", {}).get("issues"),
+        "warnings": metadata.get("data_quality", {}).get("warnings"),
+        "recommendations": [
+            item for group in recommendations.values() if isinstance(group, list) for item in group
+        ] if isinstance(recommendations, dict) else None
+    })
+
+
+def compact_profiling(profiling: Dict[str, Any]) -> Dict[str, Any]:
+    """Quality facts of a profiling result: scores, per-column null/unique ratios, issues, actions"""
+    if not isinstance(profiling, dict) or not profiling:
+        return {}
+    columns: List[Dict[str, Any]] = []
+    for name, profile in (profiling.get("column_profiles") or {}).items():
+        if not isinstance(profile, dict):
+            continue
+        columns.append({
+            "name": name,
+            "semantic_type": profile.get("semantic_type"),
+            "null_pct": profile.get("null_percentage"),
+            "unique_pct": profile.get("unique_percentage"),
+            "quality": profile.get("quality_score"),
+            "issues": profile.get("quality_issues"),
+            "anomalies": profile.get("anomalies"),
+            "business_rules": profile.get("business_rules"),
+            "recommendations": profile.get("recommendations")
+        })
+    return _compact({
+        "rows": profiling.get("total_records"),
+        "table_quality_score": profiling.get("table_quality_score"),
+        "business_domain": profiling.get("business_domain"),
+        "criticality": profiling.get("criticality"),
+        "columns": columns,
+        "relationships": profiling.get("relationships"),
+        "quality_issues": profiling.get("quality_issues"),
+        "anomalies": profiling.get("anomalies"),
+        "trends": profiling.get("trends"),
+        "actions": [
+            f"[{action.get('priority')}] {action.get('action')}" if isinstance(action, dict) else action
+            for action in profiling.get("actionable_recommendations", [])
+        ]
+    })
+
+
+def format_context(value: Any) -> str:
+    """Compact JSON for a task prompt"""
+    return json.dumps(value, separators=(",", ":"), default=str)
+
+
+_precomputer: Optional[TableContextPrecomputer] = None
+_precomputer_lock = threading.Lock()
+
+
+def get_table_context_precomputer() -> TableContextPrecomputer:
+    """Process-wide precomputer, built on first use"""
+    global _precomputer
+    with _precomputer_lock:
+        if _precomputer is None:
+            _precomputer = TableContextPrecomputer()
+        return _precomputer
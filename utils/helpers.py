@@ -16,6 +16,7 @@ from pathlib import Path
 from typing import Dict, List, Any
 from datetime import datetime
 from models.data_models import DataProduct, PlatformConfig
+from utils.catalog_snapshot import get_catalog_snapshot
 from graphviz import Digraph
 
 logger = logging.getLogger(__name__)
@@ -204,22 +205,21 @@ def extract_schema_info(db_path: str, db_alias: str = None) -> dict:
         raise FileNotFoundError(f"Database file does not exist: {abs_path}")
     
     conn = sqlite3.connect(abs_path)
-    cursor = conn.cursor()
 
     schema = {}
     db_label = db_alias or Path(db_path).stem  # e.g., 'customers_db'
 
     try:
-        tables = cursor.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
-        for (table,) in tables:
+        snapshot = get_catalog_snapshot(str(abs_path), conn)
+        for table in snapshot.table_names:
             try:
                 if not table.strip():
                     continue  # skip invalid table names
 
-                cols = cursor.execute(f"PRAGMA table_info({table});").fetchall()
+                cols = snapshot.table_info(table)
                 col_info = [{"name": col[1], "type": col[2], "primary_key": str(bool(col[5]))} for col in cols]
 
-                fks = cursor.execute(f"PRAGMA foreign_key_list({table});").fetchall()
+                fks = snapshot.foreign_keys(table)
                 fk_info = [{"from": fk[3], "to_table": fk[2], "to_column": fk[4]} for fk in fks]
 
                 schema[f"{db_label}.{table}"] = {
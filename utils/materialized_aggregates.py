@@ -0,0 +1,648 @@
+"""
+utils/materialized_aggregates.py
+Materialized aggregate tables for report template queries, stored in a sidecar SQLite
+file next to the data catalog. Single-table GROUP BY templates are kept as partial
+aggregates (sums, counts, min/max, AVG as sum + count) that are refreshed incrementally
+from source tables explicitly registered as append-only via a rowid (or timestamp)
+watermark (everything else is recomputed in full on change), and served to
+report sections whenever they match the source database's current fingerprint. Queries
+grouped by a time bucket (month, week, day) keep per-bucket partials; a refresh recomputes
+only the buckets at or after the change watermark and serves finished buckets from storage.
+"""
+import math
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from models.data_models import PlatformConfig
+from utils.change_detection import get_change_detector, normalize_db_path
+from utils.sql_analysis import (
+    AggregateQuery, parse_aggregate_query, normalize_sql, quote_identifier, rewrite_output_clause,
+    extract_named_parameters, find_time_bucket
+)
+
+logger = logging.getLogger(__name__)
+
+AGGREGATES_FILENAME = "aggregates.db"
+DEFAULT_WATERMARK_COLUMN = "rowid"
+
+# Registry layout version (PRAGMA user_version); 1: append-only became an explicit opt-in
+_STORE_VERSION = 1
+
+_REGISTRY_SQL = """
+CREATE TABLE IF NOT EXISTS aggregate_views (
+    name TEXT PRIMARY KEY,
+    db_path TEXT NOT NULL,
+    source_table TEXT NOT NULL,
+    sql_text TEXT NOT NULL,
+    watermark_column TEXT NOT NULL,
+    append_only INTEGER NOT NULL,
+    status TEXT NOT NULL,
+    watermark,
+    covered_rows INTEGER,
+    schema_version INTEGER,
+    fingerprint TEXT,
+    refreshed_at TEXT,
+    refresh_mode TEXT,
+    refresh_ms REAL,
+    note TEXT,
+    bucket_watermark TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_aggregate_views_db ON aggregate_views (db_path);
+"""
+
+
+class AggregatePlan:
+    """SQL needed to build, merge and serve one materialized aggregate"""
+
+    def __init__(self, query: AggregateQuery, view_name: str, watermark_column: str):
+        self.query = query
+        self.view_name = view_name
+        self.bucket = find_time_bucket(query)
+        source_ref = query.table_alias or query.table
+        self.watermark_expr = f"{source_ref}.{watermark_column}"
+        alias = f" {query.table_alias}" if query.table_alias else ""
+        self.source = f"src.{quote_identifier(query.table)}{alias}"
+
+        group_names = []
+        partial_columns, merge_columns, serve_columns = [], [], []
+        group_position = {expr: i for i, expr in enumerate(query.group_by)}
+        for index, item in enumerate(query.items):
+            name = quote_identifier(item.name)
+            if item.function is None:
+                column = f"g{group_position[item.expression]}"
+                serve_columns.append(f"{column} AS {name}")
+                continue
+
+            filter_sql = f" FILTER (WHERE {item.filter_clause})" if item.filter_clause else ""
+            if item.function == "AVG":
+                partial_columns += [f"SUM({item.argument}){filter_sql} AS a{index}_s",
+                                    f"COUNT({item.argument}){filter_sql} AS a{index}_n"]
+                merge_columns += [f"SUM(a{index}_s)", f"SUM(a{index}_n)"]
+                serve_columns.append(f"a{index}_s * 1.0 / NULLIF(a{index}_n, 0) AS {name}")
+            else:
+                partial_columns.append(f"{item.expression} AS a{index}")
+                merge = {"COUNT": "SUM", "SUM": "SUM", "TOTAL": "TOTAL", "MIN": "MIN", "MAX": "MAX"}[item.function]
+                merge_columns.append(f"{merge}(a{index})")
+                serve_columns.append(f"a{index} AS {name}")
+
+        group_columns = [f"g{i}" for i in range(len(query.group_by))]
+        self.partial_columns = [f"{expr} AS g{i}" for i, expr in enumerate(query.group_by)] + partial_columns
+        self.merge_columns = group_columns + merge_columns
+        self.group_columns = group_columns
+
+        # Group keys in GROUP BY order reproduce SQLite's natural grouped output order
+        for expr in query.group_by:
+            owner = next(item for item in query.group_items if item.expression == expr)
+            group_names.append(quote_identifier(owner.name))
+
+        having = rewrite_output_clause(query, query.having)
+        order_by = rewrite_output_clause(query, query.order_by) or ", ".join(group_names)
+        self.serve_sql = (
+            f"SELECT * FROM (SELECT {', '.join(serve_columns)} FROM {view_name}) AS v"
+            + (f" WHERE {having}" if having else "")
+            + f" ORDER BY {order_by}"
+            + (f" LIMIT {query.limit}" if query.limit else "")
+        )
+
+    def partial_sql(self, lower_bound: bool = False, upper_bound: bool = False, since: bool = False) -> str:
+        """
+        Partial aggregates over the source, optionally restricted to a watermark range or
+        (time-bucketed views) to the buckets starting at :since plus the NULL bucket
+        """
+        conditions = [f"({self.query.where})"] if self.query.where else []
+        if lower_bound:
+            conditions.append(f"{self.watermark_expr} > :low")
+        if upper_bound:
+            conditions.append(f"{self.watermark_expr} <= :high")
+        if since:
+            conditions.append(f"({self.bucket.column} >= :since OR {self.bucket.column} IS NULL)")
+        return (
+            f"SELECT {', '.join(self.partial_columns)} FROM {self.source}"
+            + (f" WHERE {' AND '.join(conditions)}" if conditions else "")
+            + f" GROUP BY {', '.join(self.query.group_by)}"
+        )
+
+    def merge_sql(self, delta_table: str) -> str:
+        return (
+            f"SELECT {', '.join(self.merge_columns)} FROM "
+            f"(SELECT * FROM main.{self.view_name} UNION ALL SELECT * FROM temp.{delta_table}) "
+            f"GROUP BY {', '.join(self.group_columns)}"
+        )
+
+
+def _values_match(a: Any, b: Any) -> bool:
+    if isinstance(a, float) or isinstance(b, float):
+        return a is not None and b is not None and math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-9)
+    return a == b
+
+
+def _same_results(expected: List[tuple], actual: List[tuple]) -> bool:
+    """Row-for-row comparison with float tolerance; ties in ORDER BY may come back in any order"""
+    def rows_match(left: List[tuple], right: List[tuple]) -> bool:
+        return all(len(a) == len(b) and all(map(_values_match, a, b)) for a, b in zip(left, right))
+
+    if len(expected) != len(actual):
+        return False
+    if rows_match(expected, actual):
+        return True
+    key = lambda row: repr(tuple(round(v, 6) if isinstance(v, float) else v for v in row))
+    return rows_match(sorted(expected, key=key), sorted(actual, key=key))
+
+
+class MaterializedAggregateStore:
+    """
+    Sidecar store of materialized template aggregates.
+
+    Each registered query gets a `mv_<hash>` table of partial aggregates plus a registry row
+    with the source watermark and fingerprint. Views are verified against the original
+    query when registered; a view whose SQL cannot be reproduced is kept disabled.
+    """
+
+    def __init__(self, store_path: Optional[str] = None, append_only_tables: Optional[set] = None):
+        if store_path is None:
+            store_path = str(Path(PlatformConfig().data_catalog_path) / AGGREGATES_FILENAME)
+        self.store_path = Path(store_path).resolve()
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        # Append-only is an opt-in: an UPDATE to a row below the watermark is invisible to incremental refresh
+        self.append_only_tables = set(append_only_tables or ())
+        self._plans: Dict[str, AggregatePlan] = {}
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+        conn = sqlite3.connect(self.store_path)
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_REGISTRY_SQL)
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(aggregate_views)")}
+            if "bucket_watermark" not in columns:
+                # Stores created before time-bucketed refresh; those views rebuild once
+                conn.execute("ALTER TABLE aggregate_views ADD COLUMN bucket_watermark TEXT")
+            if conn.execute("PRAGMA user_version").fetchone()[0] < _STORE_VERSION:
+                # Views registered when append-only was assumed per table name go back to full refresh
+                conn.execute("UPDATE aggregate_views SET append_only = 0")
+                conn.execute(f"PRAGMA user_version = {_STORE_VERSION}")
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Connections and registry
+    # ------------------------------------------------------------------
+
+    def _connect(self, db_path: str) -> sqlite3.Connection:
+        """Store connection with the source database attached read-only as `src`"""
+        conn = sqlite3.connect(f"file:{self.store_path}", uri=True, isolation_level=None)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=5000")
+        conn.execute("ATTACH DATABASE ? AS src", (f"file:{db_path}?mode=ro",))
+        return conn
+
+    def _reader(self) -> sqlite3.Connection:
+        """Per-thread read-only connection to the store for serving"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(f"file:{self.store_path}?mode=ro", uri=True)
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def _registry(self) -> Dict[str, Dict[str, Any]]:
+        """Registry rows by view name, reloaded only after some connection committed to the store"""
+        conn = self._reader()
+        version = conn.execute("PRAGMA data_version").fetchone()[0]
+        cached = getattr(self._local, "registry", None)
+        if cached is None or cached[0] != version:
+            rows = conn.execute(
+                "SELECT name, status, sql_text, watermark_column, fingerprint FROM aggregate_views"
+            ).fetchall()
+            columns = ("name", "status", "sql_text", "watermark_column", "fingerprint")
+            cached = (version, {row[0]: dict(zip(columns, row)) for row in rows})
+            self._local.registry = cached
+        return cached[1]
+
+    @staticmethod
+    def view_name(db_path: str, sql: str) -> str:
+        key = f"{normalize_db_path(db_path)}\n{normalize_sql(sql)}"
+        return "mv_" + hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+
+    def _plan(self, name: str, sql: str, watermark_column: str) -> AggregatePlan:
+        with self._lock:
+            plan = self._plans.get(name)
+            if plan is None:
+                if extract_named_parameters(sql):
+                    # The stored aggregate would depend on the bound values (e.g. a time window)
+                    raise ValueError("query has bound parameters")
+                query = parse_aggregate_query(sql)
+                if query is None:
+                    raise ValueError("query is not a decomposable single-table aggregate")
+                plan = AggregatePlan(query, name, watermark_column)
+                self._plans[name] = plan
+            return plan
+
+    def _entry(self, conn: sqlite3.Connection, name: str) -> Optional[sqlite3.Row]:
+        return conn.execute("SELECT * FROM main.aggregate_views WHERE name = ?", (name,)).fetchone()
+
+    def _set_status(self, name: str, db_path: str, status: str, note: str) -> None:
+        conn = self._connect(db_path)
+        try:
+            conn.execute("UPDATE main.aggregate_views SET status = ?, note = ? WHERE name = ?", (status, note, name))
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Registration
+    # ------------------------------------------------------------------
+
+    def register(self, db_path: str, sql: str, append_only: Optional[bool] = None,
+                 watermark_column: str = DEFAULT_WATERMARK_COLUMN, verify: bool = True) -> Dict[str, Any]:
+        """
+        Materialize a template query. Returns {"name", "status", ...} where status is
+        "active", "unsupported" (not decomposable) or "disabled" (failed verification).
+        `append_only` opts the view into incremental refresh and must only be set for tables
+        whose rows are never updated or deleted; by default it follows the store's
+        append_only_tables (empty unless configured).
+        """
+        db_path = normalize_db_path(db_path)
+        name = self.view_name(db_path, sql)
+        try:
+            plan = self._plan(name, sql, watermark_column)
+        except ValueError as e:
+            return {"name": name, "status": "unsupported", "reason": str(e)}
+
+        if append_only is None:
+            append_only = plan.query.table in self.append_only_tables
+
+        conn = self._connect(db_path)
+        try:
+            conn.execute(
+                """INSERT INTO main.aggregate_views
+                       (name, db_path, source_table, sql_text, watermark_column, append_only, status)
+                   VALUES (?, ?, ?, ?, ?, ?, 'active')
+                   ON CONFLICT(name) DO UPDATE SET
+                       watermark_column = excluded.watermark_column,
+                       append_only = excluded.append_only,
+                       status = 'active', note = NULL""",
+                (name, db_path, plan.query.table, normalize_sql(sql), watermark_column, int(append_only))
+            )
+        finally:
+            conn.close()
+
+        try:
+            refresh = self.refresh_view(name, db_path, force_full=True)
+            if verify:
+                self._verify(name, db_path, plan)
+        except (sqlite3.Error, ValueError) as e:
+            self._set_status(name, db_path, "disabled", str(e))
+            logger.warning(f"⚠️ Materialized aggregate {name} disabled: {e}")
+            return {"name": name, "status": "disabled", "reason": str(e)}
+
+        return {"name": name, "status": "active", "table": plan.query.table,
+                "append_only": bool(append_only),
+                "time_bucket": plan.bucket.column if plan.bucket else None, **refresh}
+
+    def _verify(self, name: str, db_path: str, plan: AggregatePlan) -> None:
+        """Raise ValueError unless the materialized result equals the original query"""
+        source = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            expected = [tuple(row) for row in source.execute(plan.query.sql).fetchall()]
+        finally:
+            source.close()
+
+        conn = self._connect(db_path)
+        try:
+            actual = [tuple(row) for row in conn.execute(plan.serve_sql).fetchall()]
+        finally:
+            conn.close()
+
+        if not _same_results(expected, actual):
+            raise ValueError("materialized result does not match the source query")
+
+    def register_templates(self, db_path: str, data_product: Optional[str] = None,
+                           append_only_tables: Optional[set] = None) -> List[Dict[str, Any]]:
+        """
+        Materialize every decomposable report template query whose table exists in the
+        database. `append_only_tables` opts tables of this database into incremental refresh.
+        """
+        from utils.template_registry import get_template_registry
+
+        db_path = normalize_db_path(db_path)
+        source = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            tables = {row[0] for row in source.execute("SELECT name FROM sqlite_master WHERE type='table'")}
+        finally:
+            source.close()
+
+        results, seen = [], set()
+        for product, templates in get_template_registry().templates.items():
+            if data_product and product != data_product:
+                continue
+            for template in templates:
+                for sql in template.get("queries", []):
+                    query = parse_aggregate_query(sql)
+                    if query is None or query.table not in tables or normalize_sql(sql) in seen:
+                        continue
+                    seen.add(normalize_sql(sql))
+                    append_only = query.table in append_only_tables if append_only_tables is not None else None
+                    results.append({"report": template.get("name"), **self.register(db_path, sql, append_only)})
+
+        active = sum(1 for r in results if r["status"] == "active")
+        logger.info(f"🧮 Materialized {active}/{len(results)} template aggregates for {db_path}")
+        return results
+
+    # ------------------------------------------------------------------
+    # Refresh
+    # ------------------------------------------------------------------
+
+    def refresh_view(self, name: str, db_path: str, force_full: bool = False) -> Dict[str, Any]:
+        """
+        Bring one view up to date. Time-bucketed views over sources registered as append-only
+        recompute only the buckets at or after the change watermark (see _bucket_since) and
+        keep finished buckets as stored. Other append-only sources are merged from rows past
+        the watermark, provided the rows at or below it are unchanged in number; anything
+        else (and any schema change) is recomputed in full.
+        """
+        fingerprint = get_change_detector().fingerprint(db_path).digest
+        start = time.perf_counter()
+        conn = self._connect(db_path)
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                entry = self._entry(conn, name)
+                if entry is None:
+                    raise ValueError(f"unknown materialized aggregate {name}")
+                if not force_full and entry["fingerprint"] == fingerprint:
+                    conn.execute("COMMIT")
+                    return {"refresh_mode": "fresh", "delta_groups": 0}
+
+                plan = self._plan(name, entry["sql_text"], entry["watermark_column"])
+                schema_version = conn.execute("PRAGMA src.schema_version").fetchone()[0]
+                same_schema = entry["schema_version"] == schema_version
+
+                since = None
+                # Finished buckets are final only for sources registered as append-only; any other
+                # source is rebuilt in full, so in-place updates always reach their bucket
+                if (plan.bucket and entry["append_only"] and not force_full and same_schema
+                        and entry["bucket_watermark"] is not None
+                        and self._stored_columns(conn, name) == len(plan.partial_columns)):
+                    since = self._bucket_since(conn, plan, entry)
+
+                delta_groups = 0
+                if since is not None:
+                    # Only the open bucket and late-arriving rows are aggregated again
+                    high = conn.execute(f"SELECT MAX({plan.watermark_expr}) FROM {plan.source}").fetchone()[0]
+                    total = None
+                    delta_groups = self._recompute_buckets(conn, plan, since)
+                    mode = "bucketed"
+                else:
+                    high, total = conn.execute(
+                        f"SELECT MAX({plan.watermark_expr}), COUNT(*) FROM {plan.source}"
+                    ).fetchone()
+                    incremental = (
+                        not force_full and entry["append_only"] and entry["watermark"] is not None
+                        and same_schema and entry["covered_rows"] is not None
+                        and self._covered_rows(conn, plan, entry["watermark"]) == entry["covered_rows"]
+                    )
+
+                    if incremental:
+                        if high is not None and high > entry["watermark"]:
+                            delta = f"delta_{name}"
+                            conn.execute(f"CREATE TEMP TABLE {delta} AS {plan.partial_sql(True, True)}",
+                                         {"low": entry["watermark"], "high": high})
+                            delta_groups = conn.execute(f"SELECT COUNT(*) FROM temp.{delta}").fetchone()[0]
+                            if delta_groups:
+                                conn.execute(f"CREATE TEMP TABLE merged_{name} AS {plan.merge_sql(delta)}")
+                                conn.execute(f"DELETE FROM main.{name}")
+                                conn.execute(f"INSERT INTO main.{name} SELECT * FROM temp.merged_{name}")
+                                conn.execute(f"DROP TABLE temp.merged_{name}")
+                            conn.execute(f"DROP TABLE temp.{delta}")
+                        mode = "incremental"
+                    else:
+                        conn.execute(f"DROP TABLE IF EXISTS main.{name}")
+                        conn.execute(f"CREATE TABLE main.{name} AS {plan.partial_sql()}")
+                        mode = "full"
+
+                bucket_watermark = None
+                if plan.bucket:
+                    bucket_watermark = self._open_bucket(
+                        conn, plan, after=entry["watermark"] if mode == "bucketed" else None
+                    )
+
+                refresh_ms = round((time.perf_counter() - start) * 1000, 3)
+                conn.execute(
+                    """UPDATE main.aggregate_views
+                       SET watermark = ?, covered_rows = ?, schema_version = ?, fingerprint = ?,
+                           refreshed_at = ?, refresh_mode = ?, refresh_ms = ?, bucket_watermark = ?
+                       WHERE name = ?""",
+                    (high, total, schema_version, fingerprint, datetime.now().isoformat(), mode, refresh_ms,
+                     bucket_watermark, name)
+                )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+        finally:
+            conn.close()
+
+        logger.debug(f"🧮 Refreshed {name} ({mode}, {delta_groups} delta groups, {refresh_ms} ms)")
+        return {"refresh_mode": mode, "delta_groups": delta_groups, "refresh_ms": refresh_ms,
+                "bucket_watermark": bucket_watermark}
+
+    @staticmethod
+    def _stored_columns(conn: sqlite3.Connection, name: str) -> int:
+        """Columns of a stored view; views stored with another partial layout are rebuilt"""
+        return len(conn.execute(f"PRAGMA main.table_info({name})").fetchall())
+
+    @staticmethod
+    def _covered_rows(conn: sqlite3.Connection, plan: AggregatePlan, watermark: Any) -> int:
+        """Rows not past the watermark (including NULL watermarks); grows on any non-append change"""
+        return conn.execute(
+            f"SELECT COUNT(*) FROM {plan.source} WHERE ({plan.watermark_expr} > ?) IS NOT 1",
+            (watermark,)
+        ).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Time-bucketed refresh
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _bucket_start(conn: sqlite3.Connection, plan: AggregatePlan, ts: Any) -> Optional[str]:
+        """Start of the bucket holding a timestamp (None for values that are not dates)"""
+        return conn.execute(f"SELECT {plan.bucket.start_sql}", {"ts": ts}).fetchone()[0]
+
+    def _open_bucket(self, conn: sqlite3.Connection, plan: AggregatePlan, after: Any = None) -> Optional[str]:
+        """
+        Start of the latest bucket, i.e. the one still receiving rows. None when some rows
+        (only those past `after`, when given) have a non-NULL value that is not a date: their
+        bucket cannot be located, so the view is refreshed without buckets.
+        """
+        column, expression = plan.bucket.column, plan.query.group_by[plan.bucket.position]
+        params: Dict[str, Any] = {}
+        undated = f"SELECT 1 FROM {plan.source} WHERE {column} IS NOT NULL AND {expression} IS NULL"
+        if after is not None:
+            undated += f" AND {plan.watermark_expr} > :after"
+            params["after"] = after
+        if conn.execute(undated + " LIMIT 1", params).fetchone():
+            return None
+        latest = conn.execute(f"SELECT MAX({column}) FROM {plan.source}").fetchone()[0]
+        return self._bucket_start(conn, plan, latest) if latest is not None else None
+
+    def _bucket_since(self, conn: sqlite3.Connection, plan: AggregatePlan, entry: sqlite3.Row) -> Optional[str]:
+        """
+        Change watermark of a time-bucketed view: the start of the oldest bucket that may
+        have changed, i.e. the bucket open at the last refresh or the bucket of the oldest
+        row inserted since, whichever is older. Only used for tables registered as append-only
+        (an explicit opt-in), whose rows never change, so older buckets are final. Returns None when the view has to be
+        rebuilt instead.
+        """
+        since = entry["bucket_watermark"]
+        if entry["watermark"] is not None:
+            earliest = conn.execute(
+                f"SELECT MIN({plan.bucket.column}) FROM {plan.source} WHERE {plan.watermark_expr} > ?",
+                (entry["watermark"],)
+            ).fetchone()[0]
+            if earliest is not None:
+                start = self._bucket_start(conn, plan, earliest)
+                if start is None:
+                    return None
+                since = min(since, start)
+        return since
+
+    @staticmethod
+    def _recompute_buckets(conn: sqlite3.Connection, plan: AggregatePlan, since: str) -> int:
+        """Replace the partials of every bucket from `since` on (and the NULL bucket); returns groups written"""
+        group = f"g{plan.bucket.position}"
+        conn.execute(
+            f"DELETE FROM main.{plan.view_name} WHERE {group} >= strftime(?, ?) OR {group} IS NULL",
+            (plan.bucket.format, since)
+        )
+        return conn.execute(
+            f"INSERT INTO main.{plan.view_name} {plan.partial_sql(since=True)}", {"since": since}
+        ).rowcount
+
+    def refresh(self, db_path: Optional[str] = None, force_full: bool = False) -> List[Dict[str, Any]]:
+        """Refresh all active views (optionally only those of one database)"""
+        conn = sqlite3.connect(self.store_path)
+        try:
+            sql = "SELECT name, db_path FROM aggregate_views WHERE status = 'active'"
+            params: tuple = ()
+            if db_path:
+                sql += " AND db_path = ?"
+                params = (normalize_db_path(db_path),)
+            views = conn.execute(sql, params).fetchall()
+        finally:
+            conn.close()
+
+        results = []
+        for name, view_db in views:
+            try:
+                results.append({"name": name, **self.refresh_view(name, view_db, force_full)})
+            except (sqlite3.Error, ValueError, OSError) as e:
+                logger.warning(f"⚠️ Could not refresh materialized aggregate {name}: {e}")
+                results.append({"name": name, "error": str(e)})
+        return results
+
+    # ------------------------------------------------------------------
+    # Serving
+    # ------------------------------------------------------------------
+
+    def cursor(self, db_path: str, sql: str) -> Optional[sqlite3.Cursor]:
+        """
+        Open cursor over a registered query's materialized rows (this thread's reader),
+        refreshed first when the source changed. Returns None when the query is not
+        materialized or the view fails, so callers fall back to the source.
+        """
+        try:
+            db_path = normalize_db_path(db_path)
+            name = self.view_name(db_path, sql)
+            entry = self._registry().get(name)
+            if entry is None or entry["status"] != "active":
+                return None
+
+            # Cheap fingerprint check first; the locked refresh path only runs after a change
+            if entry["fingerprint"] != get_change_detector().fingerprint(db_path).digest:
+                self.refresh_view(name, db_path)
+            plan = self._plan(name, entry["sql_text"], entry["watermark_column"])
+            return self._reader().execute(plan.serve_sql)
+        except (sqlite3.Error, ValueError, OSError) as e:
+            logger.warning(f"⚠️ Materialized aggregate unavailable, querying source instead: {e}")
+            return None
+
+    def serve(self, db_path: str, sql: str, limit: int = 100) -> Optional[List[Dict[str, Any]]]:
+        """First `limit` rows for a registered query from its materialized table, else None"""
+        cursor = self.cursor(db_path, sql)
+        if cursor is None:
+            return None
+        try:
+            columns = [desc[0] for desc in cursor.description]
+            return [dict(zip(columns, row)) for row in cursor.fetchmany(limit)]
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Materialized aggregate unavailable, querying source instead: {e}")
+            return None
+        finally:
+            cursor.close()
+
+    def list_views(self, db_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        conn = sqlite3.connect(self.store_path)
+        conn.row_factory = sqlite3.Row
+        try:
+            sql = "SELECT * FROM aggregate_views"
+            params: tuple = ()
+            if db_path:
+                sql += " WHERE db_path = ?"
+                params = (normalize_db_path(db_path),)
+            return [dict(row) for row in conn.execute(sql + " ORDER BY source_table, name", params)]
+        finally:
+            conn.close()
+
+    def drop(self, db_path: str) -> int:
+        """Remove every materialized view of a database"""
+        db_path = normalize_db_path(db_path)
+        conn = sqlite3.connect(self.store_path)
+        try:
+            names = [row[0] for row in conn.execute("SELECT name FROM aggregate_views WHERE db_path = ?", (db_path,))]
+            for name in names:
+                conn.execute(f"DROP TABLE IF EXISTS {name}")
+            conn.execute("DELETE FROM aggregate_views WHERE db_path = ?", (db_path,))
+            conn.commit()
+        finally:
+            conn.close()
+        return len(names)
+
+
+_store: Optional[MaterializedAggregateStore] = None
+_store_lock = threading.Lock()
+
+
+def get_aggregate_store() -> MaterializedAggregateStore:
+    """Process-wide materialized aggregate store"""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = MaterializedAggregateStore()
+        return _store
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Materialize report template aggregates")
+    parser.add_argument("db_path", help="SQLite database (path or sqlite:/// URL)")
+    parser.add_argument("--data-product", help="Only materialize this data product's templates")
+    parser.add_argument("--refresh", action="store_true", help="Refresh existing views instead of registering")
+    parser.add_argument("--append-only", action="append", metavar="TABLE",
+                        help="Table that only ever receives inserts (refreshed incrementally); repeatable")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    store = get_aggregate_store()
+    if args.refresh:
+        outcome = store.refresh(args.db_path)
+    else:
+        outcome = store.register_templates(args.db_path, args.data_product,
+                                           set(args.append_only) if args.append_only else None)
+    for item in outcome:
+        print(item)
@@ -0,0 +1,287 @@
+"""
+utils/report_cache.py
+Report-level result cache. Rendered reports (JSON and markdown) are stored in a SQLite
+file next to the data catalog, keyed by report type, resolved parameters, the allowed
+data sources and the source database's fingerprint, so a repeat request for unchanged
+data is answered without running a single query. Entries are evicted least recently
+used beyond configurable count and size limits.
+"""
+import json
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from models.data_models import PlatformConfig
+from utils.change_detection import get_change_detector, normalize_db_path
+from utils.template_registry import get_template_registry, normalize_report_type
+
+logger = logging.getLogger(__name__)
+
+REPORT_CACHE_FILENAME = "report_cache.db"
+
+# Parameters that change how a report is executed, not what it contains
+EXECUTION_PARAMETERS = {
+    "data_source", "data_sources", "queries", "visualizations", "template",
+    "parallel", "use_materialized", "use_cache"
+}
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS report_cache (
+    cache_key TEXT PRIMARY KEY,
+    report_type TEXT NOT NULL,
+    db_path TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    parameters_json TEXT NOT NULL,
+    report_json TEXT NOT NULL,
+    markdown TEXT,
+    size_bytes INTEGER NOT NULL,
+    created_at TEXT NOT NULL,
+    last_accessed TEXT NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_report_cache_target ON report_cache (db_path, report_type);
+CREATE INDEX IF NOT EXISTS idx_report_cache_lru ON report_cache (last_accessed);
+"""
+
+
+def resolve_report_parameters(template: Dict[str, Any], parameters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Template defaults overlaid with the caller's content-affecting parameters"""
+    resolved = dict(template.get("parameters", {}))
+    resolved.update({
+        key: value for key, value in (parameters or {}).items()
+        if key not in EXECUTION_PARAMETERS
+    })
+    return resolved
+
+
+class ReportCache:
+    """
+    Persistent cache of generated reports.
+
+    The database fingerprint is part of the key, so entries for changed data are never
+    served; they are dropped when a newer report for the same target is stored or by
+    the size limits.
+    """
+
+    def __init__(self, cache_path: Optional[str] = None, enabled: Optional[bool] = None,
+                 max_entries: Optional[int] = None, max_mb: Optional[float] = None):
+        config = PlatformConfig()
+        if cache_path is None:
+            cache_path = str(Path(config.data_catalog_path) / REPORT_CACHE_FILENAME)
+        self.cache_path = Path(cache_path)
+        self.cache_path.parent.mkdir(parents=True, exist_ok=True)
+        self.enabled = config.cache_enabled if enabled is None else enabled
+        self.max_entries = config.report_cache_max_entries if max_entries is None else max_entries
+        self.max_bytes = int((config.report_cache_max_mb if max_mb is None else max_mb) * 1024 * 1024)
+        self._lock = threading.Lock()
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA_SQL)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.cache_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    # ------------------------------------------------------------------
+    # Keys
+    # ------------------------------------------------------------------
+
+    def key(self, report_type: str, db_path: str, parameters: Dict[str, Any],
+            data_sources: Optional[List[str]] = None) -> Dict[str, Any]:
+        """
+        Cache key for a report request at the database's current state. Compute it before
+        running the queries so a concurrent data change cannot be cached under a newer key.
+        """
+        db_path = normalize_db_path(db_path)
+        fingerprint = get_change_detector().fingerprint(db_path).digest
+        payload = {
+            "report_type": normalize_report_type(report_type),
+            "db_path": db_path,
+            "parameters": parameters,
+            "data_sources": sorted(data_sources or []),
+            "fingerprint": fingerprint
+        }
+        digest = hashlib.sha1(json.dumps(payload, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+        return {"cache_key": digest, **payload}
+
+    # ------------------------------------------------------------------
+    # Read / write
+    # ------------------------------------------------------------------
+
+    def get(self, key: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """{"report", "markdown", "created_at", "hits"} for a cache hit, else None"""
+        if not self.enabled:
+            return None
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT report_json, markdown, created_at, hits FROM report_cache WHERE cache_key = ?",
+                (key["cache_key"],)
+            ).fetchone()
+            if row is None:
+                return None
+            conn.execute(
+                "UPDATE report_cache SET hits = hits + 1, last_accessed = ? WHERE cache_key = ?",
+                (datetime.now().isoformat(), key["cache_key"])
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        logger.info(f"♻️ Report cache hit for {key['report_type']} on {key['db_path']}")
+        return {
+            "report": json.loads(row["report_json"]),
+            "markdown": row["markdown"],
+            "created_at": row["created_at"],
+            "hits": row["hits"] + 1
+        }
+
+    def put(self, key: Dict[str, Any], report: Dict[str, Any], markdown: Optional[str] = None) -> None:
+        """Store a rendered report, replace older versions of it and enforce the size limits"""
+        if not self.enabled:
+            return
+        report_json = json.dumps(report, default=str)
+        size_bytes = len(report_json.encode("utf-8")) + len((markdown or "").encode("utf-8"))
+        if size_bytes > self.max_bytes:
+            logger.info(f"Report {key['report_type']} ({size_bytes} bytes) exceeds the cache size limit; not cached")
+            return
+
+        now = datetime.now().isoformat()
+        parameters_json = json.dumps(key["parameters"], sort_keys=True, default=str)
+        with self._lock:
+            conn = self._connect()
+            try:
+                # Reports of the same request at an older data version can never be hit again
+                conn.execute(
+                    """DELETE FROM report_cache
+                       WHERE db_path = ? AND report_type = ? AND parameters_json = ? AND fingerprint != ?""",
+                    (key["db_path"], key["report_type"], parameters_json, key["fingerprint"])
+                )
+                conn.execute(
+                    """INSERT OR REPLACE INTO report_cache
+                       (cache_key, report_type, db_path, fingerprint, parameters_json, report_json,
+                        markdown, size_bytes, created_at, last_accessed, hits)
+                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, 0)""",
+                    (key["cache_key"], key["report_type"], key["db_path"], key["fingerprint"],
+                     parameters_json, report_json, markdown, size_bytes, now, now)
+                )
+                self._evict(conn)
+                conn.commit()
+            finally:
+                conn.close()
+
+    def _evict(self, conn: sqlite3.Connection) -> None:
+        """Drop least recently used entries beyond max_entries / max_bytes"""
+        count, total = conn.execute("SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM report_cache").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for row in conn.execute("SELECT cache_key, size_bytes FROM report_cache ORDER BY last_accessed").fetchall():
+            if count <= self.max_entries and total <= self.max_bytes:
+                break
+            conn.execute("DELETE FROM report_cache WHERE cache_key = ?", (row["cache_key"],))
+            count -= 1
+            total -= row["size_bytes"]
+            evicted += 1
+        logger.debug(f"🧹 Evicted {evicted} cached reports")
+
+    def invalidate(self, db_path: Optional[str] = None, report_type: Optional[str] = None) -> int:
+        """Remove cached reports, optionally only for one database and/or report type"""
+        conditions, params = [], []
+        if db_path:
+            conditions.append("db_path = ?")
+            params.append(normalize_db_path(db_path))
+        if report_type:
+            conditions.append("report_type = ?")
+            params.append(normalize_report_type(report_type))
+        with self._lock:
+            conn = self._connect()
+            try:
+                deleted = conn.execute(
+                    "DELETE FROM report_cache" + (f" WHERE {' AND '.join(conditions)}" if conditions else ""),
+                    params
+                ).rowcount
+                conn.commit()
+            finally:
+                conn.close()
+        logger.info(f"🗑️ Invalidated {deleted} cached reports")
+        return deleted
+
+    def stats(self) -> Dict[str, Any]:
+        conn = self._connect()
+        try:
+            row = conn.execute(
+                "SELECT COUNT(*) AS entries, COALESCE(SUM(size_bytes), 0) AS size_bytes, "
+                "COALESCE(SUM(hits), 0) AS hits FROM report_cache"
+            ).fetchone()
+        finally:
+            conn.close()
+        return {
+            **dict(row),
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "enabled": self.enabled
+        }
+
+
+def warm_report_cache(db_path: str, data_sources: Optional[List[str]] = None,
+                      data_products: Optional[List[str]] = None) -> Dict[str, Any]:
+    """
+    Generate and cache every data product's report suite for a database (no LLM involved).
+    Returns {"generated", "cached", "failed"} report counts.
+    """
+    from tools.analytics_tools import ReportGenerationTool
+
+    db_path = normalize_db_path(db_path)
+    if data_sources is None:
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            data_sources = [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+            )]
+        finally:
+            conn.close()
+
+    registry = get_template_registry()
+    tool = ReportGenerationTool()
+
+    summary = {"generated": 0, "cached": 0, "failed": 0}
+    for product in registry.suites:
+        if data_products and product not in data_products:
+            continue
+        # One pass per suite: shared statements and table scans run once
+        outcome = tool.generate_suite(db_path, product, {"data_sources": data_sources})
+        for report in outcome["reports"].values():
+            if "error" in report:
+                summary["failed"] += 1
+            elif report.get("data_summary", {}).get("cache", {}).get("hit"):
+                summary["cached"] += 1
+            else:
+                summary["generated"] += 1
+
+    logger.info(f"🔥 Warmed report cache for {db_path}: {summary}")
+    return summary
+
+
+_cache: Optional[ReportCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_report_cache() -> ReportCache:
+    """Process-wide report cache"""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ReportCache()
+        return _cache
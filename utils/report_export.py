@@ -0,0 +1,194 @@
+"""
+utils/report_export.py
+Columnar export of report sections. Each section's full result set is written straight
+from the SQLite cursor (via its continuation token, see utils.report_pagination) to
+Parquet with a batched Arrow writer (pyarrow, optional dependency) or to streamed CSV,
+holding one fetchmany batch in memory at a time. Files land under results/exports/ so
+downstream consumers can read whole sections without querying the database again.
+"""
+import os
+import re
+import csv
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Any, Optional, Iterator, Tuple
+from models.data_models import PlatformConfig
+from utils.report_pagination import iter_section_batches
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PYARROW_AVAILABLE = True
+except ImportError:
+    pa = pq = None
+    PYARROW_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+EXPORTS_DIRNAME = "exports"
+EXPORT_FORMATS = ("parquet", "csv")
+
+
+class _TypeWidened(Exception):
+    """A later batch does not fit the Arrow type inferred for a column"""
+
+    def __init__(self, column: int, arrow_type: Any):
+        super().__init__(f"column {column} needs {arrow_type}")
+        self.column = column
+        self.arrow_type = arrow_type
+
+
+def _slug(text: str) -> str:
+    return re.sub(r"[^A-Za-z0-9]+", "_", text).strip("_").lower() or "section"
+
+
+def section_batches(section: Dict[str, Any], batch_size: Optional[int] = None,
+                    use_materialized: bool = True) -> Iterator[Tuple[List[str], List[tuple]]]:
+    """
+    (column names, rows) batches of a section's full result set: re-read from its first row
+    through the cursor when the section is paginated, else its rows as one batch
+    """
+    pagination = section.get("pagination") or {}
+    if pagination.get("has_more") and pagination.get("continuation_token"):
+        yield from iter_section_batches(pagination["continuation_token"], batch_size=batch_size,
+                                        use_materialized=use_materialized, from_start=True)
+        return
+    content = section.get("content")
+    if isinstance(content, list) and content and isinstance(content[0], dict):
+        columns = list(content[0].keys())
+        yield columns, [tuple(row.get(column) for column in columns) for row in content]
+
+
+def _arrow_type(values: List[Any]) -> "pa.DataType":
+    """Arrow type for a column's values; SQLite columns may mix integers and reals"""
+    kinds = {type(value) for value in values if value is not None}
+    if not kinds:
+        return pa.string()
+    if kinds <= {int, bool}:
+        return pa.int64()
+    if kinds <= {int, bool, float}:
+        return pa.float64()
+    if kinds == {bytes}:
+        return pa.binary()
+    return pa.string()
+
+
+def _record_batch(columns: List[str], rows: List[tuple], schema: "pa.Schema") -> "pa.RecordBatch":
+    arrays = []
+    for index, field in enumerate(schema):
+        values = [row[index] for row in rows]
+        if pa.types.is_string(field.type):
+            arrays.append(pa.array([None if v is None else str(v) for v in values], type=pa.string()))
+            continue
+        # pyarrow silently truncates reals into integer columns, so check the batch first
+        batch_type = _arrow_type(values)
+        if batch_type != field.type and not (batch_type == pa.string() and all(v is None for v in values)) \
+                and not (batch_type == pa.int64() and field.type == pa.float64()):
+            raise _TypeWidened(index, pa.float64() if {batch_type, field.type} == {pa.int64(), pa.float64()} else pa.string())
+        try:
+            arrays.append(pa.array(values, type=field.type))
+        except (pa.ArrowInvalid, pa.ArrowTypeError, OverflowError):
+            raise _TypeWidened(index, pa.string())
+    return pa.RecordBatch.from_arrays(arrays, schema=schema)
+
+
+def _write_parquet(batches: Iterator[Tuple[List[str], List[tuple]]], path: Path,
+                   overrides: Dict[int, Any]) -> int:
+    writer, rows_written = None, 0
+    try:
+        for columns, rows in batches:
+            if writer is None:
+                schema = pa.schema([
+                    (name, overrides.get(i) or _arrow_type([row[i] for row in rows]))
+                    for i, name in enumerate(columns)
+                ])
+                writer = pq.ParquetWriter(str(path), schema, compression="snappy")
+            writer.write_batch(_record_batch(columns, rows, writer.schema))
+            rows_written += len(rows)
+    finally:
+        if writer is not None:
+            writer.close()
+    return rows_written
+
+
+def _write_csv(batches: Iterator[Tuple[List[str], List[tuple]]], path: Path) -> int:
+    rows_written = 0
+    with path.open("w", encoding="utf-8", newline="") as f:
+        writer = csv.writer(f)
+        for columns, rows in batches:
+            if rows_written == 0:
+                writer.writerow(columns)
+            writer.writerows(rows)
+            rows_written += len(rows)
+    return rows_written
+
+
+def export_section(section: Dict[str, Any], output_path: str, fmt: str = "parquet",
+                   batch_size: Optional[int] = None, use_materialized: bool = True) -> Dict[str, Any]:
+    """
+    Write a section's full result set to `output_path` as Parquet or CSV, batch by batch.
+    The file is written under a temporary name and renamed when complete.
+    Returns {"path", "format", "rows", "bytes"}.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unsupported export format '{fmt}'; expected one of {EXPORT_FORMATS}")
+    if fmt == "parquet" and not PYARROW_AVAILABLE:
+        raise ValueError("Parquet export needs pyarrow; install it or export as csv")
+
+    path = Path(output_path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, suffix=f".{fmt}.tmp")
+    os.close(fd)
+    tmp_path = Path(tmp_name)
+    try:
+        if fmt == "csv":
+            rows = _write_csv(section_batches(section, batch_size, use_materialized), tmp_path)
+        else:
+            # Types are inferred from the first batch; a column that turns out wider later
+            # (integers then reals, numbers then text) restarts the export with the wider type
+            overrides: Dict[int, Any] = {}
+            while True:
+                try:
+                    rows = _write_parquet(section_batches(section, batch_size, use_materialized), tmp_path, overrides)
+                    break
+                except _TypeWidened as e:
+                    if overrides.get(e.column) == e.arrow_type:
+                        raise ValueError(f"Could not determine a Parquet type for column {e.column}") from e
+                    overrides[e.column] = e.arrow_type
+                    logger.debug(f"Widening export column {e.column} to {e.arrow_type}; restarting")
+        os.replace(tmp_path, path)
+    except Exception:
+        tmp_path.unlink(missing_ok=True)
+        raise
+
+    return {"path": str(path), "format": fmt, "rows": rows, "bytes": path.stat().st_size}
+
+
+def export_report(report: Dict[str, Any], fmt: str = "parquet", output_dir: Optional[str] = None,
+                  batch_size: Optional[int] = None, use_materialized: bool = True) -> List[Dict[str, Any]]:
+    """
+    Export every tabular section of a report to `<output_dir>/<report title>/<section>.<fmt>`
+    (default output dir: results/exports). Sections that fail are reported with an "error"
+    and do not stop the others.
+    """
+    if output_dir is None:
+        output_dir = str(Path(PlatformConfig().results_path) / EXPORTS_DIRNAME)
+    base = Path(output_dir) / _slug(report.get("report_title", "report"))
+
+    exported = []
+    for index, section in enumerate(report.get("sections", [])):
+        if not isinstance(section.get("content"), list):
+            continue
+        title = section.get("title", f"Section {index + 1}")
+        try:
+            exported.append({"section": title, **export_section(
+                section, str(base / f"{_slug(title)}.{fmt}"), fmt, batch_size, use_materialized
+            )})
+        except Exception as e:
+            logger.warning(f"⚠️ Could not export {title} of {report.get('report_title')}: {e}")
+            exported.append({"section": title, "error": str(e)})
+
+    total = sum(item.get("rows", 0) for item in exported)
+    logger.info(f"📦 Exported {len(exported)} sections ({total} rows) of {report.get('report_title')} as {fmt}")
+    return exported
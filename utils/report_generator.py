@@ -1,7 +1,10 @@
 from pathlib import Path
 from datetime import datetime
+import io
+import os
 import json
-from typing import Dict, Any, Union
+import sqlite3
+from typing import Dict, Any, Optional, Union, Iterator, TextIO
 
 def generate_markdown_summary(json_path: str, output_path: str = "results/results_summary.md") -> str:
     """Generate a markdown summary report from platform_execution_results.json"""
@@ -50,62 +53,104 @@ def generate_markdown_summary(json_path: str, output_path: str = "results/result
 
     return str(output_path)
 
-def format_section(title: str, content: Union[str, Dict, list]) -> str:
-    md = f"\n## {title}\n"
+def format_row_markdown(item: Any) -> str:
+    """One report row as a markdown list item"""
+    if isinstance(item, dict):
+        return "- " + ", ".join([f"**{k}**: {v}" for k, v in item.items()]) + "\n"
+    return f"- {item}\n"
+
+def iter_section_markdown(title: str, content: Union[str, Dict, list]) -> Iterator[str]:
+    """Markdown for a section, yielded one line (or row) at a time"""
+    yield f"\n## {title}\n"
     if isinstance(content, str):
-        md += f"\n{content}\n"
+        yield f"\n{content}\n"
     elif isinstance(content, dict):
         for k, v in content.items():
             if isinstance(v, (int, float, str)):
-                md += f"- **{k.replace('_', ' ').title()}**: {v}\n"
+                yield f"- **{k.replace('_', ' ').title()}**: {v}\n"
             elif isinstance(v, list):
-                md += f"- **{k.replace('_', ' ').title()}**:\n"
+                yield f"- **{k.replace('_', ' ').title()}**:\n"
                 for item in v:
-                    md += f"  - {item}\n"
+                    yield f"  - {item}\n"
     elif isinstance(content, list):
         for item in content:
-            if isinstance(item, dict):
-                md += "- " + ", ".join([f"**{k}**: {v}" for k, v in item.items()]) + "\n"
-            else:
-                md += f"- {item}\n"
+            yield format_row_markdown(item)
     else:
-        md += f"\n{str(content)}\n"
-    return md
+        yield f"\n{str(content)}\n"
 
-def save_report_as_markdown(report_data: Dict[str, Any], output_path: Union[str, Path]) -> str:
-    md = f"# 📝 {report_data.get('report_title', 'Report')}\n"
-    md += f"**Generated:** {report_data.get('generation_date', '')}\n"
-    md += f"\n**Data Source:** `{report_data.get('data_source', '')}`\n"
+def format_section(title: str, content: Union[str, Dict, list]) -> str:
+    return "".join(iter_section_markdown(title, content))
+
+def write_report_markdown(report_data: Dict[str, Any], out: TextIO, stream_remaining: bool = False,
+                          chart_base: Optional[Path] = None) -> None:
+    """
+    Write a report as markdown to a text stream, section by section and row by row. With
+    `stream_remaining`, paginated sections continue past their first page by streaming the
+    rest of their rows from the database; otherwise a note says how many rows are shown.
+    With `chart_base`, sections whose chart was already rendered link it (relative to that
+    folder); charts are never rendered here.
+    """
+    out.write(f"# 📝 {report_data.get('report_title', 'Report')}\n")
+    out.write(f"**Generated:** {report_data.get('generation_date', '')}\n")
+    out.write(f"\n**Data Source:** `{report_data.get('data_source', '')}`\n")
 
     # Data Summary
     summary = report_data.get("data_summary", {})
     if isinstance(summary, dict):
-        md += "\n## Executive Summary\n"
-        md += f"\n{summary.get('summary', '')}\n"
+        out.write("\n## Executive Summary\n")
+        out.write(f"\n{summary.get('summary', '')}\n")
         metrics = summary.get("metrics", {})
         if metrics:
-            md += "\n### Key Metrics\n"
+            out.write("\n### Key Metrics\n")
             for k, v in metrics.items():
-                md += f"- **{k.replace('_', ' ').title()}**: {v}\n"
+                out.write(f"- **{k.replace('_', ' ').title()}**: {v}\n")
     elif isinstance(summary, str):
-        md += "\n## Executive Summary\n"
-        md += f"\n{summary}\n"
+        out.write("\n## Executive Summary\n")
+        out.write(f"\n{summary}\n")
 
     # Sections
     for section in report_data.get("sections", []):
         title = section.get("title", "Section")
         content = section.get("content", "")
-        md += format_section(title, content)
+        out.writelines(iter_section_markdown(title, content))
+
+        if chart_base is not None:
+            from utils.chart_rendering import get_chart_renderer
+            chart = get_chart_renderer().cached(section)
+            if chart:
+                out.write(f"\n![{title}]({Path(os.path.relpath(chart, chart_base)).as_posix()})\n")
+
+        pagination = section.get("pagination") or {}
+        if not pagination.get("has_more"):
+            continue
+        if stream_remaining and pagination.get("continuation_token"):
+            from utils.report_pagination import stream_section, ContinuationError
+            try:
+                stream_section(pagination["continuation_token"], out, fmt="markdown")
+                continue
+            except (ContinuationError, sqlite3.Error) as e:
+                out.write(f"\n_Remaining rows unavailable: {e}_\n")
+        out.write(f"\n_Showing the first {pagination.get('rows', len(content))} rows; more rows are available._\n")
 
     # Recommendations
     if "recommendations" in report_data:
-        md += format_section("Recommendations", report_data["recommendations"])
+        out.writelines(iter_section_markdown("Recommendations", report_data["recommendations"]))
 
     # Conclusion
     if "conclusion" in report_data:
-        md += format_section("Conclusion", report_data["conclusion"])
+        out.writelines(iter_section_markdown("Conclusion", report_data["conclusion"]))
+
+def render_report_markdown(report_data: Dict[str, Any]) -> str:
+    """Render a report dict as markdown text"""
+    buffer = io.StringIO()
+    write_report_markdown(report_data, buffer)
+    return buffer.getvalue().strip()
 
+def save_report_as_markdown(report_data: Dict[str, Any], output_path: Union[str, Path],
+                            stream_remaining: bool = False) -> str:
+    """Write a report to a markdown file incrementally, linking rendered charts; see write_report_markdown"""
     path = Path(output_path)
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(md.strip(), encoding="utf-8")
-    return str(path)
\ No newline at end of file
+    with path.open("w", encoding="utf-8") as f:
+        write_report_markdown(report_data, f, stream_remaining=stream_remaining, chart_base=path.parent)
+    return str(path)
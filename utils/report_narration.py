@@ -0,0 +1,100 @@
+"""
+utils/report_narration.py
+Optional LLM narration for generated reports. Reports themselves are produced directly from
+template SQL; a narrative (executive summary, notable findings) is an enrichment requested
+separately and written on a background worker, so it never adds to report latency.
+"""
+import json
+import logging
+import threading
+from pathlib import Path
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Any, Optional
+from models.data_models import PlatformConfig
+
+logger = logging.getLogger(__name__)
+
+# Rows per section sent to the model; enough to describe the shape of the data
+NARRATION_SAMPLE_ROWS = 10
+
+
+def compact_report(report: Dict[str, Any], sample_rows: int = NARRATION_SAMPLE_ROWS) -> Dict[str, Any]:
+    """Report reduced to what a narrative needs: title, summary and the first rows of each section"""
+    sections = []
+    for section in report.get("sections", []):
+        content = section.get("content")
+        pagination = section.get("pagination") or {}
+        sections.append({
+            "title": section.get("title"),
+            "visualization": section.get("visualization"),
+            "rows": content[:sample_rows] if isinstance(content, list) else content,
+            "more_rows": bool(pagination.get("has_more")) or (isinstance(content, list) and len(content) > sample_rows)
+        })
+    return {
+        "report_title": report.get("report_title"),
+        "period": report.get("period"),
+        "summary": report.get("data_summary", {}).get("summary"),
+        "sections": sections,
+        "recommendations": report.get("recommendations", [])
+    }
+
+
+class ReportNarrator:
+    """Writes LLM narratives for reports on a single background worker"""
+
+    def __init__(self, model: Optional[str] = None):
+        self.model = model or PlatformConfig().narration_model
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="report-narration")
+
+    def narrate(self, report: Dict[str, Any]) -> str:
+        """Narrative markdown for a report (blocking LLM call)"""
+        from openai import OpenAI
+
+        prompt = f"""
+You are a senior data analyst. Write a concise narrative for the report below.
+
+## Report Data (first rows of each section):
+{json.dumps(compact_report(report), indent=2, default=str)}
+
+## Instructions:
+- Start with a 2-3 sentence executive summary
+- Then list the most notable findings as bullet points, citing figures from the data
+- Do not invent numbers that are not in the data
+- Respond in Markdown only
+"""
+        response = OpenAI().chat.completions.create(
+            model=self.model,
+            messages=[{"role": "user", "content": prompt}],
+            temperature=0.2,
+            max_tokens=800
+        )
+        return response.choices[0].message.content.strip()
+
+    def submit(self, report: Dict[str, Any], output_path: Optional[str] = None) -> "Future[str]":
+        """
+        Queue a narrative for a report; the future resolves to the markdown text (also
+        written to `output_path` when given).
+        """
+        def run() -> str:
+            narrative = self.narrate(report)
+            if output_path:
+                path = Path(output_path)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(narrative, encoding="utf-8")
+            logger.info(f"🧠 Narrative ready for {report.get('report_title', 'report')}")
+            return narrative
+
+        return self._executor.submit(run)
+
+
+_narrator: Optional[ReportNarrator] = None
+_narrator_lock = threading.Lock()
+
+
+def get_report_narrator() -> ReportNarrator:
+    """Process-wide report narrator"""
+    global _narrator
+    with _narrator_lock:
+        if _narrator is None:
+            _narrator = ReportNarrator()
+        return _narrator
@@ -0,0 +1,212 @@
+"""
+utils/report_pagination.py
+Cursor-based pagination for report sections. A section carries its first page of rows plus
+an opaque continuation token naming the template query (never raw SQL), the row offset,
+the bound parameter values and the database fingerprint the page was read at. The remaining
+rows are read back through a live cursor in fetchmany batches and can be streamed to
+markdown, CSV or JSON lines without holding the full result in memory. Tokens are rejected
+once the underlying data changed.
+"""
+import csv
+import json
+import base64
+import logging
+import sqlite3
+from contextlib import contextmanager
+from typing import Dict, List, Any, Optional, Iterable, Iterator, Tuple, TextIO
+from models.data_models import PlatformConfig
+from utils.change_detection import get_change_detector, normalize_db_path
+from utils.report_generator import format_row_markdown
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 100
+STREAM_FORMATS = ("markdown", "csv", "jsonl")
+_TOKEN_VERSION = 1
+
+
+class ContinuationError(ValueError):
+    """Malformed token, unknown query, or data changed since the token was issued"""
+
+
+def paginate_rows(rows: List[Dict[str, Any]], page_size: int) -> Tuple[List[Dict[str, Any]], bool]:
+    """(first page, has_more) from rows fetched with one row of look-ahead"""
+    return rows[:page_size], len(rows) > page_size
+
+
+def encode_continuation(state: Dict[str, Any]) -> str:
+    payload = json.dumps({"v": _TOKEN_VERSION, **state}, sort_keys=True, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_continuation(token: str) -> Dict[str, Any]:
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")).decode("utf-8"))
+    except (ValueError, UnicodeError) as e:
+        raise ContinuationError(f"Invalid continuation token: {e}") from e
+    if not isinstance(state, dict) or state.get("v") != _TOKEN_VERSION:
+        raise ContinuationError("Unsupported continuation token version")
+    missing = {"db", "product", "type", "query", "offset", "page_size", "fingerprint"} - set(state)
+    if missing:
+        raise ContinuationError(f"Continuation token is missing {sorted(missing)}")
+    return state
+
+
+def continuation_token(db_path: str, data_product: str, report_type: str, query_index: int,
+                       offset: int, page_size: int, fingerprint: Optional[str] = None,
+                       params: Optional[Dict[str, Any]] = None) -> str:
+    """
+    Token for the rows of a template query after `offset`, pinned to the current data version.
+    `params` are the bound parameter values the first page was read with.
+    """
+    db_path = normalize_db_path(db_path)
+    if fingerprint is None:
+        fingerprint = get_change_detector().fingerprint(db_path).digest
+    return encode_continuation({
+        "db": db_path,
+        "product": data_product,
+        "type": report_type,
+        "query": query_index,
+        "offset": offset,
+        "page_size": page_size,
+        "fingerprint": fingerprint,
+        "params": params or {}
+    })
+
+
+def _resolve(state: Dict[str, Any], registry) -> str:
+    """SQL of the template query a token refers to, after checking the data is unchanged"""
+    compiled = registry.get(state["type"], state["product"])
+    if compiled is None or not 0 <= state["query"] < len(compiled.queries):
+        raise ContinuationError(f"Unknown report query {state['type']}#{state['query']}")
+    if get_change_detector().fingerprint(state["db"]).digest != state["fingerprint"]:
+        raise ContinuationError("Data changed since this page was generated; regenerate the report")
+    return compiled.queries[state["query"]].sql
+
+
+@contextmanager
+def _open_cursor(db_path: str, sql: str, registry, use_materialized: bool,
+                 params: Optional[Dict[str, Any]] = None) -> Iterator[sqlite3.Cursor]:
+    """Cursor over the same source the first page came from: the materialized view if fresh, else the database"""
+    cursor = None
+    if use_materialized:
+        from utils.materialized_aggregates import get_aggregate_store
+        cursor = get_aggregate_store().cursor(db_path, sql)
+    if cursor is not None:
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+        return
+    with registry.pool.connection(db_path) as conn:
+        cursor = conn.execute(sql, params or {})
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+
+
+def iter_section_batches(token: str, batch_size: Optional[int] = None, registry=None,
+                         use_materialized: bool = True, limit: Optional[int] = None,
+                         from_start: bool = False) -> Iterator[Tuple[List[str], List[tuple]]]:
+    """
+    (column names, rows) batches of a section after the token's offset (from its first row
+    with `from_start`), read with fetchmany from one live cursor so only one batch is held
+    at a time. At most `limit` rows when given; otherwise everything that remains.
+    """
+    if registry is None:
+        from utils.template_registry import get_template_registry
+        registry = get_template_registry()
+    state = decode_continuation(token)
+    sql = _resolve(state, registry)
+    batch_size = batch_size or PlatformConfig().batch_size
+
+    with _open_cursor(state["db"], sql, registry, use_materialized, state.get("params")) as cursor:
+        columns = [desc[0] for desc in cursor.description]
+        skip = 0 if from_start else state["offset"]
+        while skip > 0:
+            skipped = len(cursor.fetchmany(min(skip, batch_size)))
+            if not skipped:
+                return
+            skip -= skipped
+
+        remaining = limit
+        while remaining is None or remaining > 0:
+            rows = cursor.fetchmany(batch_size if remaining is None else min(batch_size, remaining))
+            if not rows:
+                return
+            yield columns, rows
+            if remaining is not None:
+                remaining -= len(rows)
+
+
+def iter_section_rows(token: str, batch_size: Optional[int] = None, registry=None,
+                      use_materialized: bool = True, limit: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Rows of a section after the token's offset as dicts, read in fetchmany batches from one
+    live cursor. At most `limit` rows when given; otherwise everything that remains.
+    """
+    for columns, rows in iter_section_batches(token, batch_size, registry, use_materialized, limit):
+        for row in rows:
+            yield dict(zip(columns, row))
+
+
+def fetch_section_page(token: str, page_size: Optional[int] = None, registry=None,
+                       use_materialized: bool = True) -> Dict[str, Any]:
+    """
+    Next page for a continuation token: {"content": rows, "pagination": {...}} with a new
+    token while rows remain.
+    """
+    state = decode_continuation(token)
+    page_size = page_size or state["page_size"]
+    rows = list(iter_section_rows(token, batch_size=page_size + 1, registry=registry,
+                                  use_materialized=use_materialized, limit=page_size + 1))
+    page, has_more = paginate_rows(rows, page_size)
+    next_offset = state["offset"] + len(page)
+    return {
+        "content": page,
+        "pagination": {
+            "offset": state["offset"],
+            "page_size": page_size,
+            "rows": len(page),
+            "has_more": has_more,
+            "continuation_token": encode_continuation({
+                **{key: value for key, value in state.items() if key != "v"},
+                "offset": next_offset, "page_size": page_size
+            }) if has_more else None
+        }
+    }
+
+
+def write_rows(rows: Iterable[Dict[str, Any]], out: TextIO, fmt: str = "csv", header: bool = True) -> int:
+    """Write rows to a text stream as they arrive; returns the number of rows written"""
+    if fmt not in STREAM_FORMATS:
+        raise ValueError(f"Unsupported stream format '{fmt}'; expected one of {STREAM_FORMATS}")
+
+    count = 0
+    writer = None
+    for row in rows:
+        if fmt == "csv":
+            if writer is None:
+                writer = csv.DictWriter(out, fieldnames=list(row.keys()))
+                if header:
+                    writer.writeheader()
+            writer.writerow(row)
+        elif fmt == "jsonl":
+            out.write(json.dumps(row, default=str) + "\n")
+        else:
+            out.write(format_row_markdown(row))
+        count += 1
+    return count
+
+
+def stream_section(token: str, out: TextIO, fmt: str = "csv", batch_size: Optional[int] = None,
+                   header: bool = True, registry=None, use_materialized: bool = True) -> int:
+    """Stream every row after a section's first page to `out`; returns the rows written"""
+    written = write_rows(
+        iter_section_rows(token, batch_size=batch_size, registry=registry, use_materialized=use_materialized),
+        out, fmt=fmt, header=header
+    )
+    logger.info(f"📤 Streamed {written} section rows as {fmt}")
+    return written
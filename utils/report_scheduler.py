@@ -0,0 +1,395 @@
+"""
+utils/report_scheduler.py
+In-process scheduler for template reports. Every template in a data product's suite becomes
+a job in a local SQLite job table (next to the data catalog) with its template `schedule`
+and `recipients`. Due jobs on the same database whose queries read overlapping tables are
+coalesced and generated in one pass; groups run on a bounded worker pool. A job is skipped
+when its database fingerprint has not changed since its last successful run. Outputs
+(markdown and JSON) are written under the results directory.
+"""
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import argparse
+import threading
+from pathlib import Path
+from datetime import datetime, timedelta
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional
+from models.data_models import PlatformConfig
+from utils.change_detection import get_change_detector, normalize_db_path
+from utils.report_generator import save_report_as_markdown
+from utils.template_registry import get_template_registry
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_FILENAME = "scheduler.db"
+SCHEDULES = ("hourly", "daily", "weekly", "monthly")
+
+_SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS report_jobs (
+    job_id TEXT PRIMARY KEY,
+    db_path TEXT NOT NULL,
+    data_product TEXT NOT NULL,
+    report_type TEXT NOT NULL,
+    schedule TEXT NOT NULL,
+    recipients_json TEXT NOT NULL DEFAULT '[]',
+    data_sources_json TEXT NOT NULL DEFAULT '[]',
+    enabled INTEGER NOT NULL DEFAULT 1,
+    next_run_at TEXT NOT NULL,
+    last_run_at TEXT,
+    last_status TEXT,
+    last_fingerprint TEXT,
+    last_output TEXT,
+    last_duration_ms REAL,
+    runs INTEGER NOT NULL DEFAULT 0,
+    skips INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS idx_report_jobs_due ON report_jobs (enabled, next_run_at);
+"""
+
+
+def next_run_time(schedule: str, after: datetime, run_hour: int = 2) -> datetime:
+    """
+    Next run strictly after `after`. Daily and longer schedules run at `run_hour` (overnight
+    by default); weekly runs on Mondays and monthly on the first of the month.
+    """
+    schedule = schedule.lower().strip()
+    if schedule == "hourly":
+        return after.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+    candidate = after.replace(hour=run_hour, minute=0, second=0, microsecond=0)
+    if schedule == "weekly":
+        candidate += timedelta(days=(7 - candidate.weekday()) % 7)
+        return candidate if candidate > after else candidate + timedelta(days=7)
+    if schedule == "monthly":
+        candidate = candidate.replace(day=1)
+        if candidate > after:
+            return candidate
+        year, month = (candidate.year + 1, 1) if candidate.month == 12 else (candidate.year, candidate.month + 1)
+        return candidate.replace(year=year, month=month)
+    # Daily, and the fallback for unrecognized schedules
+    return candidate if candidate > after else candidate + timedelta(days=1)
+
+
+class ReportScheduler:
+    """
+    Local job table plus a runner for due template reports.
+
+    `run_pending()` performs one scheduling pass; `start()` runs passes on a background
+    thread until `stop()`.
+    """
+
+    def __init__(self, scheduler_path: Optional[str] = None, output_dir: Optional[str] = None,
+                 max_workers: Optional[int] = None, run_hour: int = 2):
+        config = PlatformConfig()
+        if scheduler_path is None:
+            scheduler_path = str(Path(config.data_catalog_path) / SCHEDULER_FILENAME)
+        self.scheduler_path = Path(scheduler_path)
+        self.scheduler_path.parent.mkdir(parents=True, exist_ok=True)
+        self.output_dir = Path(output_dir or config.results_path) / "scheduled"
+        self.max_workers = max_workers or config.max_concurrent_tasks
+        self.run_hour = run_hour
+        self._run_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        conn = self._connect()
+        try:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA_SQL)
+            conn.commit()
+        finally:
+            conn.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.scheduler_path)
+        conn.row_factory = sqlite3.Row
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    @staticmethod
+    def job_id(db_path: str, data_product: str, report_type: str) -> str:
+        return hashlib.sha1(f"{db_path}|{data_product}|{report_type}".encode("utf-8")).hexdigest()[:16]
+
+    # ------------------------------------------------------------------
+    # Job table
+    # ------------------------------------------------------------------
+
+    def schedule_templates(self, db_path: str, data_sources: Optional[List[str]] = None,
+                           data_products: Optional[List[str]] = None) -> int:
+        """
+        Create or update a job for every suite template of a database. New jobs are due
+        immediately; existing jobs keep their next run unless their schedule changed.
+        Returns the number of jobs scheduled.
+        """
+        db_path = normalize_db_path(db_path)
+        if data_sources is None:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                data_sources = [row[0] for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type='table' AND name NOT LIKE 'sqlite_%'"
+                )]
+            finally:
+                conn.close()
+
+        registry = get_template_registry()
+        now = datetime.now().isoformat()
+        scheduled = 0
+        conn = self._connect()
+        try:
+            for product in registry.suites:
+                if data_products and product not in data_products:
+                    continue
+                for compiled in registry.suite(product):
+                    schedule = str(compiled.template.get("schedule", "monthly")).lower()
+                    conn.execute(
+                        """INSERT INTO report_jobs
+                           (job_id, db_path, data_product, report_type, schedule, recipients_json,
+                            data_sources_json, next_run_at)
+                           VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                           ON CONFLICT(job_id) DO UPDATE SET
+                               next_run_at = CASE WHEN report_jobs.schedule != excluded.schedule
+                                                  THEN excluded.next_run_at ELSE report_jobs.next_run_at END,
+                               schedule = excluded.schedule,
+                               recipients_json = excluded.recipients_json,
+                               data_sources_json = excluded.data_sources_json""",
+                        (self.job_id(db_path, product, compiled.report_type), db_path, product,
+                         compiled.report_type, schedule, json.dumps(compiled.template.get("recipients", [])),
+                         json.dumps(sorted(data_sources)), now)
+                    )
+                    scheduled += 1
+            conn.commit()
+        finally:
+            conn.close()
+        logger.info(f"🗓️ Scheduled {scheduled} reports for {db_path}")
+        return scheduled
+
+    def list_jobs(self, db_path: Optional[str] = None) -> List[Dict[str, Any]]:
+        conn = self._connect()
+        try:
+            sql = "SELECT * FROM report_jobs"
+            params: tuple = ()
+            if db_path:
+                sql += " WHERE db_path = ?"
+                params = (normalize_db_path(db_path),)
+            return [dict(row) for row in conn.execute(sql + " ORDER BY next_run_at, report_type", params)]
+        finally:
+            conn.close()
+
+    def set_enabled(self, job_id: str, enabled: bool) -> None:
+        conn = self._connect()
+        try:
+            conn.execute("UPDATE report_jobs SET enabled = ? WHERE job_id = ?", (int(enabled), job_id))
+            conn.commit()
+        finally:
+            conn.close()
+
+    def due_jobs(self, now: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        now = now or datetime.now()
+        conn = self._connect()
+        try:
+            return [dict(row) for row in conn.execute(
+                "SELECT * FROM report_jobs WHERE enabled = 1 AND next_run_at <= ? ORDER BY next_run_at",
+                (now.isoformat(),)
+            )]
+        finally:
+            conn.close()
+
+    def _record(self, job: Dict[str, Any], now: datetime, status: str, fingerprint: Optional[str] = None,
+                output: Optional[str] = None, duration_ms: Optional[float] = None) -> None:
+        next_run = next_run_time(job["schedule"], now, self.run_hour).isoformat()
+        conn = self._connect()
+        try:
+            if status == "skipped":
+                conn.execute(
+                    "UPDATE report_jobs SET next_run_at = ?, last_status = ?, skips = skips + 1 WHERE job_id = ?",
+                    (next_run, status, job["job_id"])
+                )
+            else:
+                conn.execute(
+                    """UPDATE report_jobs SET next_run_at = ?, last_run_at = ?, last_status = ?,
+                           last_fingerprint = COALESCE(?, last_fingerprint), last_output = COALESCE(?, last_output),
+                           last_duration_ms = ?, runs = runs + 1
+                       WHERE job_id = ?""",
+                    (next_run, now.isoformat(), status, fingerprint, output, duration_ms, job["job_id"])
+                )
+            conn.commit()
+        finally:
+            conn.close()
+
+    # ------------------------------------------------------------------
+    # Running
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _coalesce(jobs: List[Dict[str, Any]]) -> List[List[Dict[str, Any]]]:
+        """Group jobs of the same database and allowed sources whose template queries read overlapping tables"""
+        registry = get_template_registry()
+        groups: List[Dict[str, Any]] = []
+        for job in jobs:
+            compiled = registry.get(job["report_type"], job["data_product"])
+            tables = set().union(*(query.tables for query in compiled.queries)) if compiled else set()
+            target = (job["db_path"], job["data_sources_json"])
+            overlapping = [g for g in groups if g["target"] == target and g["tables"] & tables]
+            merged = {"target": target, "tables": set(tables), "jobs": [job]}
+            for group in overlapping:
+                merged["tables"] |= group["tables"]
+                merged["jobs"] = group["jobs"] + merged["jobs"]
+                groups.remove(group)
+            groups.append(merged)
+        return [group["jobs"] for group in groups]
+
+    def _output_path(self, job: Dict[str, Any]) -> Path:
+        return self.output_dir / Path(job["db_path"]).stem / job["report_type"]
+
+    def _run_group(self, jobs: List[Dict[str, Any]], fingerprint: str, now: datetime) -> List[Dict[str, Any]]:
+        """Generate a coalesced group of reports in one pass and write their outputs"""
+        from tools.analytics_tools import ReportGenerationTool
+
+        registry = get_template_registry()
+        db_path = jobs[0]["db_path"]
+        templates = [registry.get(job["report_type"], job["data_product"]) for job in jobs]
+        start = time.perf_counter()
+        outcome = ReportGenerationTool().generate_reports(
+            db_path, [compiled for compiled in templates if compiled],
+            {"data_sources": json.loads(jobs[0]["data_sources_json"])}
+        )
+        duration_ms = round((time.perf_counter() - start) * 1000, 3)
+
+        results = []
+        for job in jobs:
+            report = outcome["reports"].get(job["report_type"])
+            if report is None or "error" in report:
+                self._record(job, now, "failed", duration_ms=duration_ms)
+                results.append({"job_id": job["job_id"], "report_type": job["report_type"], "status": "failed"})
+                continue
+            report["recipients"] = json.loads(job["recipients_json"])
+            base = self._output_path(job)
+            base.parent.mkdir(parents=True, exist_ok=True)
+            base.with_suffix(".json").write_text(json.dumps(report, indent=2, default=str), encoding="utf-8")
+            output = save_report_as_markdown(report, base.with_suffix(".md"))
+            self._record(job, now, "succeeded", fingerprint, output, duration_ms)
+            results.append({"job_id": job["job_id"], "report_type": job["report_type"], "status": "succeeded",
+                            "output": output})
+        logger.info(f"🗓️ Generated {len(jobs)} scheduled reports for {db_path} in {duration_ms} ms")
+        return results
+
+    def run_pending(self, now: Optional[datetime] = None, force: bool = False) -> Dict[str, Any]:
+        """
+        One scheduling pass: run every due job, skipping those whose database is unchanged
+        since their last successful run (unless `force`). Returns counts and per-job results.
+        """
+        with self._run_lock:
+            now = now or datetime.now()
+            detector = get_change_detector()
+            fingerprints: Dict[str, Optional[str]] = {}
+            to_run, results = [], []
+            for job in self.due_jobs(now):
+                if job["db_path"] not in fingerprints:
+                    try:
+                        fingerprints[job["db_path"]] = detector.fingerprint(job["db_path"]).digest
+                    except (OSError, sqlite3.Error) as e:
+                        logger.warning(f"⚠️ Cannot read {job['db_path']} for scheduled reports: {e}")
+                        fingerprints[job["db_path"]] = None
+                fingerprint = fingerprints[job["db_path"]]
+                if fingerprint is None:
+                    self._record(job, now, "failed")
+                    results.append({"job_id": job["job_id"], "report_type": job["report_type"], "status": "failed"})
+                elif (not force and job["last_status"] in ("succeeded", "skipped")
+                        and job["last_fingerprint"] == fingerprint
+                        and job["last_output"] and Path(job["last_output"]).exists()):
+                    self._record(job, now, "skipped")
+                    results.append({"job_id": job["job_id"], "report_type": job["report_type"], "status": "skipped"})
+                else:
+                    to_run.append(job)
+
+            groups = self._coalesce(to_run)
+            if groups:
+                workers = min(len(groups), self.max_workers)
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-scheduler") as executor:
+                    futures = [executor.submit(self._run_group, group, fingerprints[group[0]["db_path"]], now)
+                               for group in groups]
+                    for group, future in zip(groups, futures):
+                        try:
+                            results.extend(future.result())
+                        except Exception as e:
+                            logger.error(f"❌ Scheduled report group failed: {e}")
+                            for job in group:
+                                self._record(job, now, "failed")
+                                results.append({"job_id": job["job_id"], "report_type": job["report_type"],
+                                                "status": "failed", "error": str(e)})
+
+            summary = {
+                status: sum(1 for item in results if item["status"] == status)
+                for status in ("succeeded", "skipped", "failed")
+            }
+            summary["groups"] = len(groups)
+            summary["results"] = results
+            if results:
+                logger.info(f"🗓️ Scheduler pass: {len(results)} due, {len(groups)} groups, "
+                            f"{summary['succeeded']} generated, {summary['skipped']} unchanged, {summary['failed']} failed")
+            return summary
+
+    def start(self, interval_seconds: int = 60) -> None:
+        """Run scheduling passes on a daemon thread every `interval_seconds`"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def loop():
+            while not self._stop.is_set():
+                try:
+                    self.run_pending()
+                except Exception as e:
+                    logger.error(f"❌ Scheduler pass failed: {e}")
+                self._stop.wait(interval_seconds)
+
+        self._thread = threading.Thread(target=loop, name="report-scheduler", daemon=True)
+        self._thread.start()
+        logger.info(f"🗓️ Report scheduler started (every {interval_seconds}s)")
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+
+
+_scheduler: Optional[ReportScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_report_scheduler() -> ReportScheduler:
+    """Process-wide report scheduler"""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = ReportScheduler()
+        return _scheduler
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Run scheduled template reports")
+    parser.add_argument("db_paths", nargs="*", help="Databases to schedule every suite template for")
+    parser.add_argument("--data-product", action="append", help="Only schedule these data products")
+    parser.add_argument("--force", action="store_true", help="Run due reports even if the data is unchanged")
+    parser.add_argument("--loop", type=int, metavar="SECONDS", help="Keep running passes at this interval")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+    scheduler = get_report_scheduler()
+    for path in args.db_paths:
+        scheduler.schedule_templates(path, data_products=args.data_product)
+    if args.loop:
+        scheduler.start(args.loop)
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            scheduler.stop()
+    else:
+        outcome = scheduler.run_pending(force=args.force)
+        print(json.dumps({key: value for key, value in outcome.items() if key != "results"}, indent=2))
@@ -213,6 +213,7 @@ def create_report_templates():
                 "type": "revenue_margin_report",
                 "schedule": "Daily",
                 "recipients": ["sales@company.com", "management@company.com"],
+                "time_window": {"table": "orders", "column": "order_date"},
                 "parameters": {
                     "days_back": 30,
                     "include_products": True,
@@ -223,6 +224,7 @@ def create_report_templates():
                     -- Daily/weekly/monthly GMV
                     SELECT strftime('%Y-%m-%d', order_date) AS day, SUM(total_amount) AS daily_gmv
                     FROM orders
+                    WHERE order_date >= :window_start AND order_date < :window_end
                     GROUP BY day
                     ORDER BY day DESC;
                     """,
@@ -231,6 +233,7 @@ def create_report_templates():
                     SELECT p.category, SUM(s.total_price) AS revenue
                     FROM sales s
                     JOIN products p ON s.product_id = p.product_id
+                    WHERE s.sale_date >= :window_start AND s.sale_date < :window_end
                     GROUP BY p.category
                     ORDER BY revenue DESC;
                     """,
@@ -243,6 +246,7 @@ def create_report_templates():
                         SUM(o.net_amount) - IFNULL(SUM(r.refund_amount), 0) AS net_revenue
                     FROM orders o
                     LEFT JOIN returns r ON o.order_id = r.order_id
+                    WHERE o.order_date >= :window_start AND o.order_date < :window_end
                     GROUP BY month
                     ORDER BY month DESC;
                     """
@@ -298,6 +302,7 @@ def create_report_templates():
                 "type": "product_sales_performance_report", 
                 "schedule": "Monthly",
                 "recipients": ["operations@company.com", "purchasing@company.com"],
+                "time_window": {"table": "sales", "column": "sale_date"},
                 "parameters": {
                     "days_back": 30,
                     "include_categories": True
@@ -308,6 +313,7 @@ def create_report_templates():
                     SELECT p.sku, p.product_name, SUM(s.quantity) AS units_sold, SUM(s.total_price) AS total_revenue
                     FROM sales s
                     JOIN products p ON s.product_id = p.product_id
+                    WHERE s.sale_date >= :window_start AND s.sale_date < :window_end
                     GROUP BY p.product_id
                     ORDER BY units_sold DESC
                     LIMIT 10;
@@ -317,6 +323,7 @@ def create_report_templates():
                     SELECT p.category, COUNT(DISTINCT s.sale_id) AS total_sales, SUM(s.total_price) AS revenue
                     FROM sales s
                     JOIN products p ON s.product_id = p.product_id
+                    WHERE s.sale_date >= :window_start AND s.sale_date < :window_end
                     GROUP BY p.category;
                     """,
                     """
@@ -336,6 +343,7 @@ def create_report_templates():
                 "type": "sales_by_channel_campaign_report", 
                 "schedule": "Monthly",
                 "recipients": ["operations@company.com", "purchasing@company.com"],
+                "time_window": {"table": "orders", "column": "order_date"},
                 "parameters": {
                     "days_back": 30,
                     "include_categories": True
@@ -345,6 +353,7 @@ def create_report_templates():
                     -- Sales by source/channel
                     SELECT o.channel, COUNT(DISTINCT o.order_id) AS orders, SUM(o.net_amount) AS revenue
                     FROM orders o
+                    WHERE o.order_date >= :window_start AND o.order_date < :window_end
                     GROUP BY o.channel
                     ORDER BY revenue DESC;
                     """,
@@ -553,6 +562,7 @@ def create_report_templates():
                 "type": "inventory_turnover_report", 
                 "schedule": "Monthly",
                 "recipients": ["operations@company.com", "purchasing@company.com"],
+                "time_window": {"table": "sales", "column": "sale_date"},
                 "parameters": {
                     "days_back": 30,
                     "include_categories": True
@@ -591,7 +601,7 @@ def create_report_templates():
                     FROM inventory i
                     JOIN products p ON i.product_id = p.product_id
                     JOIN sales s ON p.product_id = s.product_id
-                    WHERE s.sale_date >= date('now', '-30 days')
+                    WHERE s.sale_date >= :window_start AND s.sale_date < :window_end
                     GROUP BY p.product_id;
                     """
                 ],
@@ -974,6 +984,7 @@ def create_report_templates():
                 "type": "profit_loss_report",
                 "schedule": "Daily",
                 "recipients": ["sales@company.com", "management@company.com"],
+                "time_window": {"table": "sales", "column": "sale_date"},
                 "parameters": {
                     "days_back": 30,
                     "include_products": True,
@@ -989,6 +1000,7 @@ def create_report_templates():
                       SUM(s.total_price) - SUM(p.cost * s.quantity) AS gross_profit
                     FROM sales s
                     JOIN products p ON s.product_id = p.product_id
+                    WHERE s.sale_date >= :window_start AND s.sale_date < :window_end
                     GROUP BY p.category
                     ORDER BY gross_profit DESC;
                     """,
@@ -1001,7 +1013,8 @@ def create_report_templates():
                       o.discount_amount + o.shipping_amount AS expenses,
                       o.net_amount - IFNULL(r.refund_amount, 0) - (o.discount_amount + o.shipping_amount) AS net_margin
                     FROM orders o
-                    LEFT JOIN returns r ON o.order_id = r.order_id;
+                    LEFT JOIN returns r ON o.order_id = r.order_id
+                    WHERE o.order_date >= :window_start AND o.order_date < :window_end;
                     """,
                     """
                     -- Profitability by customer segment
@@ -1014,6 +1027,7 @@ def create_report_templates():
                     JOIN orders o ON s.order_id = o.order_id
                     JOIN customers c ON o.customer_id = c.customer_id
                     JOIN products p ON s.product_id = p.product_id
+                    WHERE s.sale_date >= :window_start AND s.sale_date < :window_end
                     GROUP BY c.customer_segment
                     ORDER BY profit DESC;
                     """
@@ -1071,6 +1085,7 @@ def create_report_templates():
                 "type": "sales_and_revenue_accounting_report", 
                 "schedule": "Monthly",
                 "recipients": ["operations@company.com", "purchasing@company.com"],
+                "time_window": {"table": "orders", "column": "order_date"},
                 "parameters": {
                     "days_back": 30,
                     "include_categories": True
@@ -1085,12 +1100,14 @@ def create_report_templates():
                       SUM(p.amount) FILTER (WHERE p.status = 'Completed') AS revenue
                     FROM orders o
                     LEFT JOIN payments p ON o.order_id = p.order_id
+                    WHERE o.order_date >= :window_start AND o.order_date < :window_end
                     GROUP BY month;
                     """,
                     """
                     -- Payment method distribution
                     SELECT payment_method, COUNT(*) AS total_transactions, SUM(amount) AS total_value
                     FROM payments
+                    WHERE payment_date >= :window_start AND payment_date < :window_end
                     GROUP BY payment_method
                     ORDER BY total_value DESC;
                     """,
@@ -1100,6 +1117,7 @@ def create_report_templates():
                       channel,
                       SUM(net_amount) AS revenue
                     FROM orders
+                    WHERE order_date >= :window_start AND order_date < :window_end
                     GROUP BY channel
                     ORDER BY revenue DESC;
                     """
@@ -1112,6 +1130,7 @@ def create_report_templates():
                 "type": "COGS_logistics_report", 
                 "schedule": "Monthly",
                 "recipients": ["operations@company.com", "purchasing@company.com"],
+                "time_window": {"table": "sales", "column": "sale_date"},
                 "parameters": {
                     "days_back": 30,
                     "include_categories": True
@@ -1122,6 +1141,7 @@ def create_report_templates():
                     SELECT p.category, SUM(p.cost * s.quantity) AS total_cogs
                     FROM sales s
                     JOIN products p ON s.product_id = p.product_id
+                    WHERE s.sale_date >= :window_start AND s.sale_date < :window_end
                     GROUP BY p.category
                     ORDER BY total_cogs DESC;
                     """,
@@ -1189,6 +1209,7 @@ def create_report_templates():
                 "type": "tax_and_compliance_report", 
                 "schedule": "Monthly",
                 "recipients": ["operations@company.com", "purchasing@company.com"],
+                "time_window": {"table": "orders", "column": "order_date"},
                 "parameters": {
                     "days_back": 30,
                     "include_categories": True
@@ -1199,6 +1220,7 @@ def create_report_templates():
                     SELECT shipping_state,
                            SUM(tax_amount) AS total_tax_collected
                     FROM orders
+                    WHERE order_date >= :window_start AND order_date < :window_end
                     GROUP BY shipping_state
                     ORDER BY total_tax_collected DESC;
                     """,
@@ -0,0 +1,634 @@
+"""
+utils/sql_analysis.py
+Lightweight SQL analysis for SQLite: comment stripping, EXPLAIN QUERY PLAN parsing,
+authorizer-based column references and clause-level column usage (predicates,
+joins, GROUP BY, ORDER BY) used by the performance tools, named bind parameters, plus
+recognition of decomposable single-table aggregate queries (and their time-bucket group
+keys) for materialized aggregates.
+"""
+import re
+import time
+import sqlite3
+import statistics
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Any, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+_LINE_COMMENT = re.compile(r"--[^\n]*")
+_BLOCK_COMMENT = re.compile(r"/\*.*?\*/", re.DOTALL)
+
+_SQL_KEYWORDS = {
+    "WHERE", "JOIN", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "FULL", "NATURAL", "ON", "USING",
+    "GROUP", "ORDER", "HAVING", "LIMIT", "OFFSET", "UNION", "EXCEPT", "INTERSECT", "WINDOW", "AS", "SELECT"
+}
+
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN)\s+([A-Za-z_]\w*)(?:\s+(?:AS\s+)?([A-Za-z_]\w*))?", re.IGNORECASE)
+
+# column (optionally qualified) followed by a comparison; columns wrapped in functions are skipped
+_PREDICATE = re.compile(
+    r"(?<![\w.(])(?:([A-Za-z_]\w*)\.)?([A-Za-z_]\w*)\s*(==|=|<=|>=|<>|!=|<|>|\bIN\b|\bBETWEEN\b|\bIS\b|\bLIKE\b)",
+    re.IGNORECASE
+)
+_JOIN_RHS = re.compile(r"=\s*(?:([A-Za-z_]\w*)\.)([A-Za-z_]\w*)")
+
+_WRITE_KEYWORDS = re.compile(
+    r"^\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER|ATTACH|DETACH|VACUUM|REINDEX|ANALYZE|PRAGMA|BEGIN|COMMIT|ROLLBACK|SAVEPOINT|RELEASE)\b",
+    re.IGNORECASE
+)
+
+_EQUALITY_OPS = {"=", "==", "IN", "IS"}
+_RANGE_OPS = {"<", ">", "<=", ">=", "BETWEEN"}
+
+
+def strip_sql_comments(sql: str) -> str:
+    return _LINE_COMMENT.sub(" ", _BLOCK_COMMENT.sub(" ", sql))
+
+
+def normalize_sql(sql: str) -> str:
+    """Comment-free, single-spaced statement without a trailing semicolon"""
+    return re.sub(r"\s+", " ", strip_sql_comments(sql)).strip().rstrip(";").strip()
+
+
+def is_read_only_sql(sql: str) -> bool:
+    """Keyword-level check that a single statement only reads (SELECT / WITH ... SELECT / VALUES)"""
+    statement = normalize_sql(sql)
+    if not statement or ";" in statement:
+        return False
+    if _WRITE_KEYWORDS.match(statement):
+        return False
+    if re.match(r"^\s*WITH\b", statement, re.IGNORECASE):
+        return not re.search(r"\b(INSERT|UPDATE|DELETE|REPLACE)\b", statement, re.IGNORECASE)
+    return bool(re.match(r"^\s*(SELECT|VALUES)\b", statement, re.IGNORECASE))
+
+
+# ----------------------------------------------------------------------
+# Query plans
+# ----------------------------------------------------------------------
+
+def explain_query_plan(conn: sqlite3.Connection, sql: str, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    """Flat EXPLAIN QUERY PLAN rows: id, parent, detail"""
+    rows = conn.execute(f"EXPLAIN QUERY PLAN {normalize_sql(sql)}", bind_parameters(sql, params)).fetchall()
+    return [{"id": row[0], "parent": row[1], "detail": row[3]} for row in rows]
+
+
+def build_plan_tree(plan_rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Nest plan rows under their parents"""
+    nodes = {row["id"]: {"detail": row["detail"], "children": []} for row in plan_rows}
+    roots = []
+    for row in plan_rows:
+        parent = nodes.get(row["parent"])
+        (parent["children"] if parent else roots).append(nodes[row["id"]])
+    return roots
+
+
+def format_plan_tree(tree: List[Dict[str, Any]], indent: int = 0) -> str:
+    lines = []
+    for node in tree:
+        lines.append(f"{'  ' * indent}{'|--' if indent else ''}{node['detail']}")
+        if node["children"]:
+            lines.append(format_plan_tree(node["children"], indent + 1))
+    return "\n".join(lines)
+
+
+def indexes_used(plan_rows: List[Dict[str, Any]]) -> List[str]:
+    """Index names referenced by SEARCH/SCAN steps"""
+    used = []
+    for row in plan_rows:
+        match = re.search(r"USING (?:COVERING )?INDEX (\S+)", row["detail"])
+        if match and match.group(1) not in used:
+            used.append(match.group(1))
+    return used
+
+
+def find_plan_issues(plan_rows: List[Dict[str, Any]], aliases: Optional[Dict[str, str]] = None) -> List[Dict[str, Any]]:
+    """
+    Full table scans (no index) and temporary B-trees for GROUP BY / ORDER BY / DISTINCT.
+    Plan details name tables by alias, so `aliases` maps them back to table names.
+    """
+    aliases = aliases or {}
+    issues = []
+    for row in plan_rows:
+        detail = row["detail"]
+        scan = re.match(r"^SCAN (\w+)(.*)$", detail)
+        if scan and "USING" not in scan.group(2) and not scan.group(1).startswith("CONSTANT"):
+            name = scan.group(1)
+            issues.append({"type": "full_scan", "table": aliases.get(name, name), "detail": detail})
+        temp = re.match(r"^USE TEMP B-TREE FOR (.+)$", detail)
+        if temp:
+            issues.append({"type": "temp_btree", "purpose": temp.group(1), "detail": detail})
+    return issues
+
+
+# ----------------------------------------------------------------------
+# Column references
+# ----------------------------------------------------------------------
+
+def referenced_columns(conn: sqlite3.Connection, sql: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Set[str]]:
+    """
+    Every (table, column) the statement reads, as reported by the SQLite authorizer while
+    the statement is prepared. Aliases, views and `*` are already resolved by SQLite.
+    """
+    columns: Dict[str, Set[str]] = {}
+
+    def authorizer(action, arg1, arg2, db_name, source):
+        if action == sqlite3.SQLITE_READ and arg1 and not arg1.startswith("sqlite_"):
+            columns.setdefault(arg1, set())
+            if arg2:
+                columns[arg1].add(arg2)
+        return sqlite3.SQLITE_OK
+
+    conn.set_authorizer(authorizer)
+    try:
+        conn.execute(f"EXPLAIN QUERY PLAN {normalize_sql(sql)}", bind_parameters(sql, params)).fetchall()
+    finally:
+        conn.set_authorizer(None)
+    return columns
+
+
+def table_aliases(sql: str) -> Dict[str, str]:
+    """alias -> table for every FROM/JOIN reference (tables map to themselves)"""
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(strip_sql_comments(sql)):
+        aliases[table] = table
+        if alias and alias.upper() not in _SQL_KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def _clauses(sql: str, start: str, stops: str) -> List[str]:
+    pattern = re.compile(rf"\b{start}\b(.*?)(?=\b(?:{stops})\b|$)", re.IGNORECASE | re.DOTALL)
+    return [match.group(1) for match in pattern.finditer(sql)]
+
+
+def _list_columns(clause: str) -> List[Tuple[Optional[str], str]]:
+    refs = []
+    for item in clause.split(","):
+        item = re.sub(r"\b(ASC|DESC|COLLATE\s+\w+|NULLS\s+(FIRST|LAST))\b", "", item, flags=re.IGNORECASE).strip()
+        match = re.fullmatch(r"(?:([A-Za-z_]\w*)\.)?([A-Za-z_]\w*)", item)
+        if match:
+            refs.append((match.group(1), match.group(2)))
+    return refs
+
+
+@dataclass
+class ColumnUsage:
+    """How a statement uses each table's columns, resolved to real table names"""
+    aliases: Dict[str, str] = field(default_factory=dict)
+    read_columns: Dict[str, Set[str]] = field(default_factory=dict)
+    equality: Dict[str, List[str]] = field(default_factory=dict)
+    ranges: Dict[str, List[str]] = field(default_factory=dict)
+    joins: Dict[str, List[str]] = field(default_factory=dict)
+    group_by: Dict[str, List[str]] = field(default_factory=dict)
+    order_by: Dict[str, List[str]] = field(default_factory=dict)
+
+    def _resolve(self, qualifier: Optional[str], column: str) -> Optional[str]:
+        if qualifier:
+            table = self.aliases.get(qualifier)
+            return table if table and column in self.read_columns.get(table, set()) else None
+        owners = [table for table, cols in self.read_columns.items() if column in cols]
+        return owners[0] if len(owners) == 1 else None
+
+    def _add(self, bucket: Dict[str, List[str]], qualifier: Optional[str], column: str) -> None:
+        table = self._resolve(qualifier, column)
+        if table and column not in bucket.setdefault(table, []):
+            bucket[table].append(column)
+
+
+def analyze_column_usage(conn: sqlite3.Connection, sql: str, params: Optional[Dict[str, Any]] = None) -> ColumnUsage:
+    """Classify referenced columns by the clause they appear in (best effort, regex based)"""
+    statement = normalize_sql(sql)
+    usage = ColumnUsage(aliases=table_aliases(statement), read_columns=referenced_columns(conn, statement, params))
+
+    clause_stops = "GROUP|ORDER|HAVING|LIMIT|WINDOW|UNION|EXCEPT|INTERSECT"
+    join_stops = "JOIN|LEFT|INNER|CROSS|WHERE|" + clause_stops
+
+    for clause in _clauses(statement, "WHERE", clause_stops):
+        for qualifier, column, op in _PREDICATE.findall(clause):
+            op = op.upper()
+            if op in _EQUALITY_OPS:
+                usage._add(usage.equality, qualifier or None, column)
+            elif op in _RANGE_OPS:
+                usage._add(usage.ranges, qualifier or None, column)
+
+    for clause in _clauses(statement, "ON", join_stops):
+        for qualifier, column, op in _PREDICATE.findall(clause):
+            if op in ("=", "=="):
+                usage._add(usage.joins, qualifier or None, column)
+        for qualifier, column in _JOIN_RHS.findall(clause):
+            usage._add(usage.joins, qualifier, column)
+
+    for clause in _clauses(statement, r"GROUP\s+BY", "HAVING|ORDER|LIMIT|WINDOW|UNION|EXCEPT|INTERSECT"):
+        for qualifier, column in _list_columns(clause):
+            usage._add(usage.group_by, qualifier, column)
+
+    for clause in _clauses(statement, r"ORDER\s+BY", "LIMIT|OFFSET|UNION|EXCEPT|INTERSECT"):
+        for qualifier, column in _list_columns(clause):
+            usage._add(usage.order_by, qualifier, column)
+
+    return usage
+
+
+# ----------------------------------------------------------------------
+# Timing
+# ----------------------------------------------------------------------
+
+def time_query(conn: sqlite3.Connection, sql: str, repeat: int = 3, warmup: int = 1,
+               params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Wall-clock timing over `repeat` warm runs (results fully fetched)"""
+    statement = normalize_sql(sql)
+    bindings = bind_parameters(statement, params)
+    row_count = 0
+    for _ in range(warmup):
+        row_count = len(conn.execute(statement, bindings).fetchall())
+    timings = []
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        row_count = len(conn.execute(statement, bindings).fetchall())
+        timings.append(time.perf_counter() - start)
+    return {
+        "rows": row_count,
+        "runs": len(timings),
+        "median_ms": round(statistics.median(timings) * 1000, 3),
+        "min_ms": round(min(timings) * 1000, 3),
+        "max_ms": round(max(timings) * 1000, 3)
+    }
+
+
+# ----------------------------------------------------------------------
+# Decomposable aggregate queries
+# ----------------------------------------------------------------------
+
+_AGGREGATE_CALL = re.compile(r"\b(COUNT|SUM|TOTAL|AVG|MIN|MAX|GROUP_CONCAT)\s*\(", re.IGNORECASE)
+_NON_DETERMINISTIC = re.compile(
+    r"'now'|\brandom\s*\(|\bcurrent_(date|time|timestamp)\b|\bchanges\s*\(|\blast_insert_rowid\s*\(",
+    re.IGNORECASE
+)
+_CLAUSE_KEYWORDS = ["FROM", "WHERE", "GROUP BY", "HAVING", "ORDER BY", "LIMIT"]
+
+
+def split_top_level(text: str, separator: str = ",") -> List[str]:
+    """Split on a separator outside parentheses and quotes"""
+    parts, depth, quote, current = [], 0, None, []
+    for char in text:
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == separator and depth == 0:
+            parts.append("".join(current).strip())
+            current = []
+            continue
+        current.append(char)
+    if "".join(current).strip():
+        parts.append("".join(current).strip())
+    return parts
+
+
+def _top_level_keyword_positions(sql: str) -> Dict[str, int]:
+    """Offsets of clause keywords that appear outside parentheses and quotes"""
+    positions: Dict[str, int] = {}
+    depth, quote = 0, None
+    upper = sql.upper()
+    i = 0
+    while i < len(sql):
+        char = sql[i]
+        if quote:
+            if char == quote:
+                quote = None
+        elif char in ("'", '"'):
+            quote = char
+        elif char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif depth == 0 and (i == 0 or not (sql[i - 1].isalnum() or sql[i - 1] == "_")):
+            for keyword in _CLAUSE_KEYWORDS:
+                pattern = keyword.replace(" ", r"\s+")
+                match = re.match(rf"{pattern}\b", upper[i:])
+                if match and keyword not in positions:
+                    positions[keyword] = i
+                    i += match.end() - 1
+                    break
+        i += 1
+    return positions
+
+
+def _balanced(text: str) -> bool:
+    depth = 0
+    for char in text:
+        depth += char == "("
+        depth -= char == ")"
+        if depth < 0:
+            return False
+    return depth == 0
+
+
+def _squash(expr: str) -> str:
+    """Whitespace- and keyword-case-insensitive form of an expression; quoted text keeps its case"""
+    parts = re.split(r"('(?:[^']|'')*'|\"(?:[^\"]|\"\")*\")", expr)
+    return "".join(part if part[:1] in ("'", '"') else re.sub(r"\s+", "", part).lower() for part in parts)
+
+
+@dataclass
+class AggregateItem:
+    """One output column of an aggregate query"""
+    expression: str
+    name: str
+    function: Optional[str] = None   # COUNT/SUM/TOTAL/AVG/MIN/MAX for aggregates, None for group keys
+    argument: Optional[str] = None
+    filter_clause: Optional[str] = None
+
+
+@dataclass
+class AggregateQuery:
+    """Single-table GROUP BY query whose aggregates can be merged from partial results"""
+    sql: str
+    table: str
+    table_alias: Optional[str]
+    where: Optional[str]
+    items: List[AggregateItem]
+    group_by: List[str]
+    having: Optional[str]
+    order_by: Optional[str]
+    limit: Optional[str]
+
+    @property
+    def group_items(self) -> List[AggregateItem]:
+        return [item for item in self.items if item.function is None]
+
+    @property
+    def aggregate_items(self) -> List[AggregateItem]:
+        return [item for item in self.items if item.function is not None]
+
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _expression_pattern(expression: str) -> "re.Pattern":
+    """Whitespace-insensitive pattern for an expression as a whole token"""
+    body = r"\s*".join(re.escape(char) for char in expression if not char.isspace())
+    return re.compile(rf"(?<![\w.]){body}(?!\w)", re.IGNORECASE)
+
+
+def rewrite_output_clause(query: "AggregateQuery", clause: Optional[str]) -> Optional[str]:
+    """
+    Point a HAVING / ORDER BY clause at the query's output column names, so it can be
+    applied on top of precomputed aggregates. Raises ValueError if an aggregate remains.
+    """
+    if not clause:
+        return clause
+    items = sorted(
+        (item for item in query.items if item.function or item.expression != item.name),
+        key=lambda item: len(item.expression), reverse=True
+    )
+    for item in items:
+        clause = _expression_pattern(item.expression).sub(quote_identifier(item.name), clause)
+    if _AGGREGATE_CALL.search(clause):
+        raise ValueError(f"clause references an aggregate that is not selected: {clause}")
+    return clause
+
+
+def parse_aggregate_query(sql: str) -> Optional[AggregateQuery]:
+    """
+    Recognize `SELECT keys..., AGG(...)... FROM table [alias] [WHERE ...] GROUP BY keys
+    [HAVING ...] [ORDER BY ...] [LIMIT ...]` with COUNT/SUM/TOTAL/AVG/MIN/MAX aggregates
+    (optionally with FILTER). Returns None for anything that cannot be maintained
+    incrementally: joins, subqueries, DISTINCT, nested aggregates, non-deterministic filters.
+    """
+    statement = normalize_sql(sql)
+    match = re.match(r"^SELECT\s+(?!DISTINCT\b)", statement, re.IGNORECASE)
+    if not match or statement.upper().count("SELECT") != 1 or _NON_DETERMINISTIC.search(statement):
+        return None
+
+    positions = _top_level_keyword_positions(statement)
+    if "FROM" not in positions or "GROUP BY" not in positions:
+        return None
+    ordered = sorted(positions.items(), key=lambda kv: kv[1])
+    if [k for k, _ in ordered] != [k for k in _CLAUSE_KEYWORDS if k in positions]:
+        return None
+
+    def clause(keyword: str) -> Optional[str]:
+        if keyword not in positions:
+            return None
+        start = positions[keyword] + len(re.match(keyword.replace(" ", r"\s+"), statement[positions[keyword]:], re.IGNORECASE).group(0))
+        later = [pos for _, pos in ordered if pos > positions[keyword]]
+        return statement[start:later[0] if later else len(statement)].strip()
+
+    select_list = statement[match.end():positions["FROM"]].strip()
+    from_match = re.fullmatch(r"([A-Za-z_]\w*)(?:\s+(?:AS\s+)?([A-Za-z_]\w*))?", clause("FROM") or "", re.IGNORECASE)
+    if not from_match or (from_match.group(2) or "").upper() in _SQL_KEYWORDS:
+        return None
+
+    items = []
+    for raw in split_top_level(select_list):
+        alias_match = re.fullmatch(r"(.*?)\s+AS\s+\"?([A-Za-z_]\w*)\"?", raw, re.IGNORECASE | re.DOTALL)
+        expression, name = (alias_match.group(1).strip(), alias_match.group(2)) if alias_match else (raw, raw)
+        qualified = re.fullmatch(r"[A-Za-z_]\w*\.([A-Za-z_]\w*)", name)
+        if qualified:
+            name = qualified.group(1)  # SQLite names `t.col` output columns `col`
+        if expression == "*":
+            return None
+
+        agg = re.fullmatch(
+            r"(COUNT|SUM|TOTAL|AVG|MIN|MAX)\s*\((.*)\)(?:\s*FILTER\s*\(\s*WHERE\s+(.*)\))?",
+            expression, re.IGNORECASE | re.DOTALL
+        )
+        if agg and _balanced(agg.group(2)) and (agg.group(3) is None or _balanced(agg.group(3))):
+            argument = agg.group(2).strip()
+            if re.match(r"DISTINCT\b", argument, re.IGNORECASE) or _AGGREGATE_CALL.search(argument):
+                return None
+            items.append(AggregateItem(expression, name, agg.group(1).upper(), argument, agg.group(3)))
+        elif _AGGREGATE_CALL.search(expression):
+            return None  # aggregate wrapped in another expression, e.g. ROUND(AVG(x), 2)
+        else:
+            items.append(AggregateItem(expression, name))
+
+    group_by = split_top_level(clause("GROUP BY"))
+    group_items = [item for item in items if item.function is None]
+    resolved = []
+    for key in group_by:
+        owner = next((item for item in group_items if _squash(key) in (_squash(item.name), _squash(item.expression))), None)
+        if owner is None:
+            return None  # hidden group keys are not materialized
+        resolved.append(owner.expression)
+    if len(set(map(_squash, resolved))) != len(group_items) or not any(item.function for item in items):
+        return None
+
+    where = clause("WHERE")
+    if where and _AGGREGATE_CALL.search(where):
+        return None
+
+    return AggregateQuery(
+        sql=statement,
+        table=from_match.group(1),
+        table_alias=from_match.group(2),
+        where=where,
+        items=items,
+        group_by=resolved,
+        having=clause("HAVING"),
+        order_by=clause("ORDER BY"),
+        limit=clause("LIMIT")
+    )
+
+
+# ----------------------------------------------------------------------
+# Table dependencies
+# ----------------------------------------------------------------------
+
+# strftime formats whose labels sort in time order, with the SQL for the start of the bucket
+# holding the timestamp :ts (weeks are Monday-based and week 00 starts on January 1st)
+TIME_BUCKET_STARTS = {
+    "%Y": "date(:ts, 'start of year')",
+    "%Y-%m": "date(:ts, 'start of month')",
+    "%Y-%m-%d": "date(:ts)",
+    "%Y-%W": "max(date(:ts, '-6 days', 'weekday 1'), date(:ts, 'start of year'))"
+}
+
+_STRFTIME_BUCKET = re.compile(r"strftime\s*\(\s*'([^']*)'\s*,\s*((?:[A-Za-z_]\w*\.)?[A-Za-z_]\w*)\s*\)", re.IGNORECASE)
+_DATE_BUCKET = re.compile(r"date\s*\(\s*((?:[A-Za-z_]\w*\.)?[A-Za-z_]\w*)\s*\)", re.IGNORECASE)
+
+
+@dataclass
+class TimeBucket:
+    """A GROUP BY key that buckets a source date column, e.g. strftime('%Y-%m', order_date)"""
+    position: int   # index into AggregateQuery.group_by
+    column: str     # source column, as written in the query
+    format: str
+
+    @property
+    def start_sql(self) -> str:
+        return TIME_BUCKET_STARTS[self.format]
+
+
+def find_time_bucket(query: AggregateQuery) -> Optional[TimeBucket]:
+    """First group key of an aggregate query that is an ordered time bucket of a column, else None"""
+    for position, expression in enumerate(query.group_by):
+        match = _STRFTIME_BUCKET.fullmatch(expression.strip())
+        if match and match.group(1) in TIME_BUCKET_STARTS:
+            return TimeBucket(position, match.group(2), match.group(1))
+        match = _DATE_BUCKET.fullmatch(expression.strip())
+        if match:
+            return TimeBucket(position, match.group(1), "%Y-%m-%d")
+    return None
+
+
+_TOKEN = re.compile(
+    r"""\s+|'(?:[^']|'')*'|"(?:[^"]|"")*"|`[^`]*`|\[[^\]]*\]|[A-Za-z_][\w$]*|\d+(?:\.\d+)?|<=|>=|<>|!=|==|\|\||.""",
+    re.DOTALL
+)
+_CLAUSE_BREAKS = {"WHERE", "GROUP", "ORDER", "HAVING", "LIMIT", "UNION", "EXCEPT", "INTERSECT", "WINDOW", "ON", "USING"}
+
+
+def _tokens(sql: str) -> List[str]:
+    return [token for token in _TOKEN.findall(strip_sql_comments(sql)) if not token.isspace()]
+
+
+def _identifier(token: str) -> Optional[str]:
+    if token[:1] in ('"', "`", "["):
+        return token[1:-1]
+    if re.match(r"[A-Za-z_]", token) and token.upper() not in _SQL_KEYWORDS:
+        return token
+    return None
+
+
+def extract_table_dependencies(sql: str) -> Set[str]:
+    """
+    Tables a statement reads, from a token-level parse: FROM/JOIN targets and comma
+    joins at any nesting depth, minus CTE names and table-valued functions.
+    String literals and comments never produce false matches.
+    """
+    tokens = _tokens(sql)
+    upper = [token.upper() for token in tokens]
+    ctes = set()
+    for i, token in enumerate(upper):
+        # `WITH [RECURSIVE] name [(cols)] AS (` and `, name AS (` inside a WITH clause
+        if token == "AS" and i + 1 < len(tokens) and tokens[i + 1] == "(" and i >= 1:
+            j = i - 1
+            if tokens[j] == ")":
+                depth = 0
+                while j >= 0:
+                    depth += tokens[j] == ")"
+                    depth -= tokens[j] == "("
+                    if depth == 0:
+                        break
+                    j -= 1
+                j -= 1
+            if j >= 1 and upper[j - 1] in ("WITH", "RECURSIVE", ","):
+                name = _identifier(tokens[j])
+                if name:
+                    ctes.add(name.lower())
+
+    tables: Set[str] = set()
+    i = 0
+    while i < len(tokens):
+        if upper[i] in ("FROM", "JOIN"):
+            i += 1
+            while i < len(tokens):
+                if tokens[i] == "(":
+                    break  # subquery; its own FROM is picked up by the outer loop
+                name = _identifier(tokens[i])
+                if name is None:
+                    break
+                if i + 2 < len(tokens) and tokens[i + 1] == ".":
+                    i += 2  # schema-qualified
+                    name = _identifier(tokens[i]) or name
+                if i + 1 < len(tokens) and tokens[i + 1] == "(":
+                    break  # table-valued function
+                if name.lower() not in ctes:
+                    tables.add(name)
+                i += 1
+                if i < len(tokens) and upper[i] == "AS":
+                    i += 1
+                if i < len(tokens) and _identifier(tokens[i]) and upper[i] not in _CLAUSE_BREAKS:
+                    i += 1  # alias
+                if i < len(tokens) and tokens[i] == ",":
+                    i += 1
+                    continue
+                break
+            continue
+        i += 1
+    return tables
+
+
+def prepared_table_dependencies(conn: sqlite3.Connection, sql: str, params: Optional[Dict[str, Any]] = None) -> Set[str]:
+    """Tables SQLite itself resolves while preparing the statement (raises if it does not prepare)"""
+    tables: Set[str] = set()
+
+    def authorizer(action, arg1, arg2, db_name, source):
+        if action == sqlite3.SQLITE_READ and arg1 and not arg1.startswith("sqlite_"):
+            tables.add(arg1)
+        return sqlite3.SQLITE_OK
+
+    conn.set_authorizer(authorizer)
+    try:
+        conn.execute(f"EXPLAIN {normalize_sql(sql)}", bind_parameters(sql, params)).fetchall()
+    finally:
+        conn.set_authorizer(None)
+    return tables
+
+
+def extract_named_parameters(sql: str) -> Set[str]:
+    """Named bind parameters (:name or @name) outside comments and string literals"""
+    tokens = _tokens(sql)
+    return {
+        tokens[i + 1] for i in range(len(tokens) - 1)
+        if tokens[i] in (":", "@") and re.match(r"[A-Za-z_]\w*$", tokens[i + 1])
+    }
+
+
+def bind_parameters(sql: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Values for every named parameter of a statement, NULL where `params` has none. Plans and
+    table dependencies do not depend on the values, so unbound statements can still be
+    prepared and explained.
+    """
+    params = params or {}
+    return {name: params.get(name) for name in extract_named_parameters(sql)}
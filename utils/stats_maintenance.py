@@ -0,0 +1,145 @@
+"""
+utils/stats_maintenance.py
+Optimizer statistics maintenance: bounded ANALYZE runs after uploads and after data
+changes detected by the change detector, with refresh times recorded in the data catalog,
+plus indexes on the date columns report templates filter their time windows on or
+bucket their materialized aggregates by.
+"""
+import time
+import sqlite3
+import logging
+from datetime import datetime
+from typing import Dict, List, Any, Optional
+from utils.change_detection import get_change_detector, normalize_db_path
+from utils.data_catalog import get_data_catalog
+from utils.sql_analysis import quote_identifier, parse_aggregate_query, find_time_bucket
+from utils.template_registry import find_leading_index, get_template_registry
+
+logger = logging.getLogger(__name__)
+
+# Rows sampled per index by ANALYZE; keeps refreshes fast on large tables
+DEFAULT_ANALYSIS_LIMIT = 1000
+STATS_CONSUMER = "statistics"
+
+
+def refresh_statistics(db_path: str, analysis_limit: int = DEFAULT_ANALYSIS_LIMIT,
+                       method: str = "analyze") -> Dict[str, Any]:
+    """
+    Refresh sqlite_stat1 for a database.
+
+    Args:
+        db_path: Path to the SQLite file (a `sqlite:///` prefix is tolerated)
+        analysis_limit: Approximate rows examined per index (0 = no limit)
+        method: "analyze" (always re-analyze every table) or "optimize" (PRAGMA optimize,
+                which only re-analyzes tables SQLite thinks are stale)
+    """
+    db_path = normalize_db_path(db_path)
+    start = time.perf_counter()
+    conn = sqlite3.connect(db_path)
+    try:
+        had_stats = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type='table' AND name='sqlite_stat1'"
+        ).fetchone() is not None
+
+        conn.execute(f"PRAGMA analysis_limit = {int(analysis_limit)}")
+        # PRAGMA optimize cannot bootstrap statistics that were never gathered
+        if method == "optimize" and had_stats:
+            conn.execute("PRAGMA optimize")
+        else:
+            method = "analyze"
+            conn.execute("ANALYZE")
+        conn.commit()
+
+        tables_analyzed = conn.execute("SELECT COUNT(DISTINCT tbl) FROM sqlite_stat1").fetchone()[0]
+    finally:
+        conn.close()
+
+    duration_ms = round((time.perf_counter() - start) * 1000, 1)
+    # The new statistics are the baseline; only later data changes make them stale
+    fingerprint = get_change_detector().mark_processed(db_path, consumer=STATS_CONSUMER)
+
+    result = {
+        "db_path": db_path,
+        "method": method,
+        "analysis_limit": analysis_limit,
+        "tables_analyzed": tables_analyzed,
+        "duration_ms": duration_ms,
+        "refreshed_at": datetime.now().isoformat()
+    }
+    try:
+        get_data_catalog().record_statistics_refresh(db_path, fingerprint.digest, result)
+    except Exception as e:
+        logger.warning(f"⚠️ Could not record statistics refresh for {db_path}: {e}")
+
+    logger.info(f"📈 Refreshed optimizer statistics for {db_path} ({method}, {tables_analyzed} tables, {duration_ms} ms)")
+    return result
+
+
+def ensure_fresh_statistics(db_path: str, analysis_limit: int = DEFAULT_ANALYSIS_LIMIT) -> Optional[Dict[str, Any]]:
+    """Refresh statistics only when the database changed since the last refresh; returns None if fresh"""
+    try:
+        if not get_change_detector().has_changed(db_path, consumer=STATS_CONSUMER):
+            return None
+        return refresh_statistics(db_path, analysis_limit)
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"⚠️ Statistics maintenance skipped for {db_path}: {e}")
+        return None
+
+
+def statistics_freshness(db_path: str) -> Dict[str, Any]:
+    """Whether sqlite_stat1 exists, when it was refreshed and whether data changed since"""
+    detector = get_change_detector()
+    last = detector.last_fingerprint(db_path, consumer=STATS_CONSUMER)
+    refresh = None
+    try:
+        refresh = get_data_catalog().get_statistics_refresh(db_path)
+    except Exception as e:
+        logger.debug(f"Could not read statistics refresh record: {e}")
+
+    return {
+        "last_refreshed": refresh.get("refreshed_at") if refresh else (last.created_at if last else None),
+        "method": refresh.get("method") if refresh else None,
+        "fresh": last is not None and not detector.has_changed(db_path, consumer=STATS_CONSUMER)
+    }
+
+
+def ensure_time_window_indexes(db_path: str) -> List[str]:
+    """
+    Create an index on every report time-window column (template "time_window") and every
+    time-bucket column of a materializable template aggregate that has no index leading with
+    it, so windowed queries and bucketed refreshes seek to their date range instead of
+    scanning the table. Call before ensure_fresh_statistics so the new indexes get
+    statistics. Returns the names of the indexes created.
+    """
+    db_path = normalize_db_path(db_path)
+    registry = get_template_registry()
+    windows = set()
+    for product in registry.templates:
+        for compiled in registry.for_product(product):
+            if compiled.time_window:
+                windows.add((compiled.time_window["table"], compiled.time_window["column"]))
+            for query in compiled.queries:
+                aggregate = parse_aggregate_query(query.sql)
+                bucket = find_time_bucket(aggregate) if aggregate else None
+                if bucket:
+                    windows.add((aggregate.table, bucket.column.split(".")[-1]))
+    created = []
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            for table, column in sorted(windows):
+                columns = [row[1] for row in conn.execute(f"PRAGMA table_info({quote_identifier(table)})")]
+                if column not in columns or find_leading_index(conn, table, column):
+                    continue
+                name = f"idx_{table}_{column}"
+                conn.execute(f"CREATE INDEX IF NOT EXISTS {quote_identifier(name)} "
+                             f"ON {quote_identifier(table)} ({quote_identifier(column)})")
+                created.append(name)
+            conn.commit()
+        finally:
+            conn.close()
+    except (sqlite3.Error, OSError) as e:
+        logger.warning(f"⚠️ Time-window index maintenance skipped for {db_path}: {e}")
+    if created:
+        logger.info(f"🗂️ Created time-window indexes on {db_path}: {created}")
+    return created
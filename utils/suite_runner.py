@@ -0,0 +1,254 @@
+"""
+utils/suite_runner.py
+Shared-scan execution for whole report suites. Queries from all reports of a data product
+are deduplicated, grouped by the base tables they read, and single-table aggregations with
+the same source and filter are merged into one scan at their combined grouping grain;
+each original query is then rolled up from that scan. Table groups run in parallel.
+"""
+import time
+import sqlite3
+import logging
+import itertools
+from dataclasses import dataclass, field
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Any, Optional, Tuple
+from models.data_models import PlatformConfig
+from utils.sql_analysis import (
+    AggregateQuery, AggregateItem, parse_aggregate_query, extract_table_dependencies,
+    quote_identifier, rewrite_output_clause, _squash
+)
+
+logger = logging.getLogger(__name__)
+
+# Beyond this many distinct grouping keys the shared scan approaches one row per source row
+MAX_SHARED_GROUP_KEYS = 3
+_MERGE_FUNCTIONS = {"COUNT": "SUM", "SUM": "SUM", "TOTAL": "TOTAL", "MIN": "MIN", "MAX": "MAX"}
+_scan_counter = itertools.count(1)
+
+
+@dataclass
+class SharedScan:
+    """Aggregations over one table and filter, computed in a single pass at a combined grain"""
+    table: str
+    alias: Optional[str]
+    where: Optional[str]
+    group_exprs: List[str] = field(default_factory=list)
+    members: List[Tuple[str, AggregateQuery]] = field(default_factory=list)
+    _partials: Dict[str, str] = field(default_factory=dict)
+
+    def accepts(self, query: AggregateQuery) -> bool:
+        keys = {_squash(expr) for expr in self.group_exprs} | {_squash(expr) for expr in query.group_by}
+        return len(keys) <= MAX_SHARED_GROUP_KEYS
+
+    def add(self, sql: str, query: AggregateQuery) -> None:
+        known = {_squash(expr) for expr in self.group_exprs}
+        self.group_exprs += [expr for expr in query.group_by if _squash(expr) not in known]
+        self.members.append((sql, query))
+
+    def _group_column(self, expr: str) -> str:
+        key = _squash(expr)
+        return f"g{next(i for i, e in enumerate(self.group_exprs) if _squash(e) == key)}"
+
+    def _partial(self, item: AggregateItem) -> str:
+        """Column prefix of the shared partial for an aggregate, registering it on first use"""
+        key = _squash(f"{item.function}|{item.argument}|{item.filter_clause or ''}")
+        if key not in self._partials:
+            self._partials[key] = f"p{len(self._partials)}"
+        return self._partials[key]
+
+    def scan_sql(self) -> str:
+        partial_columns, seen = [], set()
+        for _, query in self.members:
+            for item in query.aggregate_items:
+                column = self._partial(item)
+                if column in seen:
+                    continue
+                seen.add(column)
+                filter_sql = f" FILTER (WHERE {item.filter_clause})" if item.filter_clause else ""
+                if item.function == "AVG":
+                    partial_columns += [f"SUM({item.argument}){filter_sql} AS {column}_s",
+                                        f"COUNT({item.argument}){filter_sql} AS {column}_n"]
+                else:
+                    partial_columns.append(f"{item.expression} AS {column}")
+
+        alias = f" {self.alias}" if self.alias else ""
+        group_columns = [f"{expr} AS g{i}" for i, expr in enumerate(self.group_exprs)]
+        return (
+            f"SELECT {', '.join(group_columns + partial_columns)} FROM {quote_identifier(self.table)}{alias}"
+            + (f" WHERE {self.where}" if self.where else "")
+            + f" GROUP BY {', '.join(self.group_exprs)}"
+        )
+
+    def rollup_sql(self, query: AggregateQuery, scan_table: str) -> str:
+        """One original query re-aggregated from the shared scan's temp table"""
+        columns, group_columns = [], [self._group_column(expr) for expr in query.group_by]
+        for item in query.items:
+            name = quote_identifier(item.name)
+            if item.function is None:
+                columns.append(f"{self._group_column(item.expression)} AS {name}")
+            elif item.function == "AVG":
+                column = self._partial(item)
+                columns.append(f"SUM({column}_s) * 1.0 / NULLIF(SUM({column}_n), 0) AS {name}")
+            else:
+                columns.append(f"{_MERGE_FUNCTIONS[item.function]}({self._partial(item)}) AS {name}")
+
+        group_names = [
+            quote_identifier(next(item.name for item in query.group_items if item.expression == expr))
+            for expr in query.group_by
+        ]
+        having = rewrite_output_clause(query, query.having)
+        order_by = rewrite_output_clause(query, query.order_by) or ", ".join(group_names)
+        return (
+            f"SELECT * FROM (SELECT {', '.join(columns)} FROM temp.{scan_table} GROUP BY {', '.join(group_columns)}) AS v"
+            + (f" WHERE {having}" if having else "")
+            + f" ORDER BY {order_by}"
+            + (f" LIMIT {query.limit}" if query.limit else "")
+        )
+
+
+@dataclass
+class TableGroup:
+    """All suite work that reads the same set of base tables; executed on one connection"""
+    tables: Tuple[str, ...]
+    scans: List[SharedScan] = field(default_factory=list)
+    standalone: List[str] = field(default_factory=list)
+
+
+def plan_suite(sqls: List[str]) -> List[TableGroup]:
+    """Deduplicate statements, merge compatible aggregations and group the work by base tables"""
+    groups: Dict[Tuple[str, ...], TableGroup] = {}
+    seen = set()
+    for sql in sqls:
+        if sql in seen:
+            continue
+        seen.add(sql)
+        tables = tuple(sorted(extract_table_dependencies(sql)))
+        group = groups.setdefault(tables, TableGroup(tables))
+
+        query = parse_aggregate_query(sql)
+        if query is None:
+            group.standalone.append(sql)
+            continue
+        scan = next((
+            scan for scan in group.scans
+            if scan.alias == query.table_alias
+            and _squash(scan.where or "") == _squash(query.where or "")
+            and scan.accepts(query)
+        ), None)
+        if scan is None:
+            scan = SharedScan(query.table, query.table_alias, query.where)
+            group.scans.append(scan)
+        scan.add(sql, query)
+
+    # A scan with one member is just that query
+    for group in groups.values():
+        for scan in [scan for scan in group.scans if len(scan.members) == 1]:
+            group.scans.remove(scan)
+            group.standalone.append(scan.members[0][0])
+    return list(groups.values())
+
+
+def _fetch(conn: sqlite3.Connection, sql: str, limit: int, params: Optional[Dict[str, Any]] = None) -> List[Dict[str, Any]]:
+    cursor = conn.execute(sql, params or {})
+    columns = [desc[0] for desc in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor.fetchmany(limit)]
+
+
+def _run_group(group: TableGroup, db_path: str, pool, store, limit: int,
+               params: Optional[Dict[str, Any]] = None) -> Dict[str, Dict[str, Any]]:
+    """Execute one table group; a failing shared scan falls back to its member queries"""
+    results: Dict[str, Dict[str, Any]] = {}
+
+    def timed(sql: str, conn: sqlite3.Connection, try_store: bool = True) -> None:
+        start = time.perf_counter()
+        rows = store.serve(db_path, sql, limit) if store is not None and try_store else None
+        source = "materialized"
+        if rows is None:
+            try:
+                rows = _fetch(conn, sql, limit, params)
+            except sqlite3.Error as e:
+                logger.warning(f"Failed to execute query: {e}")
+                rows = []
+            source = "database"
+        results[sql] = {"results": rows, "duration_ms": round((time.perf_counter() - start) * 1000, 3), "source": source}
+
+    with pool.connection(db_path) as conn:
+        for scan in group.scans:
+            members = scan.members
+            if store is not None:
+                # Members with a fresh materialized aggregate need no scan at all
+                pending = []
+                for sql, query in members:
+                    rows = store.serve(db_path, sql, limit)
+                    if rows is None:
+                        pending.append((sql, query))
+                    else:
+                        results[sql] = {"results": rows, "duration_ms": 0.0, "source": "materialized"}
+                members = pending
+            if len(members) < 2:
+                for sql, _ in members:
+                    timed(sql, conn, try_store=False)
+                continue
+            if len(members) != len(scan.members):
+                scan = SharedScan(scan.table, scan.alias, scan.where)
+                for sql, query in members:
+                    scan.add(sql, query)
+            scan_table = f"suite_scan_{next(_scan_counter)}"
+            start = time.perf_counter()
+            try:
+                conn.execute(f"CREATE TEMP TABLE {scan_table} AS {scan.scan_sql()}", params or {})
+                scan_ms = (time.perf_counter() - start) * 1000
+                for sql, query in members:
+                    rollup_start = time.perf_counter()
+                    rows = _fetch(conn, scan.rollup_sql(query, scan_table), limit)
+                    results[sql] = {
+                        "results": rows,
+                        "duration_ms": round(scan_ms / len(members) + (time.perf_counter() - rollup_start) * 1000, 3),
+                        "source": "shared_scan"
+                    }
+            except (sqlite3.Error, ValueError) as e:
+                logger.warning(f"⚠️ Shared scan on {scan.table} failed ({e}); running its queries individually")
+                for sql, _ in members:
+                    timed(sql, conn, try_store=False)
+            finally:
+                conn.execute(f"DROP TABLE IF EXISTS temp.{scan_table}")
+
+        for sql in group.standalone:
+            timed(sql, conn)
+    return results
+
+
+def execute_suite_queries(db_path: str, sqls: List[str], pool, store=None, parallel: bool = True,
+                          limit: int = 100, params: Optional[Dict[str, Any]] = None
+                          ) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, Any]]:
+    """
+    Run a suite's statements with shared scans. Returns ({sql: {"results", "duration_ms",
+    "source"}}, stats) where stats counts requested, distinct and merged statements and the
+    base-table scans performed. `params` binds named parameters in every statement.
+    """
+    start = time.perf_counter()
+    groups = plan_suite(sqls)
+    workers = min(len(groups), PlatformConfig().max_concurrent_tasks) if parallel else 1
+
+    results: Dict[str, Dict[str, Any]] = {}
+    if workers <= 1:
+        for group in groups:
+            results.update(_run_group(group, db_path, pool, store, limit, params))
+    else:
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="report-suite") as executor:
+            for group_results in executor.map(lambda g: _run_group(g, db_path, pool, store, limit, params), groups):
+                results.update(group_results)
+
+    merged = sum(len(scan.members) for group in groups for scan in group.scans)
+    stats = {
+        "queries_requested": len(sqls),
+        "distinct_queries": len(set(sqls)),
+        "table_groups": len(groups),
+        "shared_scans": sum(len(group.scans) for group in groups),
+        "queries_in_shared_scans": merged,
+        "served_materialized": sum(1 for item in results.values() if item["source"] == "materialized"),
+        "parallel_workers": workers,
+        "duration_ms": round((time.perf_counter() - start) * 1000, 3)
+    }
+    logger.info(f"🧩 Suite executed: {stats}")
+    return results, stats
@@ -0,0 +1,330 @@
+"""
+utils/template_registry.py
+Precompiled report template registry, built once per process: templates indexed by
+normalized report type and by data product, each query's table dependencies and bind
+parameters parsed up front, time-window bindings resolved per request, and per-database
+connection pools whose statement caches keep template queries prepared across report runs.
+"""
+import os
+import queue
+import sqlite3
+import logging
+import threading
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import date, timedelta
+from typing import Dict, List, Any, Optional, FrozenSet, Iterator, Tuple
+from models.data_models import PlatformConfig
+from utils.change_detection import get_change_detector, normalize_db_path
+from utils.sql_analysis import (
+    normalize_sql, extract_table_dependencies, prepared_table_dependencies, extract_named_parameters,
+    quote_identifier
+)
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_report_type(report_type: str) -> str:
+    """Canonical report type, e.g. "Sales & Revenue-Accounting" -> "sales_and_revenue_accounting" """
+    return report_type.lower().strip().replace(" ", "_").replace("&", "and").replace("-", "_")
+
+
+@dataclass(frozen=True)
+class CompiledQuery:
+    """A template query with its executable text, table dependencies and named bind parameters"""
+    index: int
+    raw_sql: str
+    sql: str
+    tables: FrozenSet[str]
+    parameters: FrozenSet[str] = frozenset()
+
+
+@dataclass(frozen=True)
+class CompiledTemplate:
+    data_product: str
+    report_type: str
+    template: Dict[str, Any]
+    queries: Tuple[CompiledQuery, ...]
+
+    @property
+    def name(self) -> str:
+        return self.template.get("name", "")
+
+    @property
+    def time_window(self) -> Optional[Dict[str, str]]:
+        """{"table", "column"} whose dates bound :window_start / :window_end, if declared"""
+        return self.template.get("time_window")
+
+
+class ConnectionPool:
+    """
+    Read-only connections per database, reused across reports. sqlite3 keeps a per-connection
+    cache of prepared statements, so repeated template queries skip parsing and planning.
+    Pools are dropped when the database file is replaced.
+    """
+
+    def __init__(self, max_idle: Optional[int] = None, cached_statements: int = 256):
+        self.max_idle = max_idle or PlatformConfig().max_concurrent_tasks
+        self.cached_statements = cached_statements
+        self._pools: Dict[str, Tuple[Tuple[int, int], "queue.LifoQueue[sqlite3.Connection]"]] = {}
+        self._lock = threading.Lock()
+
+    def _pool(self, db_path: str) -> "queue.LifoQueue[sqlite3.Connection]":
+        stat = os.stat(db_path)
+        identity = (stat.st_dev, stat.st_ino)
+        with self._lock:
+            cached = self._pools.get(db_path)
+            if cached and cached[0] == identity:
+                return cached[1]
+            if cached:
+                self._drain(cached[1])
+            pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+            self._pools[db_path] = (identity, pool)
+            return pool
+
+    @staticmethod
+    def _drain(pool: "queue.LifoQueue[sqlite3.Connection]") -> None:
+        while True:
+            try:
+                pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    @contextmanager
+    def connection(self, db_path: str) -> Iterator[sqlite3.Connection]:
+        """Borrow a read-only connection (rows as sqlite3.Row) for the duration of the block"""
+        db_path = normalize_db_path(db_path)
+        pool = self._pool(db_path)
+        try:
+            conn = pool.get_nowait()
+        except queue.Empty:
+            conn = sqlite3.connect(
+                f"file:{db_path}?mode=ro", uri=True, check_same_thread=False,
+                cached_statements=self.cached_statements
+            )
+            conn.row_factory = sqlite3.Row
+        try:
+            yield conn
+        finally:
+            if pool.qsize() < self.max_idle:
+                pool.put(conn)
+            else:
+                conn.close()
+
+    def close(self) -> None:
+        with self._lock:
+            for _, pool in self._pools.values():
+                self._drain(pool)
+            self._pools.clear()
+
+
+class TemplateRegistry:
+    """
+    Report templates compiled once: O(1) lookup by normalized type, per-product listings,
+    allowed-suite checks and precomputed table dependencies.
+    """
+
+    def __init__(self, templates: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+                 suites: Optional[Dict[str, List[str]]] = None):
+        if templates is None:
+            from utils.report_templates import create_report_templates
+            templates = create_report_templates()
+        if suites is None:
+            from utils.data_products_loader import load_data_products_config
+            suites = {dp["name"]: dp.get("report_suite", []) for dp in load_data_products_config() if "name" in dp}
+
+        self.templates = templates
+        self.suites = suites
+        self.pool = ConnectionPool()
+        self._by_type: Dict[str, CompiledTemplate] = {}
+        self._by_product_type: Dict[Tuple[str, str], CompiledTemplate] = {}
+        self._by_product: Dict[str, List[CompiledTemplate]] = {}
+        self._prepared: Dict[Tuple[str, int, str], Tuple[FrozenSet[str], Optional[str]]] = {}
+        self._prepared_lock = threading.Lock()
+        self._anchors: Dict[Tuple[str, str, str], Tuple[str, Optional[str]]] = {}
+        self._window_indexes: Dict[Tuple[str, str, str], Optional[str]] = {}
+
+        for product, product_templates in templates.items():
+            for template in product_templates:
+                compiled = CompiledTemplate(
+                    data_product=product,
+                    report_type=normalize_report_type(template.get("type") or template.get("name", "")),
+                    template=template,
+                    queries=tuple(
+                        CompiledQuery(idx, raw, normalize_sql(raw), frozenset(extract_table_dependencies(raw)),
+                                      frozenset(extract_named_parameters(raw)))
+                        for idx, raw in enumerate(template.get("queries", []))
+                    )
+                )
+                if compiled.report_type in self._by_type:
+                    logger.warning(f"⚠️ Duplicate report type {compiled.report_type}; keeping the first template")
+                else:
+                    self._by_type[compiled.report_type] = compiled
+                self._by_product.setdefault(product, []).append(compiled)
+                self._by_product_type.setdefault((product, compiled.report_type), compiled)
+
+        # Suites list template names; matched case/punctuation-insensitively
+        self._suite_types = {
+            product: {normalize_report_type(name) for name in names}
+            for product, names in suites.items()
+        }
+        self._suite_members = {
+            product: [tpl for tpl in templates if normalize_report_type(tpl.name) in self._suite_types.get(product, set())]
+            for product, templates in self._by_product.items()
+        }
+        self._allowed = {
+            product: {tpl.report_type for tpl in members} for product, members in self._suite_members.items()
+        }
+        logger.info(f"📚 Template registry: {len(self._by_type)} report types across {len(self._by_product)} data products")
+
+    # ------------------------------------------------------------------
+    # Lookup
+    # ------------------------------------------------------------------
+
+    def get(self, report_type: str, data_product: Optional[str] = None) -> Optional[CompiledTemplate]:
+        """Template by report type, preferring the given data product's own template"""
+        normalized = normalize_report_type(report_type)
+        if data_product:
+            compiled = self._by_product_type.get((data_product, normalized))
+            if compiled:
+                return compiled
+        return self._by_type.get(normalized)
+
+    def for_product(self, data_product: str) -> List[CompiledTemplate]:
+        return self._by_product.get(data_product, [])
+
+    def suite(self, data_product: str) -> List[CompiledTemplate]:
+        """Templates of a data product that belong to its report suite, in template order"""
+        return self._suite_members.get(data_product, [])
+
+    def is_allowed(self, data_product: Optional[str], report_type: str) -> bool:
+        return normalize_report_type(report_type) in self._allowed.get(data_product or "", set())
+
+    # ------------------------------------------------------------------
+    # Dependencies
+    # ------------------------------------------------------------------
+
+    def runnable_queries(self, compiled: CompiledTemplate, data_sources: List[str]) -> List[CompiledQuery]:
+        """Queries whose tables are all within the allowed data sources"""
+        allowed = set(data_sources)
+        return [query for query in compiled.queries if query.tables <= allowed]
+
+    def check_query(self, db_path: str, query: CompiledQuery, compiled: CompiledTemplate) -> Tuple[FrozenSet[str], Optional[str]]:
+        """
+        (tables, error) as resolved by SQLite preparing the query against this database,
+        cached per database file and schema version. `error` is set when it does not prepare.
+        """
+        db_path = normalize_db_path(db_path)
+        with self.pool.connection(db_path) as conn:
+            schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            key = (f"{db_path}:{schema_version}", query.index, compiled.report_type)
+            with self._prepared_lock:
+                if key in self._prepared:
+                    return self._prepared[key]
+            try:
+                result = (frozenset(prepared_table_dependencies(conn, query.sql)), None)
+            except sqlite3.Error as e:
+                result = (query.tables, str(e))
+        with self._prepared_lock:
+            self._prepared[key] = result
+        return result
+
+
+    # ------------------------------------------------------------------
+    # Bound parameters
+    # ------------------------------------------------------------------
+
+    def bind(self, db_path: str, compiled: CompiledTemplate, parameters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        Values for a template's bound parameters: `days_back` (caller, else template default)
+        and the [window_start, window_end) dates it spans. The window ends after `as_of` when
+        given; otherwise after the latest date in the template's time_window column, or
+        today with `window_anchor="today"`. Templates without a time window bind nothing.
+        """
+        window = compiled.time_window
+        if not window:
+            return {}
+        parameters = parameters or {}
+        try:
+            days_back = max(1, int(parameters.get("days_back", compiled.template.get("parameters", {}).get("days_back", 30))))
+        except (TypeError, ValueError):
+            days_back = 30
+
+        anchor = parameters.get("as_of")
+        if not anchor and parameters.get("window_anchor", "latest") == "latest":
+            anchor = self._latest_date(db_path, window["table"], window["column"])
+        try:
+            last_day = date.fromisoformat(str(anchor)[:10]) if anchor else date.today()
+        except ValueError:
+            logger.warning(f"⚠️ Unrecognized window anchor {anchor!r}; using today")
+            last_day = date.today()
+
+        window_end = last_day + timedelta(days=1)
+        return {
+            "days_back": days_back,
+            "window_start": (window_end - timedelta(days=days_back)).isoformat(),
+            "window_end": window_end.isoformat()
+        }
+
+    def _latest_date(self, db_path: str, table: str, column: str) -> Optional[str]:
+        """MAX(column), cached per data version (an index on the column makes it a single seek)"""
+        db_path = normalize_db_path(db_path)
+        fingerprint = get_change_detector().fingerprint(db_path).digest
+        key = (db_path, table, column)
+        with self._prepared_lock:
+            cached = self._anchors.get(key)
+        if cached and cached[0] == fingerprint:
+            return cached[1]
+        try:
+            with self.pool.connection(db_path) as conn:
+                latest = conn.execute(
+                    f"SELECT MAX({quote_identifier(column)}) FROM {quote_identifier(table)}"
+                ).fetchone()[0]
+        except sqlite3.Error as e:
+            logger.warning(f"⚠️ Cannot resolve the latest {table}.{column}: {e}")
+            latest = None
+        with self._prepared_lock:
+            self._anchors[key] = (fingerprint, latest)
+        return latest
+
+    def window_index(self, db_path: str, compiled: CompiledTemplate) -> Optional[str]:
+        """
+        Name of an index leading with the template's time-window column, or None. Without one
+        a windowed query still scans the whole table, so callers warn or create it.
+        """
+        window = compiled.time_window
+        if not window:
+            return None
+        db_path = normalize_db_path(db_path)
+        with self.pool.connection(db_path) as conn:
+            schema_version = conn.execute("PRAGMA schema_version").fetchone()[0]
+            key = (f"{db_path}:{schema_version}", window["table"], window["column"])
+            with self._prepared_lock:
+                if key in self._window_indexes:
+                    return self._window_indexes[key]
+            index_name = find_leading_index(conn, window["table"], window["column"])
+        with self._prepared_lock:
+            self._window_indexes[key] = index_name
+        return index_name
+
+
+def find_leading_index(conn: sqlite3.Connection, table: str, column: str) -> Optional[str]:
+    """First index on `table` whose leading column is `column`"""
+    for index in conn.execute(f"PRAGMA index_list({quote_identifier(table)})").fetchall():
+        columns = conn.execute(f"PRAGMA index_info({quote_identifier(index[1])})").fetchall()
+        if columns and columns[0][2] == column:
+            return index[1]
+    return None
+
+
+_registry: Optional[TemplateRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_template_registry() -> TemplateRegistry:
+    """Process-wide template registry, built on first use"""
+    global _registry
+    with _registry_lock:
+        if _registry is None:
+            _registry = TemplateRegistry()
+        return _registry